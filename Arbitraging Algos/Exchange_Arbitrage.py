@@ -1,18 +1,12 @@
 import os
-import functools
-import operator
-import itertools
-from time import sleep
+import asyncio
 import signal
-import requests
-import pandas as pd
-import pandas_ta as ta
-import re
-import json
-
-# this class definition allows printing error messages and stopping the program
-class ApiException(Exception):
-    pass
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit import TickClock, submit_async
+from rit.aio import AsyncRITClient
+from rit.consolidated import consolidated_book
+from rit.router import VENUE_FEES, cross, leg_orders
 
 # this signal handler allows for a graceful shutdown when CTRL+C is pressed
 def signal_handler(signum, frame):
@@ -20,95 +14,51 @@ def signal_handler(signum, frame):
     signal.signal(signal.SIGINT, signal.SIG_DFL)
     shutdown = True
 
-# set your API key to authenticate to the RIT client
-API_KEY = {'X-API-Key': 'KZJ94OPT'}
 shutdown = False
 
-# this helper method returns the current 'tick' of the running case
-def get_tick(session):
-    resp = session.get('http://localhost:9999/v1/case')
-    if resp.status_code == 401:
-        raise ApiException('Error getting tick: The API key provided in this Python code must match that in the RIT client')
-    case = resp.json()
-    return case['tick']
-
-# this helper method returns the bid and ask for a given security
-def ticker_bid_ask(session, ticker):
-    payload = {'ticker': ticker}
-    resp = session.get('http://localhost:9999/v1/securities/book', params=payload)
-    if resp.ok:
-        book = resp.json()
-        return book['bids'][0]['price'], book['asks'][0]['price']
-    raise ApiException('Error getting bid / ask: The API key provided in this Python code must match that in the RIT client')
+# security arbitraged between its _A and _M venues, and the levels of each book read per pass
+TICKER = 'CRZY'
+DEPTH = 5
+
+# minimum gap between the best net bid and the best net ask, after each venue's fee, before trading it,
+# and the share of each crossed level to take
+THRESHOLD = .02
+QUANTITY_PERCENT = .5
+
+# this function runs one pass of the arbitrage loop: refresh both venues' books, then trade any crossed market
+# it returns the number of arbitrage trades sent; benchmarks call it with pause=0
+async def arbitrage_step(s, pause=.25, threshold=THRESHOLD, quantity_percent=QUANTITY_PERCENT, ticker=TICKER, fees=VENUE_FEES):
+    # refresh the top levels of both venues in a single round-trip; the consolidated book takes their level updates
+    book = consolidated_book(ticker, fees)
+    await book.refresh_async(s, DEPTH)
+
+    # algorithm decision rule: trade when one venue's bid, net of its fee, clears the other venue's ask by more
+    # than the threshold, whichever way the market is crossed; the check reads the two ends of the book
+    if book.crossed(threshold) is None:
+        return 0
+    shares, profit, buys, sells = cross(book, threshold=threshold, fraction=quantity_percent)
+    if not shares:
+        return 0
+
+    # market orders, both legs sent together
+    await submit_async(s, leg_orders(buys, 'BUY', order_type='MARKET') + leg_orders(sells, 'SELL', order_type='MARKET'))
+    await asyncio.sleep(pause)
+    return 1
 
 # this is the main method containing the actual order routing logic
-def main():
+async def main():
     
-    with requests.Session() as s:
-        # add the API key to the session to authenticate during requests
-        s.headers.update(API_KEY)
-        # get the current time of the case
-        tick = get_tick(s)
+    async with AsyncRITClient() as s:
+        # get the current time of the case; the tick clock predicts it locally and re-syncs every few seconds
+        clock = TickClock()
+        tick = await clock.sync_async(s)
         
         while 3 <= tick <= 300:
-            tick = get_tick(s)
-
-            # request 1st limit order on order book
-            bid_ask_A = s.get('http://localhost:9999/v1/securities/book', params={'ticker': 'CRZY_A', 'limit': 1})
-            bid_ask_M = s.get('http://localhost:9999/v1/securities/book', params={'ticker': 'CRZY_M', 'limit': 1})
-
-            # parse bid and ask prices
-            CRZY_A_bid_price = bid_ask_A.json()['bids'][0]['price']
-            CRZY_A_ask_price = bid_ask_A.json()['asks'][0]['price']
-            CRZY_M_bid_price = bid_ask_M.json()['bids'][0]['price']
-            CRZY_M_ask_price = bid_ask_M.json()['asks'][0]['price']
-            
-            # parse order quantity
-            CRZY_A_bid_quantity_total = bid_ask_A.json()['bids'][0]['quantity']
-            CRZY_A_ask_quantity_total = bid_ask_A.json()['asks'][0]['quantity']
-            CRZY_M_bid_quantity_total = bid_ask_M.json()['bids'][0]['quantity']
-            CRZY_M_ask_quantity_total = bid_ask_M.json()['asks'][0]['quantity']
-
-            # parse order quantity filled
-            CRZY_A_bid_quantity_filled = bid_ask_A.json()['bids'][0]['quantity_filled']
-            CRZY_A_ask_quantity_filled = bid_ask_A.json()['asks'][0]['quantity_filled']
-            CRZY_M_bid_quantity_filled = bid_ask_M.json()['bids'][0]['quantity_filled']
-            CRZY_M_ask_quantity_filled = bid_ask_M.json()['asks'][0]['quantity_filled']
-
-            # calcuate amount left to fill
-            CRZY_A_bid_quantity = CRZY_A_bid_quantity_total - CRZY_A_bid_quantity_filled
-            CRZY_A_ask_quantity = CRZY_A_ask_quantity_total - CRZY_A_ask_quantity_filled
-            CRZY_M_bid_quantity = CRZY_M_bid_quantity_total - CRZY_M_bid_quantity_filled
-            CRZY_M_ask_quantity = CRZY_M_ask_quantity_total - CRZY_M_ask_quantity_filled
-
-            # quantity decision rule: sets market making order quantity to the minimum quantity between arbitrage trades
-            if CRZY_A_bid_quantity > CRZY_M_ask_quantity:
-                quantity1 = CRZY_M_ask_quantity
-            else:
-                quantity1 = CRZY_A_bid_quantity
-
-            if CRZY_M_bid_quantity > CRZY_A_ask_quantity:
-                quantity2 = CRZY_A_ask_quantity
-            else:
-                quantity2 = CRZY_M_bid_quantity
-
-            threshold = .02
-            quantity_percent = .5
-
-            # algorithm decision rule: arbitrage between markets
-            if CRZY_A_bid_price > CRZY_M_ask_price + threshold:
-                # market orders
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_M', 'type': 'MARKET', 'quantity': quantity1 * quantity_percent, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_A', 'type': 'MARKET', 'quantity': quantity1 * quantity_percent, 'action': 'SELL'})
-
-                sleep(.25)
-
-            if CRZY_M_bid_price > CRZY_A_ask_price + threshold:
-                # market orders
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_A', 'type': 'MARKET', 'quantity': quantity2 * quantity_percent, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_M', 'type': 'MARKET', 'quantity': quantity2 * quantity_percent, 'action': 'SELL'})
+            if clock.stale():
+                await clock.sync_async(s)
+            tick = clock.now()
 
-                sleep(.25)
+            await arbitrage_step(s)
 
             '''
             Ways to Improve:
@@ -124,4 +74,4 @@ def main():
 
 if __name__ == '__main__':
     signal.signal(signal.SIGINT, signal_handler)
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -1,18 +1,9 @@
 import os
-import functools
-import operator
-import itertools
 from time import sleep
 import signal
-import requests
-import pandas as pd
-#import pandas_ta as ta
-import re
-import json
-
-# this class definition allows printing error messages and stopping the program
-class ApiException(Exception):
-    pass
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit import RITClient, get_tick, ticker_close
 
 # this signal handler allows for a graceful shutdown when CTRL+C is pressed
 def signal_handler(signum, frame):
@@ -20,319 +11,106 @@ def signal_handler(signum, frame):
     signal.signal(signal.SIGINT, signal.SIG_DFL)
     shutdown = True
 
-# set your API key to authenticate to the RIT client
-API_KEY = {'X-API-Key': 'KZJ94OPT'}
 shutdown = False
 
-# this helper method returns the current 'tick' of the running case
-def get_tick(session):
-    resp = session.get('http://localhost:9999/v1/case')
-    if resp.status_code == 401:
-        raise ApiException('Error getting tick: The API key provided in this Python code must match that in the RIT client')
-    case = resp.json()
-    return case['tick']
-
-# this helper method returns the last close price for the given security, one tick ago
-def ticker_close(session, ticker):
-    payload = {'ticker': ticker, 'limit': 1}
-    resp = session.get('http://localhost:9999/v1/securities/history', params=payload)
-    if resp.status_code == 401:
-        raise ApiException('The API key provided in this Python code must match that in the RIT client (please refer to the API hyperlink in the client toolbar and/or the RIT – User Guide – REST API Documentation.pdf)')
-    ticker_history = resp.json()
-    if ticker_history:
-        return ticker_history[0]['close']
-    else:
-        raise ApiException('Response error. Unexpected JSON response.')
-
 # this function submits a buy order
 def buy_order(session, ticker, quantity, price, price_cushion):
     buy_param = {'ticker': ticker, 'type': 'LIMIT', 'quantity': quantity, 'action': 'BUY', 'price': price + (price * price_cushion)}
-    session.post('http://localhost:9999/v1/orders', params = buy_param)
+    session.post('/orders', params = buy_param)
 
 # this function submits a sell order
 def sell_order(session, ticker, quantity, price, price_cushion):
     buy_param = {'ticker': ticker, 'type': 'LIMIT', 'quantity': quantity, 'action': 'SELL', 'price': price + (price * price_cushion)}
-    session.post('http://localhost:9999/v1/orders', params = buy_param)
+    session.post('/orders', params = buy_param)
 
 # this function liquidates the entire portfolio
 def liquidate_portfolio():
     pass
 
-# this function fetches the position size for a given ticker
-def get_position(session, ticker):
-    positions = session.get('http://localhost:9999/v1/securities', params={'ticker': ticker})
-    position = positions.json()[0]['position']
-    return position
+# this function reads the CL-1F ask and the last CL-2F close that every entry rule compares
+def get_spread_prices(s):
+    get_cl_1f = s.get('/securities', params = {'ticker': 'CL-1F'})
+    cl_1f_price = get_cl_1f.json()[0]['ask']
+    cl_2f_price = ticker_close(s, 'CL-2F')
+    return cl_1f_price, cl_2f_price
+
+# calendar spread ladder (CL2F - CL1F): short CL1F / long CL2F as the spread narrows through each short entry and
+# close every leg once it widens past the short exit; the long side mirrors it. Each leg is QUANTITY lots
+SHORT_ENTRIES = (0.7, 0.5, 0.3)
+SHORT_EXIT = 0.85
+LONG_ENTRIES = (1.3, 1.5, 1.7)
+LONG_EXIT = 1.15
+QUANTITY = 30
+
+# this function applies the entry rules: short CL1F under a 70 cent calendar spread, long it over $1.30
+def entry_signal(cl_1f_price, cl_2f_price, short_entry=SHORT_ENTRIES[0], long_entry=LONG_ENTRIES[0]):
+    if cl_2f_price - cl_1f_price < short_entry:
+        return 'SHORT_1F'
+    if cl_2f_price - cl_1f_price > long_entry:
+        return 'LONG_1F'
+    return None
+
+# this function moves the ladder one step: level counts the open legs, positive when short CL1F, negative when long
+# it returns the decision ('SHORT_1F', 'LONG_1F', 'EXIT' or None) and the new level
+def ladder_signal(spread, level, short_entries=SHORT_ENTRIES, short_exit=SHORT_EXIT, long_entries=LONG_ENTRIES, long_exit=LONG_EXIT):
+    if level == 0:
+        if spread < short_entries[0]:
+            return 'SHORT_1F', 1
+        if spread > long_entries[0]:
+            return 'LONG_1F', -1
+    elif level > 0:
+        if spread > short_exit:
+            return 'EXIT', 0
+        if level < len(short_entries) and spread < short_entries[level]:
+            return 'SHORT_1F', level + 1
+    else:
+        if spread < long_exit:
+            return 'EXIT', 0
+        if -level < len(long_entries) and spread > long_entries[-level]:
+            return 'LONG_1F', level - 1
+    return None, level
+
+# this function sends the market orders for a ladder decision; an exit closes every open leg
+def trade_ladder(s, decision, level, quantity=QUANTITY, pause=.1):
+    if decision == 'SHORT_1F':
+        legs = [('CL-1F', 'SELL'), ('CL-2F', 'BUY')]
+    elif decision == 'LONG_1F':
+        legs = [('CL-1F', 'BUY'), ('CL-2F', 'SELL')]
+    elif decision == 'EXIT':
+        legs = [('CL-1F', 'BUY'), ('CL-2F', 'SELL')] * level if level > 0 else [('CL-1F', 'SELL'), ('CL-2F', 'BUY')] * -level
+    else:
+        return
+    for ticker, action in legs:
+        s.post('/orders', params = {'ticker': ticker, 'type': 'MARKET', 'quantity': quantity, 'action': action})
+        sleep(pause)
+
+# this function runs one pass of the ladder and returns the new level; the sweep runner passes other thresholds
+def ladder_step(s, level, short_entries=SHORT_ENTRIES, short_exit=SHORT_EXIT, long_entries=LONG_ENTRIES, long_exit=LONG_EXIT,
+                quantity=QUANTITY, pause=.1):
+    # GET CL1F AND CL2F PRICES
+    cl_1f_price, cl_2f_price = get_spread_prices(s)
+
+    # CHECK IF CL1F IS AVAILABLE TO TRADE
+    if cl_1f_price <= 0:
+        return level
+
+    decision, new_level = ladder_signal(cl_2f_price - cl_1f_price, level, short_entries, short_exit, long_entries, long_exit)
+    trade_ladder(s, decision, level, quantity, pause)
+    if decision is not None:
+        print(f'{decision} at {cl_2f_price - cl_1f_price:.2f} spread, {new_level} legs open')
+    return new_level
 
 # this is the main method containing the actual order routing logic
 def main():
 
-    with requests.Session() as s:
-        # add the API key to the session to authenticate during requests
-        s.headers.update(API_KEY)
+    with RITClient() as s:
         # get the current time of the case
         tick = get_tick(s)
-       
-        while 0 <= tick < 600:
-            
-            # GET CL1F AND CL2F PRICES
-            get_cl_1f = s.get('http://localhost:9999/v1/securities', params = {'ticker': 'CL-1F'})
-            cl_1f_price = get_cl_1f.json()[0]['ask']
-            cl_2f_price = ticker_close(s, 'CL-2F')
-
-            # CHECK IF CL1F IS AVAILABLE TO TRADE
-            if cl_1f_price > 0:
-
-                # SUBMIT ARBITRAGE TRADE IS CL1F AND CL2F HAVE A 30 CENT SPREAD
-                if cl_2f_price - cl_1f_price < 0.7:
-                    
-                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                    sleep(.1)
-                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                    sleep(.1)
-
-                    print('Shorted CL1F and longed CL2F at 70 cent spread')
-                    
-                    # SET DEFAULT POSITION VALUE TO 1 -> 1 MEANING TRUE FOR POSITION
-                    cl1f_position = 1
-                    cl2f_position = 1
-
-                    # RUN THROUGH WHILE LOOP DURING OPEN POSITION TO PREVENT ALGORITHM FROM MOVING TO NEXT STEPS
-
-                    while cl1f_position == 1 or cl2f_position == 1:
-
-                        cl_1f_price = ticker_close(s, 'CL-1F')
-                        cl_2f_price = ticker_close(s, 'CL-2F')
-
-                        # LIQUIDATE POSITION AT 85 CENT SPREAD
-
-                        if cl_2f_price - cl_1f_price > 0.85:
-                            
-                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                            sleep(.1)
-                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                            sleep(.1)
-
-                            print('Liquidated position')
-
-                            # BREAK WHILE LOOP WHEN POSITIONS == 0
-
-                            cl1f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-1F'})
-                            cl2f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-2F'})
-                            if cl1f.json()[0]['position'] == 0.0:
-                                if cl2f.json()[0]['position'] == 0.0:
-                                    break
-
-                        # SUBMIT ADDITIONAL ARBITRAGE TRADE IS CL1F AND CL2F HAVE A 50 CENT SPREAD
-
-                        if cl_2f_price - cl_1f_price < 0.5:
-
-                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                            sleep(.1)
-                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                            sleep(.1)
-
-                            print('Shorted CL1F and longed CL2F at 50 cent spread')
-
-                            # RUN THROUGH WHILE LOOP DURING OPEN POSITION TO PREVENT ALGORITHM FROM MOVING TO NEXT STEPS
-
-                            while cl1f_position == 1 or cl2f_position == 1:
-
-                                cl_1f_price = ticker_close(s, 'CL-1F')
-                                cl_2f_price = ticker_close(s, 'CL-2F')
-
-                                # LIQUIDATE POSITION AT 85 CENT SPREAD
-
-                                if cl_2f_price - cl_1f_price > 0.85:
-                            
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                    sleep(.1)
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                    sleep(.1)
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                    sleep(.1)
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                    sleep(.1)
-
-                                    print('Liquidated position')
-
-                                    # BREAK WHILE LOOP WHEN POSITIONS == 0
-
-                                    cl1f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-1F'})
-                                    cl2f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-2F'})
-                                    if cl1f.json()[0]['position'] == 0.0:
-                                        if cl2f.json()[0]['position'] == 0.0:
-                                            break
-                                    
-                                # SUBMIT ADDITIONAL ARBITRAGE TRADE IS CL1F AND CL2F HAVE A 30 CENT SPREAD
-
-                                if cl_2f_price - cl_1f_price < 0.3:
-
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-
-                                    print('Shorted CL1F and longed CL2F at 30 cent spread')
-
-                                    # RUN THROUGH WHILE LOOP DURING OPEN POSITION TO PREVENT ALGORITHM FROM MOVING TO NEXT STEPS
-
-                                    while cl1f_position == 1 or cl2f_position == 1:
-
-                                        cl_1f_price = ticker_close(s, 'CL-1F')
-                                        cl_2f_price = ticker_close(s, 'CL-2F')
-                                    
-                                        # LIQUIDATE POSITION AT 85 CENT SPREAD
-
-                                        if cl_2f_price - cl_1f_price > 0.85:
-                            
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                            sleep(.1)
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                            sleep(.1)
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                            sleep(.1)
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                            sleep(.1)
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                            sleep(.1)
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                            sleep(.1)
+        level = 0
 
-                                            print('Liquidated position')
-
-                                            # BREAK WHILE LOOP WHEN POSITIONS == 0
-
-                                            cl1f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-1F'})
-                                            cl2f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-2F'})
-                                            if cl1f.json()[0]['position'] == 0.0:
-                                                if cl2f.json()[0]['position'] == 0.0:
-                                                    break
-
-                # SUBMIT ARBITRAGE TRADE IS CL1F AND CL2F HAVE A $1.30 SPREAD
-                if cl_2f_price - cl_1f_price > 1.3:
-                    
-                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                    sleep(.1)
-                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                    sleep(.1)
-
-                    print('Shorted CL2F and longed CL1F at $1.30 spread')
-                    
-                    # SET DEFAULT POSITION VALUE TO 1 -> 1 MEANING TRUE FOR POSITION
-
-                    cl1f_position = 1
-                    cl2f_position = 1
-
-                    # RUN THROUGH WHILE LOOP DURING OPEN POSITION TO PREVENT ALGORITHM FROM MOVING TO NEXT STEPS
-
-                    while cl1f_position == 1 or cl2f_position == 1:
-
-                        cl_1f_price = ticker_close(s, 'CL-1F')
-                        cl_2f_price = ticker_close(s, 'CL-2F')
-
-                        # LIQUIDATE POSITION AT $1.15 SPREAD
-
-                        if cl_2f_price - cl_1f_price < 1.15:
-                            
-                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                            sleep(.1)
-                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                            sleep(.1)
-
-                            print('Liquidated position')
-
-                            # BREAK WHILE LOOP WHEN POSITIONS == 0
-
-                            cl1f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-1F'})
-                            cl2f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-2F'})
-                            if cl1f.json()[0]['position'] == 0.0:
-                                if cl2f.json()[0]['position'] == 0.0:
-                                    break
-
-                        # SUBMIT ARBITRAGE TRADE IS CL1F AND CL2F HAVE A $1.50 SPREAD
-
-                        if cl_2f_price - cl_1f_price > 1.5:
-
-                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                            sleep(.1)
-                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                            sleep(.1)
-
-                            print('Shorted CL2F and longed CL1F at $1.50 spread')
-
-                            # RUN THROUGH WHILE LOOP DURING OPEN POSITION TO PREVENT ALGORITHM FROM MOVING TO NEXT STEPS
-
-                            while cl1f_position == 1 or cl2f_position == 1:
-
-                                cl_1f_price = ticker_close(s, 'CL-1F')
-                                cl_2f_price = ticker_close(s, 'CL-2F')
-
-                                # LIQUIDATE POSITION AT $1.15 SPREAD
-
-                                if cl_2f_price - cl_1f_price < 1.15:
-                            
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                    sleep(.1)
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                    sleep(.1)
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                    sleep(.1)
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                    sleep(.1)
-
-                                    print('Liquidated position')
-
-                                    # BREAK WHILE LOOP WHEN POSITIONS == 0
-
-                                    cl1f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-1F'})
-                                    cl2f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-2F'})
-                                    if cl1f.json()[0]['position'] == 0.0:
-                                        if cl2f.json()[0]['position'] == 0.0:
-                                            break
-
-                                # SUBMIT ARBITRAGE TRADE IS CL1F AND CL2F HAVE A $1.70 SPREAD
-
-                                if cl_2f_price - cl_1f_price > 1.7:
-
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                    sleep(.1)
-                                    s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                    sleep(.1)
-
-                                    print('Shorted CL2F and longed CL1F at 30 cent spread')
-
-                                    # RUN THROUGH WHILE LOOP DURING OPEN POSITION TO PREVENT ALGORITHM FROM MOVING TO NEXT STEPS
-
-                                    while cl1f_position == 1 or cl2f_position == 1:
-
-                                        cl_1f_price = ticker_close(s, 'CL-1F')
-                                        cl_2f_price = ticker_close(s, 'CL-2F')
-
-                                        # LIQUIDATE POSITION AT $1.15 SPREAD
-                                    
-                                        if cl_2f_price - cl_1f_price < 1.15:
-                            
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                            sleep(.1)
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                            sleep(.1)
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                            sleep(.1)
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                            sleep(.1)
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-1F', 'type': 'MARKET', 'quantity': 30, 'action': 'SELL'})
-                                            sleep(.1)
-                                            s.post('http://localhost:9999/v1/orders', params = {'ticker': 'CL-2F', 'type': 'MARKET', 'quantity': 30, 'action': 'BUY'})
-                                            sleep(.1)
-
-                                            print('Liquidated position')
-
-                                            # BREAK WHILE LOOP WHEN POSITIONS == 0
-
-                                            cl1f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-1F'})
-                                            cl2f = s.get('http://localhost:9999/v1/securities', params={'ticker': 'CL-2F'})
-                                            if cl1f.json()[0]['position'] == 0.0:
-                                                if cl2f.json()[0]['position'] == 0.0:
-                                                    break
+        while 0 <= tick < 600:
+            level = ladder_step(s, level)
+            tick = get_tick(s)
 
 if __name__ == '__main__':
     signal.signal(signal.SIGINT, signal_handler)
@@ -1,13 +1,15 @@
-import util
-from time import sleep
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import rit
 
 def get_cl_price(session):
-    res = session.get('http://localhost:9999/v1/securities?ticker=CL').json()[0]
+    res = rit.get_security(session, 'CL')
     return res['last']
 
 def get_future_price(session):
     ticker = 'CL-1F'
-    res = session.get(f'http://localhost:9999/v1/securities?ticker={ticker}').json()[0]
+    res = rit.get_security(session, ticker)
     return res['last']
 
 def calc_spot_future_spread(tick):
@@ -20,15 +22,18 @@ def spot_futures_arb(spot_price, future_price, theo_spread):
     print('actual-spread: ' + str(actual_spread))
     print('theo-spread: ' + str(theo_spread))
     if actual_spread > (theo_spread + required_margin):
-        print('SHORT FUTURES')
+        decision = 'SHORT FUTURES'
     elif (actual_spread + required_margin) < theo_spread:
-        print('BUY OIL')
+        decision = 'BUY OIL'
     else:
-        print('NEUTRALIZE POSITION')
+        decision = 'NEUTRALIZE POSITION'
+    print(decision)
+    return decision
 
 def main():
-    session = util.open_session()
-    tick = util.get_tick(session)
+    session = rit.open_session()
+    clock = rit.TickClock(session)
+    tick = clock.now()
     while tick > 0 and tick < 600:
         cl_price = get_cl_price(session)
         future_price = get_future_price(session)
@@ -36,7 +41,8 @@ def main():
         print(future_price)
         theo_spread = calc_spot_future_spread(tick)
         spot_futures_arb(cl_price, future_price, theo_spread)
-        tick = util.get_tick(session)
-        sleep(1)
+        # wake exactly at the next tick edge instead of a fixed one second later
+        tick = clock.wait_for_next_tick()
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
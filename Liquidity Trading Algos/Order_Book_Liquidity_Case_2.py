@@ -1,18 +1,11 @@
 import os
-import functools
-import operator
-import itertools
 from time import sleep
 import signal
-import requests
-import pandas as pd
-import pandas_ta as ta
-import re
-import json
-
-# this class definition allows printing error messages and stopping the program
-class ApiException(Exception):
-    pass
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit import RITClient, OrderGateway, TickClock, get_orders, order_params
+from rit.consolidated import consolidated_book
+from rit.router import venues
 
 # this signal handler allows for a graceful shutdown when CTRL+C is pressed
 def signal_handler(signum, frame):
@@ -20,47 +13,42 @@ def signal_handler(signum, frame):
     signal.signal(signal.SIGINT, signal.SIG_DFL)
     shutdown = True
 
-# set your API key to authenticate to the RIT client
-API_KEY = {'X-API-Key': 'KZJ94OPT'}
 shutdown = False
 
-# this helper method returns the current 'tick' of the running case
-def get_tick(session):
-    resp = session.get('http://localhost:9999/v1/case')
-    if resp.status_code == 401:
-        raise ApiException('Error getting tick: The API key provided in this Python code must match that in the RIT client')
-    case = resp.json()
-    return case['tick']
-
-# this helper method gets all the orders of a given type (OPEN/TRANSACTED/CANCELLED)
-def get_orders(session, status):
-    payload = {'status': status}
-    resp = session.get('http://localhost:9999/v1/orders', params=payload)
-    if resp.status_code == 401:
-        raise ApiException('The API key provided in this Python code must match that in the RIT client (please refer to the API hyperlink in the client toolbar and/or the RIT – User Guide – REST API Documentation.pdf)')
-    orders = resp.json()
-    return orders
+# resting order size and the ladder of prices posted on every venue of each security
+QUANTITY = 5000
+LADDER = {
+    'CRZY': {'SELL': (18.00, 24.00, 35.00, 45.00), 'BUY': (10.00, 9.00, 4.00, 2.00)},
+    'TAME': {'SELL': (30.00, 35.00, 85.00, 100.00), 'BUY': (21.00, 18.00, 6.00, 9.00)},
+}
 
-# this helper method returns the bid and ask for a given security
-def ticker_bid_ask(session, ticker):
-    payload = {'ticker': ticker}
-    resp = session.get('http://localhost:9999/v1/securities/book', params=payload)
-    if resp.ok:
-        book = resp.json()
-        return book['bids'][0]['price'], book['asks'][0]['price']
-    raise ApiException('Error getting bid / ask: The API key provided in this Python code must match that in the RIT client')
+# this function returns the ladder's orders for one security, on each of its venues, that would rest on the book:
+# a buy below the best ask and a sell above the best bid quoted across the venues
+def ladder_orders(ticker, book):
+    best_bid = book.touch('BUY')
+    best_ask = book.touch('SELL')
+    intents = []
+    for action, prices in LADDER[ticker].items():
+        for venue, fee in venues(ticker):
+            for price in prices:
+                if action == 'SELL' and best_bid is not None and price <= best_bid:
+                    continue
+                if action == 'BUY' and best_ask is not None and price >= best_ask:
+                    continue
+                intents.append(order_params(venue, 'LIMIT', QUANTITY, action, price))
+    return intents
 
 # this is the main method containing the actual order routing logic
 def main():
     
-    with requests.Session() as s:
-        # add the API key to the session to authenticate during requests
-        s.headers.update(API_KEY)
-        # get the current time of the case
-        tick = get_tick(s)
+    with RITClient() as s, OrderGateway(s) as gateway:
+        # get the current time of the case from a local tick clock instead of polling GET /case every iteration
+        clock = TickClock(s)
+        tick = clock.now()
+        books = {ticker: consolidated_book(ticker) for ticker in LADDER}
         
         while 3 <= tick <= 300:
-            tick = get_tick(s)
+            tick = clock.now()
 
             # get the current bid and ask for the security
             orders = get_orders(s, 'OPEN')
@@ -69,41 +57,19 @@ def main():
             # these orders are placed at key locations to provide liquidity at a premium when it dries up
             if len(orders) < 32:
 
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 18.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 24.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 35.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 45.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 18.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 24.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 35.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 45.00})
-
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 10.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 9.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 4.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 2.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 10.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 9.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 4.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'CRZY_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 2.00})
-                
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 30.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 35.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 85.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 100.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 30.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 35.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 85.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'SELL', 'price': 100.00})
+                # refresh both venues of each security into its consolidated book, and hold back any rung priced
+                # through the best quote across the venues: it would trade at once instead of waiting for liquidity
+                # to dry up
+                intents = []
+                for ticker, book in books.items():
+                    book.refresh(s)
+                    intents += ladder_orders(ticker, book)
 
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 21.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 18.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 6.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_A', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 9.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 21.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 6.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 21.00})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'TAME_M', 'type': 'LIMIT', 'quantity': 5000, 'action': 'BUY', 'price': 9.00})
+                # send the whole ladder at once so every level is live within about one round-trip
+                results = gateway.submit(intents)
+                for result in results:
+                    if not result.ok:
+                        print(f"order rejected: {result.params['ticker']} {result.params['action']} {result.params['price']}: {result.error}")
 
 if __name__ == '__main__':
     signal.signal(signal.SIGINT, signal_handler)
@@ -1,18 +1,10 @@
 import os
-import functools
-import operator
-import itertools
 from time import sleep
 import signal
-import requests
-import pandas as pd
-import pandas_ta as ta
-import re
-import json
-
-# this class definition allows printing error messages and stopping the program
-class ApiException(Exception):
-    pass
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit import RITClient, CancelManager, TickClock, last_candle, ticker_close, ticker_bid_ask, get_orders, PositionCache, order_book
+from rit.indicators import indicators
 
 # this signal handler allows for a graceful shutdown when CTRL+C is pressed
 def signal_handler(signum, frame):
@@ -20,30 +12,8 @@ def signal_handler(signum, frame):
     signal.signal(signal.SIGINT, signal.SIG_DFL)
     shutdown = True
 
-# set your API key to authenticate to the RIT client
-API_KEY = {'X-API-Key': 'KZJ94OPT'}
 shutdown = False
 
-# this helper method returns the current 'tick' of the running case
-def get_tick(session):
-    resp = session.get('http://localhost:9999/v1/case')
-    if resp.status_code == 401:
-        raise ApiException('Error getting tick: The API key provided in this Python code must match that in the RIT client')
-    case = resp.json()
-    return case['tick']
-
-# this helper method returns the last close price for the given security, one tick ago
-def ticker_close(session, ticker):
-    payload = {'ticker': ticker, 'limit': 1}
-    resp = session.get('http://localhost:9999/v1/securities/history', params=payload)
-    if resp.status_code == 401:
-        raise ApiException('The API key provided in this Python code must match that in the RIT client (please refer to the API hyperlink in the client toolbar and/or the RIT – User Guide – REST API Documentation.pdf)')
-    ticker_history = resp.json()
-    if ticker_history:
-        return ticker_history[0]['close']
-    else:
-        raise ApiException('Response error. Unexpected JSON response.')
-        
 # this function calculates the spread between the algo's bid and ask based on order book depth
 def calc_spread_cushion(order_books_stats):
     bid_vol = order_books_stats['Cumulative Vol Bid']
@@ -57,88 +27,25 @@ def calc_spread_cushion(order_books_stats):
 # this function submits a buy order
 def buy_order(session, ticker, quantity, price, price_cushion):
     buy_param = {'ticker': ticker, 'type': 'LIMIT', 'quantity': quantity, 'action': 'BUY', 'price': price + (price * price_cushion)}
-    session.post('http://localhost:9999/v1/orders', params = buy_param)
+    session.post('/orders', params = buy_param)
 
 # this function submits a sell order
 def sell_order(session, ticker, quantity, price, price_cushion):
     buy_param = {'ticker': ticker, 'type': 'LIMIT', 'quantity': quantity, 'action': 'SELL', 'price': price + (price * price_cushion)}
-    session.post('http://localhost:9999/v1/orders', params = buy_param)
-
-# this function fetches the bid and ask prices of a given ticker
-def ticker_bid_ask(session, ticker):
-    payload = {'ticker': ticker}
-    resp = session.get('http://localhost:9999/v1/securities/book', params=payload)
-    if resp.ok:
-        book = resp.json()
-        return [book['bids'][0]['price'], book['asks'][0]['price']]
-    raise ApiException('Error getting bid / ask: The API key provided in this Python code must match that in the RIT client') 
-
-# this helper method gets all the orders of a given type (OPEN/TRANSACTED/CANCELLED)
-def get_orders(session, status):
-    payload = {'status': status}
-    resp = session.get('http://localhost:9999/v1/orders', params=payload)
-    if resp.status_code == 401:
-        raise ApiException('The API key provided in this Python code must match that in the RIT client (please refer to the API hyperlink in the client toolbar and/or the RIT – User Guide – REST API Documentation.pdf)')
-    orders = resp.json()
-    return orders
-
-# this function calculates a smooth moving average for n periods
-def mov_avg(session, price):
-    array = []
-    array.append(price)
-
-    sum = 0
-    sma_period = 12
-
-    for idx, i in reversed(list(enumerate(array))):
-        if idx > len(array) - 13:
-            sum += i
-
-    mov_avg_num = sum/sma_period
-
-    if len(array) > 12:
-        del array[:-11]
-
-    if len(array) > 12:
-        del array[:-11]
-
-    return mov_avg_num
+    session.post('/orders', params = buy_param)
 
 # this function liquidates the entire portfolio
 def liquidate_portfolio():
     pass
 
-# this function fetches the position size for a given ticker
-def get_position(session, ticker):
-    positions = session.get('http://localhost:9999/v1/securities', params={'ticker': ticker})
-    position = positions.json()[0]['position']
-    return position
-
 # this function calculates summary statistic on the order book
+# the book is kept between calls and only the levels that changed since the last poll are re-aggregated
 def get_order_book_stats(session, ticker, limit):
+    book = order_book(ticker)
+    book.refresh(session, limit)
 
-    orders = session.get('http://localhost:9999/v1/securities/book', params={'ticker': ticker, 'limit': limit})
-
-    bids = orders.json()['bids']
-    asks = orders.json()['asks']
-
-    bid_cumulative_volume = 0
-    bid_number_of_orders = 0
-
-    ask_cumulative_volume = 0
-    ask_number_of_orders = 0
-
-    for i in bids:
-        if i['trader_id'] == 'ANON':
-
-            bid_cumulative_volume += i['quantity']
-            bid_number_of_orders += 1
-
-    for i in asks:
-        if i['trader_id'] == 'ANON':
-
-            ask_cumulative_volume += i['quantity']
-            ask_number_of_orders += 1
+    bid_cumulative_volume, bid_number_of_orders = book.bid_depth(trader_id='ANON')
+    ask_cumulative_volume, ask_number_of_orders = book.ask_depth(trader_id='ANON')
 
     dict = {'Cumulative Vol Bid': bid_cumulative_volume,
             'Bid Num of Orders': bid_number_of_orders,
@@ -150,42 +57,46 @@ def get_order_book_stats(session, ticker, limit):
 # this is the main method containing the actual order routing logic
 def main():
 
-    with requests.Session() as s:
-        # add the API key to the session to authenticate during requests
-        s.headers.update(API_KEY)
-        # get the current time of the case
-        tick = get_tick(s)
+    with RITClient() as s:
+        cancels = CancelManager(s)
+        # get the current time of the case from a local tick clock instead of polling GET /case every iteration
+        clock = TickClock(s)
+        positions = PositionCache(s)
+        tick = clock.now()
         
         while 3 <= tick <= 300:
-            tick = get_tick(s)
+            tick = clock.now()
 
             # fetch data via API to feed to algorithm
-            close = ticker_close(s, 'ALGO')
-            sma = mov_avg(s, close)
+            candle = last_candle(s, 'ALGO')
+            # rolling indicators over the last 12 ticks, warmed up from the price history on first use; the close is
+            # tagged with its own history tick, so a close the warm-up already loaded revises that tick instead of
+            # counting again
+            sma = indicators('ALGO', s).update(candle['close'], tick=candle['tick']).sma
             order_book_stats = get_order_book_stats(s, 'ALGO', 100)
             print(order_book_stats['Cumulative Vol Bid'])
             sleep(1)
             orders = get_orders(s, 'OPEN')
             algo_close = ticker_close(s, 'ALGO')
-            position = get_position(s, 'ALGO')
+            position = positions.get('ALGO')
 
             # liquidate portfolio and cancel all orders if portfolio is not neutral for longer than 7 seconds
             if position > 0:
                 sleep(7)
                 position = int(position)
-                s.post('http://localhost:9999/v1/commands/cancel?all=1')
+                cancels.cancel_all()
                 sleep(.25)
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'ALGO', 'type': 'MARKET', 'quantity': position, 'action': 'SELL'})
+                s.post('/orders', params={'ticker': 'ALGO', 'type': 'MARKET', 'quantity': position, 'action': 'SELL'})
                 print(position)
 
             if position < 0:
                 # cannot send negative position orders
                 position = position * -1
                 sleep(5)
-                s.post('http://localhost:9999/v1/commands/cancel?all=1')
+                cancels.cancel_all()
                 sleep(.25)
                 position = int(position)
-                s.post('http://localhost:9999/v1/orders', params={'ticker': 'ALGO', 'type': 'MARKET', 'quantity': position, 'action': 'BUY'})
+                s.post('/orders', params={'ticker': 'ALGO', 'type': 'MARKET', 'quantity': position, 'action': 'BUY'})
 
             if position == 0:
                 # check if you have 0 open orders   
@@ -1,18 +1,12 @@
 import os
-import functools
-import operator
-import itertools
-from time import sleep
+import asyncio
 import signal
-import requests
-import pandas as pd
-#import pandas_ta as ta
-import re
-import json
-
-# this class definition allows printing error messages and stopping the program
-class ApiException(Exception):
-    pass
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit import TickClock, PositionCache, submit_async, cancel_ids_async
+from rit.aio import AsyncRITClient, fetch_all
+from rit.analytics import book_stats
+from rit.indicators import indicators
 
 # this signal handler allows for a graceful shutdown when CTRL+C is pressed
 def signal_handler(signum, frame):
@@ -20,30 +14,8 @@ def signal_handler(signum, frame):
     signal.signal(signal.SIGINT, signal.SIG_DFL)
     shutdown = True
 
-# set your API key to authenticate to the RIT client
-API_KEY = {'X-API-Key': 'KZJ94OPT'}
 shutdown = False
 
-# this helper method returns the current 'tick' of the running case
-def get_tick(session):
-    resp = session.get('http://localhost:9999/v1/case')
-    if resp.status_code == 401:
-        raise ApiException('Error getting tick: The API key provided in this Python code must match that in the RIT client')
-    case = resp.json()
-    return case['tick']
-
-# this helper method returns the last close price for the given security, one tick ago
-def ticker_close(session, ticker):
-    payload = {'ticker': ticker, 'limit': 1}
-    resp = session.get('http://localhost:9999/v1/securities/history', params=payload)
-    if resp.status_code == 401:
-        raise ApiException('The API key provided in this Python code must match that in the RIT client (please refer to the API hyperlink in the client toolbar and/or the RIT – User Guide – REST API Documentation.pdf)')
-    ticker_history = resp.json()
-    if ticker_history:
-        return ticker_history[0]['close']
-    else:
-        raise ApiException('Response error. Unexpected JSON response.')
-
 def calc_spread_cushion(order_books_stats):
     bid_vol = order_books_stats['Cumulative Vol Bid']
     ask_vol = order_books_stats['Cumulative Vol Ask']
@@ -56,166 +28,74 @@ def calc_spread_cushion(order_books_stats):
 # this function submits a buy order
 def buy_order(session, ticker, quantity, price, price_cushion):
     buy_param = {'ticker': ticker, 'type': 'LIMIT', 'quantity': quantity, 'action': 'BUY', 'price': price + (price * price_cushion)}
-    session.post('http://localhost:9999/v1/orders', params = buy_param)
+    session.post('/orders', params = buy_param)
 
 # this function submits a sell order
 def sell_order(session, ticker, quantity, price, price_cushion):
     buy_param = {'ticker': ticker, 'type': 'LIMIT', 'quantity': quantity, 'action': 'SELL', 'price': price + (price * price_cushion)}
-    session.post('http://localhost:9999/v1/orders', params = buy_param)
-
-# this function fetches the bid and ask prices of a given ticker
-def ticker_bid_ask(session, ticker):
-    payload = {'ticker': ticker}
-    resp = session.get('http://localhost:9999/v1/securities/book', params=payload)
-    if resp.ok:
-        book = resp.json()
-        return [book['bids'][0]['price'], book['asks'][0]['price']]
-    raise ApiException('Error getting bid / ask: The API key provided in this Python code must match that in the RIT client') 
-
-# this helper method gets all the orders of a given type (OPEN/TRANSACTED/CANCELLED)
-def get_orders(session, status):
-    payload = {'status': status}
-    resp = session.get('http://localhost:9999/v1/orders', params=payload)
-    if resp.status_code == 401:
-        raise ApiException('The API key provided in this Python code must match that in the RIT client (please refer to the API hyperlink in the client toolbar and/or the RIT – User Guide – REST API Documentation.pdf)')
-    orders = resp.json()
-    return orders
-
-# this function calculates a smooth moving average for n periods
-def mov_avg(session, price):
-    array = []
-    array.append(price)
-
-    sum = 0
-    sma_period = 12
-
-    for idx, i in reversed(list(enumerate(array))):
-        if idx > len(array) - 13:
-            sum += i
-
-    mov_avg_num = sum/sma_period
-
-    if len(array) > 12:
-        del array[:-11]
-
-    if len(array) > 12:
-        del array[:-11]
-
-    return mov_avg_num
+    session.post('/orders', params = buy_param)
 
 # this function liquidates the entire portfolio
 def liquidate_portfolio():
     pass
 
-# this function fetches the position size for a given ticker
-def get_position(session, ticker):
-    positions = session.get('http://localhost:9999/v1/securities', params={'ticker': ticker})
-    position = positions.json()[0]['position']
-    return position
-
-def get_order_book_stats(session, ticker, limit):
-
-    orders = session.get('http://localhost:9999/v1/securities/book', params={'ticker': ticker, 'limit': limit})
-
-    bids = orders.json()['bids']
-    asks = orders.json()['asks']
-
-    bid_cumulative_volume = 0
-    bid_number_of_orders = 0
-
-    ask_cumulative_volume = 0
-    ask_number_of_orders = 0
-
-    for i in bids:
-        if i['trader_id'] == 'ANON':
-
-            bid_cumulative_volume += 1
-            bid_number_of_orders += i['quantity']
-
-    for i in asks:
-        if i['trader_id'] == 'ANON':
-
-            ask_cumulative_volume += 1
-            ask_number_of_orders += i['quantity']
-
-    order_totals = {'Cumulative Vol Bid': bid_cumulative_volume,
-            'Bid Num of Orders': bid_number_of_orders,
-            'Cumulative Vol Ask': ask_cumulative_volume,
-            'Ask Num of Orders': ask_number_of_orders,}
-
-    bid_vol = order_totals['Cumulative Vol Bid']
-    bid_order = order_totals['Bid Num of Orders']
-    ask_vol = order_totals['Cumulative Vol Ask']
-    ask_order = order_totals['Ask Num of Orders']
-    return order_totals, bid_vol, bid_order, ask_vol, ask_order
-
 # this is the main method containing the actual order routing logic
-def main():
+async def main():
 
-    with requests.Session() as s:
-        # add the API key to the session to authenticate during requests
-        s.headers.update(API_KEY)
+    async with AsyncRITClient() as s:
         t = 'CNR'
         t1 = 'RY'
         t2 = 'AC'
 
-        cnr_bid = ticker_bid_ask(s, t)
-        cnr_bid = cnr_bid[0]
-        cnr_ask = ticker_bid_ask(s, t)
-        cnr_ask = cnr_ask[1]
-
-        ry_bid = ticker_bid_ask(s, t)
-        ry_bid = ry_bid[0]
-        ry_ask = ticker_bid_ask(s, t)
-        ry_ask = ry_ask[1]
+        # request the bid and ask of every ticker at once
+        (cnr_bid, cnr_ask), (ry_bid, ry_ask), (ac_bid, ac_ask) = await fetch_all(
+            s.ticker_bid_ask(t), s.ticker_bid_ask(t1), s.ticker_bid_ask(t2))
 
-        ac_bid = ticker_bid_ask(s, t)
-        ac_bid = ac_bid[0]
-        ac_ask = ticker_bid_ask(s, t)
-        ac_ask = ac_ask[1]
-        # get the current time of the case
-
-        tick = get_tick(s)
+        # get the current time of the case; the tick clock predicts it locally and re-syncs every few seconds
+        clock = TickClock()
+        positions = PositionCache()
+        tick = await clock.sync_async(s)
+        # rolling indicators over the last 12 ticks, warmed up from the price history
+        rolling = await indicators(t).warm_up_async(s)
        
         while 5 <= tick <= 300:
-            tick = get_tick(s)
-            orders = get_orders(s, 'OPEN')
-            
-            # fetch data via API to feed to algorithm
-            
-            resp = s.get('http://localhost:9999/v1/securities/book', params={'ticker': t, 'limit': 100})
-            resp = s.get('http://localhost:9999/v1/securities/book', params={'ticker': t1, 'limit': 100})
-            resp = s.get('http://localhost:9999/v1/securities/book', params={'ticker': t2, 'limit': 100})
+            if clock.stale():
+                await clock.sync_async(s)
+            tick = clock.now()
+
+            # fetch data via API to feed to algorithm: every independent read is sent at once
+            (orders, book, book_1, book_2, candle, close_1, close_2, securities) = await fetch_all(
+                s.get_orders('OPEN'),
+                s.get_book(t, 100), s.get_book(t1, 100), s.get_book(t2, 100),
+                s.last_candle(t), s.ticker_close(t1), s.ticker_close(t2),
+                s.get_securities())
+            # one /securities read refreshes the position of every ticker
+            positions.update(securities)
+            position, position_1, position_2 = positions.get(t), positions.get(t1), positions.get(t2)
             my_orders = 0
             
             lastorder = len(orders)
-            close = ticker_close(s, t)
-            close_1 = ticker_close(s, t1)
-            close_2 = ticker_close(s, t2)
-            sma = mov_avg(s, close)
-            order_book_stats = get_order_book_stats(s, t, 100)
-            order_book_stats_1 = get_order_book_stats(s, t1, 100)
-            order_book_stats_2 = get_order_book_stats(s, t2, 100)
+            close = candle['close']
+            # the close is tagged with its own history tick, so a close the warm-up already loaded revises that tick
+            # instead of counting again
+            sma = rolling.update(close, tick=candle['tick']).sma
+            # ANON volume and order counts of all three books in one vectorized pass
+            order_book_stats = book_stats({t: book, t1: book_1, t2: book_2})
             
-            bid_order = order_book_stats[1]
-            bid_vol = order_book_stats[2]
-            ask_vol = order_book_stats[4]
-            ask_order = order_book_stats[3]
-
-            bid_vol_1 = order_book_stats_1[2]
-            ask_vol_1 = order_book_stats_1[4]
+            bid_vol = order_book_stats[t]['Cumulative Vol Bid']
+            bid_order = order_book_stats[t]['Bid Num of Orders']
+            ask_vol = order_book_stats[t]['Cumulative Vol Ask']
+            ask_order = order_book_stats[t]['Ask Num of Orders']
 
-            bid_vol_2 = order_book_stats_2[2]
-            ask_vol_2 = order_book_stats_2[4]
+            bid_vol_1 = order_book_stats[t1]['Cumulative Vol Bid']
+            ask_vol_1 = order_book_stats[t1]['Cumulative Vol Ask']
 
-            algo_close = ticker_close(s, t)
-            position = get_position(s, t)
+            bid_vol_2 = order_book_stats[t2]['Cumulative Vol Bid']
+            ask_vol_2 = order_book_stats[t2]['Cumulative Vol Ask']
 
-            algo_close_1 = ticker_close(s, t1)
-            position_1 = get_position(s, t1)
-            
-            algo_close_2 = ticker_close(s, t2)
-            position_2 = get_position(s, t2)
+            algo_close = close
+            algo_close_1 = close_1
+            algo_close_2 = close_2
 
             ask_bid_voldif = ask_vol - bid_vol
             ask_bid_voldif_1 = ask_vol_1 - bid_vol_1
@@ -226,12 +106,14 @@ def main():
 
             if 15000 < ask_bid_voldif:
                 spread = 0.03
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close + (spread + 0.01), 'quantity': 500, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close + (spread + 0.02), 'quantity': 500, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close - (spread + 0.02), 'quantity': 750, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close + (spread + 0.02), 'quantity': 500, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close + (spread + 0.03), 'quantity': 500, 'action': 'SELL'})
-                sleep(1.7)
+                await submit_async(s, [
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close + (spread + 0.01), 'quantity': 500, 'action': 'SELL'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close + (spread + 0.02), 'quantity': 500, 'action': 'SELL'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close - (spread + 0.02), 'quantity': 750, 'action': 'BUY'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close + (spread + 0.02), 'quantity': 500, 'action': 'SELL'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close + (spread + 0.03), 'quantity': 500, 'action': 'SELL'},
+                ])
+                await asyncio.sleep(1.7)
 
                 if position < -5000:
                     spread = 0.02
@@ -240,12 +122,14 @@ def main():
             
             if 15000 > ask_bid_voldif:
                 spread = 0.03
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close - (spread + 0.01), 'quantity': 500, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close - (spread + 0.02), 'quantity': 500, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close + (spread + 0.02), 'quantity': 750, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close - (spread + 0.02), 'quantity': 500, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close - (spread + 0.03), 'quantity': 500, 'action': 'BUY'})
-                sleep(1.7)
+                await submit_async(s, [
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close - (spread + 0.01), 'quantity': 500, 'action': 'BUY'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close - (spread + 0.02), 'quantity': 500, 'action': 'BUY'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close + (spread + 0.02), 'quantity': 750, 'action': 'SELL'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close - (spread + 0.02), 'quantity': 500, 'action': 'BUY'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close - (spread + 0.03), 'quantity': 500, 'action': 'BUY'},
+                ])
+                await asyncio.sleep(1.7)
 
                 if position > 5000 :
                     spread = 0.02
@@ -254,12 +138,14 @@ def main():
 
             if 15000 < ask_bid_voldif_1:
                 spread = 0.03
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 + (spread + 0.01), 'quantity': 500, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 + (spread + 0.02), 'quantity': 500, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 - (spread + 0.02), 'quantity': 750, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 + (spread + 0.02), 'quantity': 500, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 + (spread + 0.03), 'quantity': 500, 'action': 'SELL'})
-                sleep(1.7)
+                await submit_async(s, [
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 + (spread + 0.01), 'quantity': 500, 'action': 'SELL'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 + (spread + 0.02), 'quantity': 500, 'action': 'SELL'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 - (spread + 0.02), 'quantity': 750, 'action': 'BUY'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 + (spread + 0.02), 'quantity': 500, 'action': 'SELL'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 + (spread + 0.03), 'quantity': 500, 'action': 'SELL'},
+                ])
+                await asyncio.sleep(1.7)
 
                 if position_1 < -5000:
                     spread = 0.02
@@ -269,12 +155,14 @@ def main():
             
             if 15000 > ask_bid_voldif_1:
                 spread = 0.03
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 - (spread + 0.01), 'quantity': 500, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 - (spread + 0.02), 'quantity': 500, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 + (spread + 0.02), 'quantity': 750, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 - (spread + 0.02), 'quantity': 500, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 - (spread + 0.03), 'quantity': 500, 'action': 'BUY'})
-                sleep(1.7)
+                await submit_async(s, [
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 - (spread + 0.01), 'quantity': 500, 'action': 'BUY'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 - (spread + 0.02), 'quantity': 500, 'action': 'BUY'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 + (spread + 0.02), 'quantity': 750, 'action': 'SELL'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 - (spread + 0.02), 'quantity': 500, 'action': 'BUY'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 - (spread + 0.03), 'quantity': 500, 'action': 'BUY'},
+                ])
+                await asyncio.sleep(1.7)
 
                 if position_1 > 5000 :
                     spread = 0.02
@@ -283,47 +171,49 @@ def main():
 
             if position <= -5000:
                 
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close, 'quantity': 750, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close, 'quantity': 750, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close, 'quantity': 750, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close, 'quantity': 750, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close, 'quantity': 750, 'action': 'BUY'})
-                sleep(1)
+                await submit_async(s, [
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close, 'quantity': 750, 'action': 'BUY'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close, 'quantity': 750, 'action': 'BUY'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close, 'quantity': 750, 'action': 'BUY'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close, 'quantity': 750, 'action': 'BUY'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close, 'quantity': 750, 'action': 'BUY'},
+                ])
+                await asyncio.sleep(1)
 
             if position_1 <= -5000:
                 
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1  , 'quantity': 750, 'action': 'BUY'})
-                
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'BUY'})
-                
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1  , 'quantity': 750, 'action': 'BUY'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1  , 'quantity': 750, 'action': 'BUY'})
-                sleep(1)
+                await submit_async(s, [
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1  , 'quantity': 750, 'action': 'BUY'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'BUY'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'BUY'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1  , 'quantity': 750, 'action': 'BUY'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1  , 'quantity': 750, 'action': 'BUY'},
+                ])
+                await asyncio.sleep(1)
 
             if position >= 5000:
                                 
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close , 'quantity': 750, 'action': 'SELL'})
-                
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close , 'quantity': 750, 'action': 'SELL'})
-                
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close , 'quantity': 750, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close , 'quantity': 750, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t, 'type': 'LIMIT', 'price': algo_close , 'quantity': 750, 'action': 'SELL'})
-                sleep(1)
+                await submit_async(s, [
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close , 'quantity': 750, 'action': 'SELL'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close , 'quantity': 750, 'action': 'SELL'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close , 'quantity': 750, 'action': 'SELL'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close , 'quantity': 750, 'action': 'SELL'},
+                    {'ticker': t, 'type': 'LIMIT', 'price': algo_close , 'quantity': 750, 'action': 'SELL'},
+                ])
+                await asyncio.sleep(1)
 
             if position_1 >= 5000:
                 
                 
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'SELL'})
-                s.post('http://localhost:9999/v1/orders', params={'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'SELL'})
-                sleep(1)
+                await submit_async(s, [
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'SELL'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'SELL'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'SELL'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'SELL'},
+                    {'ticker': t1, 'type': 'LIMIT', 'price': algo_close_1 , 'quantity': 750, 'action': 'SELL'},
+                ])
+                await asyncio.sleep(1)
                 
-            order_len = len(orders)
-
             cnr_orders = []
             ac_orders = []
             ry_orders = []
@@ -334,44 +224,23 @@ def main():
                     cnr_orders.append(orders[order_index])
                 if orders[order_index]['ticker'] == 'RY':
                     ry_orders.append(orders[order_index])
+                if orders[order_index]['ticker'] == 'AC':
+                    ac_orders.append(orders[order_index])
                 order_index += 1
 
             t = 'CNR'
             t1 = 'RY'
             t2 = 'AC'
             
+            # trim each ticker's ladder back to its first 12 orders in batched /commands/cancel calls
             if len(cnr_orders) >= 20:
-                                
-                order_cancel_length = order_len - 12
-                order_id_list = []
-
-                for i in range(order_cancel_length):
-                    int_i = int(i)
-                    location = order_len - int_i - 1
-                    int(location)
-                    order_id = orders[location]['order_id']
-                    order_id_list.append(order_id)
-
-                s.post('http://localhost:9999/v1/commands/cancel', params={'all': 0, 'ticker': t, 'ids': order_id_list})
+                await cancel_ids_async(s, [order['order_id'] for order in cnr_orders[12:]])
 
             if len(ry_orders) >= 20:
-                                
-                order_cancel_length = order_len - 12
-                order_id_list = []
-
-                for i in range(order_cancel_length):
-                    int_i = int(i)
-                    location = order_len - int_i - 1
-                    int(location)
-                    order_id = orders[location]['order_id']
-                    order_id_list.append(order_id)
-
-                s.post('http://localhost:9999/v1/commands/cancel', params={'all': 0, 'ticker': t1, 'ids': order_id_list})
-
-                s.post('http://localhost:9999/v1/commands/cancel', params={'all': 0, 'ticker': t2, 'ids': order_id_list})
+                await cancel_ids_async(s, [order['order_id'] for order in ry_orders[12:] + ac_orders[12:]])
 
             print(len(cnr_orders), len(ac_orders), len(ry_orders))
 
 if __name__ == '__main__':
     signal.signal(signal.SIGINT, signal_handler)
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
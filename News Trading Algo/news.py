@@ -1,38 +1,29 @@
-import util
+import os
+import sys
 from time import sleep
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import rit
+from rit.exits import ExitEngine
+from rit.headlines import InventoryReport, parse_news_item
 
 def get_news(session):
-    return session.get('http://localhost:9999/v1/news?limit=1').json()
+    return rit.get_news(session, limit=1)
 
+# this function returns the EIA inventory report in a /news item, or None for any other headline
 def parse_news(news):
     if news is None:
         return
-    headline = news['headline']
-    first_letter = headline[0]
-    if (first_letter == 'W'):
-        headline = headline.split(" ")
-        actual_stock = headline[4]
-        actual_qty = headline[5]
-        forecast_stock = headline[10]
-        forecast_qty = headline[11]
-        return {
-            'actual_stock': actual_stock,
-            'actual_qty': actual_qty,
-            'forecast_stock': forecast_stock,
-            'forecast_qty': forecast_qty
-        }
-    else:
-        return
+    event = parse_news_item(news)
+    if isinstance(event, InventoryReport):
+        return event
 
 def interpret_news(news):
     if news is None:
         return 
-    actual_stock = news['actual_stock']
-    actual_qty = news['actual_qty']
-    forecast_stock = news['forecast_stock']
-    forecast_qty = news['forecast_qty']
-    actual_qty = int(actual_qty)
-    forecast_qty = int(forecast_qty)
+    actual_stock = news.actual_stock
+    actual_qty = news.actual_qty
+    forecast_stock = news.forecast_stock
+    forecast_qty = news.forecast_qty
     # build build
     if ((actual_stock == 'BUILD') and (forecast_stock == 'BUILD')):
         dif = actual_qty - forecast_qty
@@ -87,83 +78,65 @@ def place_order(session, ticker, qty, trade_decision):
     if (trade_decision is None):
         return
     while trade_decision['trade_decision'] == 'BUY' and orders_placed < 7:
-        util.lease_storage(session, storage_ticker)
+        rit.lease_storage(session, storage_ticker)
         sleep(0.5)
-        util.place_mkt_buy_order(session, ticker, qty)
+        rit.place_mkt_buy_order(session, ticker, qty)
         orders_placed += 1
     while trade_decision['trade_decision'] == 'SELL' and orders_placed < 7:
-        util.place_mkt_sell_order(session, futures_ticker, qty)
+        rit.place_mkt_sell_order(session, futures_ticker, qty)
         orders_placed += 1
         sleep(0.5)
 
-def reset_position(session, trade_decision):
-    if (trade_decision is None):
-        return
-    orders_placed = 0
-    if (trade_decision['trade_decision'] == 'BUY'):
-        ticker = 'CL'
-        quantity = 10
-        price_shock = trade_decision['price_shock']
-        print('price_shock: ' + str(price_shock))
-        spot = session.get(f'http://localhost:9999/v1/securities?ticker={ticker}').json()[0]
-        spot_price = spot['last']
-        old_spot_price = spot_price
-        while spot_price < ((old_spot_price + (price_shock * 0.75))):
-            print('spot-price: ' + str(spot_price))
-            spot_price_plus_shock = (old_spot_price + (price_shock * 0.7))
-            print('spot-price-plus-shock: ' + str(spot_price_plus_shock))
-            if (spot_price >= (old_spot_price + (price_shock * 0.7))):
-                while orders_placed < 7:
-                    util.place_mkt_sell_order(session, ticker, quantity)
-                    orders_placed += 1
-                    sleep(1)
-            updated_spot = session.get(f'http://localhost:9999/v1/securities?ticker={ticker}').json()[0]
-            sleep(1)
-            spot_price = updated_spot['last']
-            print(spot_price)
+# a news trade is closed once the price has moved EXIT_FRACTION of the expected shock, in EXIT_LOTS market orders
+# of EXIT_QUANTITY; EXIT_TICKS after entry it is closed whatever the price (the old loop could wait forever)
+EXIT_FRACTION = 0.7
+EXIT_LOTS = 7
+EXIT_QUANTITY = 10
+EXIT_TICKS = 45
+
+# how long the main loop waits for a headline before it checks the exit triggers again, in seconds
+EXIT_POLL = 0.25
+
+# this function registers the exit of a news trade with the exit engine: a long CL position after a BUY, a short
+# CL-2F position after a SELL; the trigger fires on the price target or the time stop
+def add_exit(exits, session, trade_decision, tick=None):
+    if trade_decision is None or trade_decision['trade_decision'] not in ('BUY', 'SELL'):
+        return None
+    price_shock = abs(trade_decision['price_shock'])
+    print('price_shock: ' + str(price_shock))
+    if trade_decision['trade_decision'] == 'BUY':
+        ticker, action, direction = 'CL', 'SELL', 1
+    else:
+        ticker, action, direction = 'CL-2F', 'BUY', -1
+    entry_price = rit.get_security(session, ticker)['last']
+    target = entry_price + direction * price_shock * EXIT_FRACTION
+    stop_tick = None if tick is None else tick + EXIT_TICKS
+    trigger = exits.add(ticker, action, EXIT_QUANTITY, EXIT_LOTS, target=target, stop_tick=stop_tick, tick=tick)
+    print(trigger)
+    return trigger
 
-    elif (trade_decision['trade_decision'] == 'SELL'):
-        ticker = 'CL-2F'
-        quantity = 10
-        price_shock = trade_decision['price_shock']
-        print('price_shock: ' + str(price_shock))
-        futures = session.get(f'http://localhost:9999/v1/securities?ticker={ticker}').json()[0]
-        futures_price = futures['last']
-        old_futures_price = futures_price
-        while futures_price > (old_futures_price - (price_shock * 0.75)):
-            print('futres-price: ' + str(futures_price))
-            futures_price_minus_shock = (old_futures_price - (price_shock * 0.7))
-            print('futures-price-minus-shock: ' + str(futures_price_minus_shock))
-            if (futures_price <= (old_futures_price - (price_shock * 0.7))):
-                while orders_placed < 7:
-                    util.place_mkt_buy_order(session, ticker, quantity)
-                    orders_placed += 1
-                    sleep(1)
-            updated_futures = session.get(f'http://localhost:9999/v1/securities?ticker={ticker}').json()[0]
-            sleep(1)
-            futures_price = updated_futures['last']
-            print(futures_price)
-    
 def main():
-    session = util.open_session()
-    tick = util.get_tick(session)
+    session = rit.open_session()
+    clock = rit.TickClock(session)
+    tick = clock.now()
     ticker = 'CL'
     quantity = 10
-    old_news_id = -1
-    while tick >= 0 and tick <= 600:
-        news = get_news(session)[0]
-        if news['headline'] != 'Welcome to the Commodities Trading 5 Case':
-            if (news['news_id'] == old_news_id):
-                news = None
-            news_results = parse_news(news)
-            trade_decsion = interpret_news(news_results)
-            print(trade_decsion)
-            place_order(session, ticker, quantity, trade_decsion)
-            sleep(1)
-            reset_position(session, trade_decsion)
-            if news is not None:
-                old_news_id = news['news_id']
-        tick = util.get_tick(session)
-        print('tick: ' + str(tick))
+    # the feed follows /news from its own thread and the exit engine checks every open trade from one /securities
+    # read per pass, so new headlines are traded while earlier trades wait for their exits
+    with rit.NewsFeed(session, parse=parse_news) as feed, ExitEngine(session) as exits:
+        while tick >= 0 and tick <= 600:
+            news_results = feed.next(timeout=EXIT_POLL)
+            if news_results is not None:
+                trade_decsion = interpret_news(news_results)
+                print(trade_decsion)
+                place_order(session, ticker, quantity, trade_decsion)
+                add_exit(exits, session, trade_decsion, tick)
+            for trigger in exits.step(tick):
+                print(trigger)
+            new_tick = clock.now()
+            if new_tick != tick:
+                print('tick: ' + str(new_tick))
+            tick = new_tick
 
-main()
+if __name__ == '__main__':
+    main()
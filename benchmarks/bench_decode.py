@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import random
+import timeit
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit.records import decode_book, orjson
+
+# this benchmark compares the current dict path (resp.json(), copy each level into a new dict, then look up
+# 'trader_id' and 'quantity' per level like get_order_book_stats) against decoding into BookLevel records
+
+DEPTH = 100
+
+# this function builds a /securities/book response body shaped like the RIT client's
+def make_book(depth=DEPTH, seed=1):
+    rng = random.Random(seed)
+    def level(i, action, price):
+        quantity = rng.randrange(100, 5000, 100)
+        return {'order_id': i, 'period': 1, 'tick': rng.randrange(300), 'trader_id': 'ANON' if rng.random() < .8 else 'trader1',
+                'ticker': 'ALGO', 'type': 'LIMIT', 'quantity': quantity, 'action': action, 'price': round(price, 2),
+                'quantity_filled': rng.randrange(0, quantity, 100), 'vwap': None, 'status': 'OPEN'}
+    bids = [level(i, 'BUY', 25 - i * .01) for i in range(depth)]
+    asks = [level(depth + i, 'SELL', 25.01 + i * .01) for i in range(depth)]
+    return json.dumps({'bids': bids, 'asks': asks}).encode()
+
+def dict_path(raw):
+    book = json.loads(raw)
+    bids_clean = [{'price': bid['price'], 'quantity': bid['quantity']} for bid in book['bids']]
+    asks_clean = [{'price': ask['price'], 'quantity': ask['quantity']} for ask in book['asks']]
+    bid_volume = 0
+    ask_volume = 0
+    for i in book['bids']:
+        if i['trader_id'] == 'ANON':
+            bid_volume += i['quantity']
+    for i in book['asks']:
+        if i['trader_id'] == 'ANON':
+            ask_volume += i['quantity']
+    return bids_clean, asks_clean, bid_volume, ask_volume
+
+def record_path(raw):
+    bids, asks = decode_book(raw)
+    bid_volume = 0
+    ask_volume = 0
+    for level in bids:
+        if level.trader_id == 'ANON':
+            bid_volume += level.quantity
+    for level in asks:
+        if level.trader_id == 'ANON':
+            ask_volume += level.quantity
+    return bids, asks, bid_volume, ask_volume
+
+def bench(fn, raw, number):
+    best = min(timeit.repeat(lambda: fn(raw), number=number, repeat=5))
+    return best / number * 1e6
+
+def main(number=2000):
+    raw = make_book()
+    assert dict_path(raw)[2:] == record_path(raw)[2:]
+    dict_us = bench(dict_path, raw, number)
+    record_us = bench(record_path, raw, number)
+    print(f'book depth {DEPTH} per side, {len(raw)} bytes, decoder: {"orjson" if orjson else "json"}')
+    print(f'dict path:   {dict_us:8.1f} us/book')
+    print(f'record path: {record_us:8.1f} us/book  ({dict_us / record_us:.2f}x)')
+
+if __name__ == '__main__':
+    main()
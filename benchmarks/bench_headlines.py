@@ -0,0 +1,93 @@
+import os
+import sys
+import timeit
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit.headlines import InventoryReport, InventoryForecast, CaseStart, parse_headline
+
+# this benchmark checks rit.headlines against a corpus of headlines, the wordings the case uses and variations
+# of them, then times parse_headline per headline next to the split-and-index parser news.py used to have.
+# It exits 1 when any headline in the corpus parses to the wrong event
+
+# headline -> expected event: (class, fields) or None for headlines that carry nothing to trade
+CORPUS = [
+    ('WEEK 1 EIA REPORT: BUILD 5 MILLION BARRELS, FORECAST WAS BUILD 3 MILLION BARRELS',
+     (InventoryReport, ('BUILD', 5, 'BUILD', 3, 1))),
+    ('WEEK 2 EIA REPORT: DRAW 4 MILLION BARRELS, FORECAST WAS BUILD 2 MILLION BARRELS',
+     (InventoryReport, ('DRAW', 4, 'BUILD', 2, 2))),
+    ('WEEK 3 EIA REPORT: BUILD 1 MILLION BARRELS, FORECAST WAS DRAW 3 MILLION BARRELS',
+     (InventoryReport, ('BUILD', 1, 'DRAW', 3, 3))),
+    ('WEEK 4 EIA REPORT: DRAW 6 MILLION BARRELS, FORECAST WAS DRAW 6 MILLION BARRELS',
+     (InventoryReport, ('DRAW', 6, 'DRAW', 6, 4))),
+    ('WEEK 10 EIA REPORT: BUILD 12 MILLION BARRELS, FORECAST WAS DRAW 0 MILLION BARRELS',
+     (InventoryReport, ('BUILD', 12, 'DRAW', 0, 10))),
+    ('Week 5 EIA Report: Build 2.5 million barrels, forecast was build 1.5 million barrels',
+     (InventoryReport, ('BUILD', 2.5, 'BUILD', 1.5, 5))),
+    ('WEEK 6 EIA REPORT:  DRAW  3 MILLION BARRELS ,  FORECAST WAS  DRAW 1 MILLION BARRELS.',
+     (InventoryReport, ('DRAW', 3, 'DRAW', 1, 6))),
+    ('WEEK 7 EIA REPORT: BUILD 4M BARRELS VS. FORECAST BUILD 2M BARRELS',
+     (InventoryReport, ('BUILD', 4, 'BUILD', 2, 7))),
+    ('WEEK 8 EIA CRUDE INVENTORY REPORT: DRAW OF 2 MM BBL, EXPECTED DRAW OF 5 MM BBL',
+     (InventoryReport, ('DRAW', 2, 'DRAW', 5, 8))),
+    ('EIA REPORT - ACTUAL BUILD 3 MILLION BARRELS AGAINST A FORECAST OF DRAW 1 MILLION BARRELS',
+     (InventoryReport, ('BUILD', 3, 'DRAW', 1, None))),
+    ('WEEK 9 EIA REPORT: INCREASE 2 MILLION BARRELS, FORECAST WAS DECREASE 1 MILLION BARRELS',
+     (InventoryReport, ('BUILD', 2, 'DRAW', 1, 9))),
+    ('WEEK 11 EIA REPORT: FORECAST WAS BUILD 3 MILLION BARRELS, ACTUAL DRAW 2 MILLION BARRELS',
+     (InventoryReport, ('DRAW', 2, 'BUILD', 3, 11))),
+    ('WEEK 12 EIA FORECAST: DRAW 4 MILLION BARRELS',
+     (InventoryForecast, ('DRAW', 4, 12))),
+    ('EIA inventory forecast for week: build 1.5 million barrels', None),
+    ('Welcome to the Commodities Trading 5 Case', (CaseStart, ('Commodities Trading 5',))),
+    ('WELCOME TO THE LIQUIDITY RISK CASE', (CaseStart, ('LIQUIDITY RISK',))),
+    ('WEEK 1 EIA REPORT: BUILD 5 MILLION BARRELS', None),
+    ('WEEK 1 EIA REPORT', None),
+    ('CRZY ANNOUNCES QUARTERLY EARNINGS ABOVE EXPECTATIONS', None),
+    ('', None),
+]
+
+def fields(event):
+    if isinstance(event, InventoryReport):
+        return event.actual_stock, event.actual_qty, event.forecast_stock, event.forecast_qty, event.week
+    if isinstance(event, InventoryForecast):
+        return event.forecast_stock, event.forecast_qty, event.week
+    return (event.case,)
+
+# this function returns the headlines whose parse differs from the corpus
+def check(corpus=CORPUS):
+    failures = []
+    for headline, expected in corpus:
+        event = parse_headline(headline)
+        if expected is None:
+            if event is not None:
+                failures.append((headline, None, event))
+        elif not isinstance(event, expected[0]) or fields(event) != expected[1]:
+            failures.append((headline, expected, event))
+    return failures
+
+# the parser news.py used before rit.headlines: split on spaces and index fixed positions
+def split_parser(headline):
+    if headline[0] == 'W':
+        headline = headline.split(' ')
+        return {'actual_stock': headline[4], 'actual_qty': headline[5],
+                'forecast_stock': headline[10], 'forecast_qty': headline[11]}
+
+def bench(fn, headline, number):
+    best = min(timeit.repeat(lambda: fn(headline), number=number, repeat=5))
+    return best / number * 1e6
+
+def main(number=20000):
+    failures = check()
+    for headline, expected, event in failures:
+        print(f'MISMATCH {headline!r}: expected {expected}, got {event!r}')
+    print(f'{len(CORPUS) - len(failures)}/{len(CORPUS)} corpus headlines parsed as expected')
+
+    report = CORPUS[0][0]
+    print(f"{'headline':44} {'split us':>9} {'grammar us':>11}")
+    print(f"{'EIA report (template wording)':44} {bench(split_parser, report, number):9.2f} {bench(parse_headline, report, number):11.2f}")
+    for label, headline in (('EIA report (reworded)', CORPUS[8][0]), ('case start', CORPUS[14][0]),
+                            ('unmatched', CORPUS[18][0])):
+        print(f"{label:44} {'':>9} {bench(parse_headline, headline, number):11.2f}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
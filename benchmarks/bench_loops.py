@@ -0,0 +1,238 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import importlib.util
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit import RITClient, OrderGateway, CancelManager, PositionCache
+from rit.records import loads
+from rit.server import Market, StandInServer
+
+# this benchmark runs one strategy loop body at a time against the local stand-in server (rit.server) with a fixed
+# response latency. Each iteration advances the case one tick and then times the loop body. It reports p50/p99
+# iteration time, requests per iteration and decisions per second, and splits the time into HTTP, JSON decoding
+# and everything else. HTTP time is measured on the loop's wall clock: the union of the intervals requests were
+# in flight, so requests sent concurrently by the gateway count once.
+# --save stores the results as baselines; later runs compare against them and exit 1 on a regression
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+ITERATIONS = 200
+LATENCY = 0.001
+SEED = 7
+
+# a run regresses when its p50 iteration time or its requests per iteration grow by more than these fractions
+# (position cache refreshes are time-based, so the request count moves a little between runs)
+TOLERANCE = 0.25
+REQUEST_TOLERANCE = 0.05
+
+STRATEGIES = {
+    'exchange_arbitrage': 'Arbitraging Algos/Exchange_Arbitrage.py',
+    'mm_case_1': 'Market Making Algos/Liquidity_Based_Market_Making_Case_1.py',
+    'futures_stat_arb': 'Arbitraging Algos/Futures_Statistical_Arbitrage.py',
+}
+
+# these client subclasses keep every response body so decoding can be timed separately from the round-trip,
+# and the (start, end) interval of every request
+class CapturingClient(RITClient):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bodies = []
+        self.intervals = []
+
+    def request(self, method, url, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            resp = super().request(method, url, *args, **kwargs)
+        finally:
+            self.intervals.append((start, time.perf_counter()))
+        self.bodies.append(resp.content)
+        return resp
+
+def capturing_async_client(base_url):
+    from rit.aio import AsyncRITClient
+
+    class CapturingAsyncClient(AsyncRITClient):
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.bodies = []
+            self.intervals = []
+
+        async def request_raw(self, method, path, params=None):
+            start = time.perf_counter()
+            try:
+                raw = await super().request_raw(method, path, params)
+            finally:
+                self.intervals.append((start, time.perf_counter()))
+            self.bodies.append(raw)
+            return raw
+
+    return CapturingAsyncClient(base_url=base_url)
+
+# this helper method imports a strategy script by path; the script folders have spaces in their names
+def load_strategy(name, path=None):
+    path = os.path.join(ROOT, path or STRATEGIES[name])
+    spec = importlib.util.spec_from_file_location(f'bench_{name}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def request_count(client):
+    return sum(stats[0] for stats in client.latency.values())
+
+# this function returns the wall time covered by at least one request in flight
+def in_flight(intervals):
+    total = 0.0
+    end = None
+    for start, stop in sorted(intervals):
+        if end is None or start > end:
+            total += stop - start
+            end = stop
+        elif stop > end:
+            total += stop - end
+            end = stop
+    return total
+
+def decode_time(bodies):
+    start = time.perf_counter()
+    for body in bodies:
+        if body:
+            loads(body)
+    return time.perf_counter() - start
+
+# this helper method records one iteration as (wall, requests, http, decode) seconds
+def sample(client, before, wall):
+    decode = decode_time(client.bodies)
+    http = in_flight(client.intervals)
+    client.bodies.clear()
+    client.intervals.clear()
+    return wall, request_count(client) - before, http, decode
+
+def run_sync(client, market, step, iterations):
+    samples = []
+    for _ in range(iterations):
+        market.advance(1)
+        client.bodies.clear()
+        client.intervals.clear()
+        before = request_count(client)
+        start = time.perf_counter()
+        step()
+        samples.append(sample(client, before, time.perf_counter() - start))
+    return samples
+
+def run_exchange_arbitrage(module, market, base_url, iterations):
+    async def run():
+        async with capturing_async_client(base_url) as s:
+            samples = []
+            for _ in range(iterations):
+                market.advance(1)
+                s.bodies.clear()
+                s.intervals.clear()
+                before = request_count(s)
+                start = time.perf_counter()
+                await module.arbitrage_step(s, pause=0)
+                samples.append(sample(s, before, time.perf_counter() - start))
+            return samples
+    return asyncio.run(run())
+
+def run_mm_case_1(module, market, base_url, iterations):
+    with CapturingClient(base_url=base_url) as s, OrderGateway(s) as gateway:
+        cancels = CancelManager(s)
+        positions = PositionCache(s)
+        return run_sync(s, market, lambda: module.quote_step(s, gateway, cancels, positions, pause=0), iterations)
+
+def run_futures_stat_arb(module, market, base_url, iterations):
+    with CapturingClient(base_url=base_url) as s:
+        return run_sync(s, market, lambda: module.entry_signal(*module.get_spread_prices(s)), iterations)
+
+RUNNERS = {
+    'exchange_arbitrage': run_exchange_arbitrage,
+    'mm_case_1': run_mm_case_1,
+    'futures_stat_arb': run_futures_stat_arb,
+}
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def summarize(samples):
+    walls = [s[0] for s in samples]
+    n = len(samples)
+    return {
+        'iterations': n,
+        'p50_ms': percentile(walls, .50) * 1000,
+        'p99_ms': percentile(walls, .99) * 1000,
+        'requests': sum(s[1] for s in samples) / n,
+        'http_ms': sum(s[2] for s in samples) / n * 1000,
+        'decode_ms': sum(s[3] for s in samples) / n * 1000,
+        'other_ms': max(0.0, sum(s[0] - s[2] - s[3] for s in samples) / n * 1000),
+        'decisions_per_s': n / sum(walls),
+    }
+
+def bench(name, iterations, latency, seed):
+    module = load_strategy(name)
+    market = Market(seed=seed, tick_length=0, start_tick=5)
+    with StandInServer(market, port=0, latency=latency) as server:
+        return summarize(RUNNERS[name](module, market, server.base_url, iterations))
+
+def load_baselines():
+    if not os.path.exists(BASELINES):
+        return {}
+    with open(BASELINES) as f:
+        return json.load(f)
+
+# this function compares a result with its stored baseline and returns the reasons it regressed
+def regressions(result, baseline, tolerance=TOLERANCE):
+    found = []
+    if result['p50_ms'] > baseline['p50_ms'] * (1 + tolerance):
+        found.append(f"p50 {result['p50_ms']:.2f} ms vs baseline {baseline['p50_ms']:.2f} ms")
+    if result['requests'] > baseline['requests'] * (1 + REQUEST_TOLERANCE):
+        found.append(f"{result['requests']:.2f} requests/iteration vs baseline {baseline['requests']:.2f}")
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-strategy loop latency against the RIT stand-in server')
+    parser.add_argument('strategies', nargs='*', help=f"any of {', '.join(STRATEGIES)} (default: all)")
+    parser.add_argument('--iterations', type=int, default=ITERATIONS)
+    parser.add_argument('--latency', type=float, default=LATENCY, help='stand-in response latency, seconds')
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--save', action='store_true', help='store these results as the new baselines')
+    args = parser.parse_args()
+
+    for name in args.strategies:
+        if name not in STRATEGIES:
+            parser.error(f'unknown strategy {name!r}')
+    strategies = args.strategies or list(STRATEGIES)
+
+    baselines = load_baselines()
+    failed = False
+    print(f'{args.iterations} iterations, {args.latency * 1000:.1f} ms stand-in latency, seed {args.seed}')
+    print(f"{'strategy':20} {'p50 ms':>8} {'p99 ms':>8} {'req/it':>7} {'http ms':>8} {'decode ms':>9} {'other ms':>8} {'dec/s':>8}")
+    for name in strategies:
+        try:
+            result = bench(name, args.iterations, args.latency, args.seed)
+        except ImportError as e:
+            print(f'{name:20} skipped: {e}')
+            continue
+        print(f"{name:20} {result['p50_ms']:8.2f} {result['p99_ms']:8.2f} {result['requests']:7.2f} {result['http_ms']:8.2f} "
+              f"{result['decode_ms']:9.3f} {result['other_ms']:8.2f} {result['decisions_per_s']:8.1f}")
+        if args.save:
+            baselines[name] = {**result, 'latency': args.latency, 'seed': args.seed}
+        elif name in baselines:
+            for reason in regressions(result, baselines[name]):
+                print(f'  REGRESSION {name}: {reason}')
+                failed = True
+
+    if args.save:
+        with open(BASELINES, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f'baselines written to {BASELINES}')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from statistics import median
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit.launch import ROOT, STRATEGIES
+from bench_loops import BASELINES, TOLERANCE, load_baselines
+
+# this benchmark measures how long a strategy takes to start: it runs python -m rit.launch <name> --check in a
+# fresh interpreter (interpreter start, rit, the script's imports) and reports the median wall time of --runs
+# launches. The pandas row is a bare interpreter importing pandas, which every strategy used to pay before its
+# first request. --save stores the medians under 'startup' in baselines.json; later runs exit 1 on a regression
+
+RUNS = 7
+
+# this function returns the median wall time, in milliseconds, of running a command in a new process
+def startup_ms(command, runs=RUNS):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description='Time strategy startup through rit.launch')
+    parser.add_argument('strategies', nargs='*', help=f"any of {', '.join(STRATEGIES)} (default: all)")
+    parser.add_argument('--runs', type=int, default=RUNS)
+    parser.add_argument('--save', action='store_true', help='store these results as the new baselines')
+    args = parser.parse_args()
+
+    for name in args.strategies:
+        if name not in STRATEGIES:
+            parser.error(f'unknown strategy {name!r}')
+    strategies = args.strategies or list(STRATEGIES)
+
+    baselines = load_baselines()
+    saved = baselines.get('startup', {})
+    failed = False
+    python = sys.executable
+    print(f'median of {args.runs} launches')
+    print(f"{'':24} {'ms':>8}")
+    print(f"{'python':24} {startup_ms([python, '-c', 'pass'], args.runs):8.1f}")
+    try:
+        print(f"{'import pandas':24} {startup_ms([python, '-c', 'import pandas'], args.runs):8.1f}")
+    except subprocess.CalledProcessError:
+        print(f"{'import pandas':24} {'n/a':>8}")
+    for name in strategies:
+        try:
+            ms = startup_ms([python, '-m', 'rit.launch', name, '--check'], args.runs)
+        except subprocess.CalledProcessError:
+            print(f'{name:24} {"failed":>8}')
+            failed = True
+            continue
+        line = f'{name:24} {ms:8.1f}'
+        if args.save:
+            saved[name] = ms
+        elif name in saved and ms > saved[name] * (1 + TOLERANCE):
+            line += f'  REGRESSION vs baseline {saved[name]:.1f} ms'
+            failed = True
+        print(line)
+
+    if args.save:
+        baselines['startup'] = saved
+        with open(BASELINES, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f'baselines written to {BASELINES}')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit import RITClient, OrderGateway, CancelManager, PositionCache, capture, get_tick, get_security, get_securities, get_news, ticker_close
+from rit.exits import ExitEngine
+from rit.indicators import reset_indicators
+from rit.replay import Replay, ReplayStore, replay, replay_async
+from rit.server import Market, StandInServer
+from bench_loops import SEED, STRATEGIES, load_strategy
+
+# this script records a session from the stand-in server (rit.server) and replays it through the strategy
+# decision rules on a simulated clock (rit.replay). Each strategy is replayed twice and the two runs must send
+# exactly the same orders and cancels; it exits 1 when they differ. --log replays an existing session log instead,
+# e.g. one captured from the RIT client with RIT_CAPTURE
+
+TICKS = 600
+
+STRATEGIES = {
+    **STRATEGIES,
+    'futures_time_decay': 'Arbitraging Algos/Futures_Time_Decay_Arbitrage/futures.py',
+    'news': 'News Trading Algo/news.py',
+}
+
+# this function records every request the replayed strategies read, once per tick, to a session log
+def record_session(path, ticks=TICKS, seed=SEED):
+    if os.path.exists(path):
+        os.remove(path)
+    market = Market(seed=seed, tick_length=0, start_tick=1)
+    with StandInServer(market, port=0) as server, RITClient(base_url=server.base_url) as s:
+        recorder = capture(s, path)
+        for _ in range(ticks):
+            # /case first: its tick stamps the records that follow it
+            get_tick(s)
+            get_securities(s)
+            for ticker in ('CL', 'CL-1F', 'CL-2F'):
+                get_security(s, ticker)
+            for ticker in ('ALGO', 'CL-2F'):
+                ticker_close(s, ticker)
+            s.get('/securities/book', params={'ticker': 'ALGO', 'limit': 100})
+            for ticker in ('CRZY_A', 'CRZY_M'):
+                s.get('/securities/book', params={'ticker': ticker, 'limit': 1})
+            get_news(s, limit=1)
+            market.advance(1)
+        recorder.close()
+
+def replay_futures_time_decay(module, store):
+    def step(s, tick):
+        spread = module.calc_spot_future_spread(tick)
+        return module.spot_futures_arb(module.get_cl_price(s), module.get_future_price(s), spread)
+    return replay(store, step)
+
+def replay_news(module, store):
+    session = Replay(store)
+    module.sleep = session.clock.sleep
+    last = {'news_id': -1}
+    state = {}
+
+    def step(s, tick):
+        if not state:
+            state['exits'] = ExitEngine(s, OrderGateway(s, max_workers=1))
+        exits = state['exits']
+        news = module.get_news(s)[0]
+        decision = None
+        if news['news_id'] != last['news_id']:
+            last['news_id'] = news['news_id']
+            decision = module.interpret_news(module.parse_news(news))
+            module.place_order(s, 'CL', 10, decision)
+            module.add_exit(exits, s, decision, tick)
+        fired = exits.step(tick)
+        return decision, [(trigger.trigger_id, trigger.reason) for trigger in fired]
+    try:
+        return replay(store, step, session)
+    finally:
+        if state:
+            state['exits'].gateway.close()
+
+def replay_exchange_arbitrage(module, store):
+    return asyncio.run(replay_async(store, lambda s, tick: module.arbitrage_step(s, pause=0)))
+
+def replay_mm_case_1(module, store):
+    session = Replay(store)
+    module.sleep = session.clock.sleep
+    state = {}
+
+    # the SMA window is shared per process; start each run from an empty one
+    reset_indicators()
+
+    def step(s, tick):
+        if not state:
+            # one worker, so orders reach the replay in ladder order and get the same ids every run
+            state['gateway'] = OrderGateway(s, max_workers=1)
+            state['cancels'] = CancelManager(s)
+            state['positions'] = PositionCache(s, time_fn=session.clock.time)
+        return module.quote_step(s, state['gateway'], state['cancels'], state['positions'])
+    try:
+        return replay(store, step, session)
+    finally:
+        if state:
+            state['gateway'].close()
+
+def replay_futures_stat_arb(module, store):
+    return replay(store, lambda s, tick: module.entry_signal(*module.get_spread_prices(s)))
+
+REPLAYS = {
+    'futures_time_decay': replay_futures_time_decay,
+    'news': replay_news,
+    'exchange_arbitrage': replay_exchange_arbitrage,
+    'mm_case_1': replay_mm_case_1,
+    'futures_stat_arb': replay_futures_stat_arb,
+}
+
+# this helper method replays one strategy with its prints silenced and returns (seconds, replay, results)
+def run(name, store):
+    module = load_strategy(name, STRATEGIES[name])
+    stdout = sys.stdout
+    start = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as sys.stdout:
+            session, results = REPLAYS[name](module, store)
+    finally:
+        sys.stdout = stdout
+    return time.perf_counter() - start, session, results
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded session through the strategy decision rules')
+    parser.add_argument('strategies', nargs='*', help=f"any of {', '.join(REPLAYS)} (default: all)")
+    parser.add_argument('--log', help='replay this session log instead of recording one')
+    parser.add_argument('--record', default=os.path.join(tempfile.gettempdir(), 'rit_replay.ritlog'), help='where to record the session')
+    parser.add_argument('--ticks', type=int, default=TICKS)
+    parser.add_argument('--seed', type=int, default=SEED)
+    args = parser.parse_args()
+
+    for name in args.strategies:
+        if name not in REPLAYS:
+            parser.error(f'unknown strategy {name!r}')
+    strategies = args.strategies or list(REPLAYS)
+
+    path = args.log
+    if path is None:
+        path = args.record
+        start = time.perf_counter()
+        record_session(path, args.ticks, args.seed)
+        print(f'recorded {args.ticks} ticks to {path} in {time.perf_counter() - start:.2f} s')
+    store = ReplayStore.load(path)
+    print(f'replaying ticks {store.first_tick}-{store.last_tick}')
+
+    failed = False
+    print(f"{'strategy':20} {'seconds':>8} {'ticks':>6} {'requests':>9} {'orders':>7} {'identical':>10}")
+    for name in strategies:
+        try:
+            seconds, first, results = run(name, store)
+            _, second, again = run(name, store)
+        except ImportError as e:
+            print(f'{name:20} skipped: {e}')
+            continue
+        identical = first.decisions == second.decisions and results == again
+        failed = failed or not identical
+        print(f'{name:20} {seconds:8.2f} {len(results):6} {first.requests:9} {len(first.decisions):7} {str(identical):>10}')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rit.replay import Replay, replay, replay_async
+from rit.sweep import grid, sweep, format_table
+from bench_loops import SEED, load_strategy
+from replay_strategies import TICKS, record_session
+
+# this script sweeps strategy parameters over recorded sessions (rit.sweep) and prints a ranked P&L / drawdown
+# table. It records --sessions stand-in sessions with consecutive seeds, or sweeps the --log files given.
+# Market orders fill at the recorded top of book and positions are marked at the recorded mid every tick
+
+# futures calendar spread ladder: each side enters at entry, entry -/+ step, entry -/+ 2 steps
+FUTURES_GRID = {
+    'short_entry': [0.6, 0.7, 0.8],
+    'short_step': [0.1, 0.2],
+    'short_exit': [0.8, 0.85, 0.9],
+    'long_entry': [1.2, 1.3, 1.4],
+    'long_step': [0.1, 0.2],
+    'long_exit': [1.1, 1.15, 1.2],
+    'quantity': [10, 30],
+}
+
+EXCHANGE_GRID = {
+    'threshold': [0.0, 0.01, 0.02, 0.03, 0.05],
+    'quantity_percent': [0.25, 0.5, 0.75, 1.0],
+}
+
+# each worker process imports a strategy script once
+_modules = {}
+
+def strategy(name):
+    module = _modules.get(name)
+    if module is None:
+        module = _modules[name] = load_strategy(name)
+        # the strategies print every decision; keep the workers quiet
+        module.print = lambda *args, **kwargs: None
+    return module
+
+def futures_param_sets():
+    return [params for params in grid(FUTURES_GRID)
+            if params['short_exit'] > params['short_entry'] and params['long_exit'] < params['long_entry']]
+
+def evaluate_futures(store, params):
+    module = strategy('futures_stat_arb')
+    session = Replay(store)
+    module.sleep = session.clock.sleep
+    ladder = {
+        'short_entries': tuple(params['short_entry'] - i * params['short_step'] for i in range(3)),
+        'short_exit': params['short_exit'],
+        'long_entries': tuple(params['long_entry'] + i * params['long_step'] for i in range(3)),
+        'long_exit': params['long_exit'],
+        'quantity': params['quantity'],
+    }
+    state = {'level': 0}
+
+    def step(s, tick):
+        state['level'] = module.ladder_step(s, state['level'], **ladder)
+        return state['level']
+    replay(store, step, session)
+    return session
+
+def evaluate_exchange_arbitrage(store, params):
+    module = strategy('exchange_arbitrage')
+    session = Replay(store)
+
+    async def step(s, tick):
+        return await module.arbitrage_step(s, pause=0, **params)
+    asyncio.run(replay_async(store, step, session))
+    return session
+
+SWEEPS = {
+    'futures_stat_arb': (evaluate_futures, futures_param_sets),
+    'exchange_arbitrage': (evaluate_exchange_arbitrage, lambda: grid(EXCHANGE_GRID)),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank strategy parameter sets by P&L over recorded sessions')
+    parser.add_argument('strategy', choices=list(SWEEPS))
+    parser.add_argument('--log', nargs='+', help='sweep over these session logs instead of recording new ones')
+    parser.add_argument('--sessions', type=int, default=3, help='stand-in sessions to record, one seed each')
+    parser.add_argument('--ticks', type=int, default=TICKS)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--top', type=int, default=20, help='rows to print')
+    args = parser.parse_args()
+
+    logs = args.log
+    if logs is None:
+        logs = []
+        start = time.perf_counter()
+        for seed in range(args.seed, args.seed + args.sessions):
+            path = os.path.join(tempfile.gettempdir(), f'rit_sweep_{seed}.ritlog')
+            record_session(path, args.ticks, seed)
+            logs.append(path)
+        print(f'recorded {len(logs)} sessions of {args.ticks} ticks in {time.perf_counter() - start:.1f} s')
+
+    evaluate, param_sets = SWEEPS[args.strategy]
+    param_sets = param_sets()
+    try:
+        strategy(args.strategy)
+    except ImportError as e:
+        parser.exit(1, f'{args.strategy} cannot be imported: {e}\n')
+    start = time.perf_counter()
+    rows = sweep(evaluate, param_sets, logs, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f'{len(param_sets)} parameter sets x {len(logs)} sessions in {elapsed:.1f} s '
+          f'({len(param_sets) * len(logs) / elapsed:.1f} replays/s)')
+    print(format_table(rows, args.top))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,16 @@
+# shared client for the RIT REST API used by every strategy in this repository
+from .client import API_KEY, BASE_URL, ApiException, RITClient, open_session
+from .api import (
+    get_tick, last_candle, ticker_close, ticker_bid_ask, get_book, get_book_raw, get_orders, get_order, get_security,
+    get_securities, get_news, get_tenders, get_position, place_order, order_params, get_bid_orders, get_ask_orders,
+    remove_closed_orders, get_orders_to_cancel, place_mkt_buy_order, place_mkt_sell_order, lease_storage,
+)
+from .book import OrderBookSnapshot, OrderBook, order_book
+from .records import BookLevel, Order, Security, Tender, News, Lease, loads
+from .clock import TickClock
+from .gateway import OrderGateway, OrderResult, submit_async
+from .cancel import CancelManager, CancelResult, cancel_orders, cancel_ids_async
+from .positions import PositionCache
+from .leases import LeaseRegistry
+from .newsfeed import NewsFeed
+from .capture import SessionRecorder, SessionLog, capture
@@ -0,0 +1,164 @@
+import asyncio
+import time
+import aiohttp
+from .client import API_KEY, BASE_URL, POOL_MAXSIZE, ApiException, endpoint
+from .book import OrderBookSnapshot
+from .records import loads
+from .capture import recorder_from_env
+from .api import order_params, API_KEY_ERROR, CASE, SECURITIES, BOOK, HISTORY, ORDERS, CANCEL, TENDERS, NEWS, LEASES, ASSETS
+
+# keep idle sockets open across loop iterations so every request reuses a warm connection
+KEEPALIVE_TIMEOUT = 30
+
+# aiohttp only accepts str / int / float query values, so booleans and lists are flattened here
+def query(params):
+    if params is None:
+        return None
+    flat = {}
+    for key, value in params.items():
+        if isinstance(value, bool):
+            value = int(value)
+        elif isinstance(value, (list, tuple)):
+            value = ','.join(str(v) for v in value)
+        flat[key] = value
+    return flat
+
+# this class is the asyncio counterpart of RITClient
+# every call returns decoded JSON, so independent reads can be started together and awaited with gather()
+class AsyncRITClient:
+
+    def __init__(self, api_key=API_KEY, base_url=BASE_URL, pool_maxsize=POOL_MAXSIZE):
+        self.base_url = base_url.rstrip('/')
+        self.headers = {'X-API-Key': api_key}
+        self.pool_maxsize = pool_maxsize
+        self.session = None
+        self.urls = {}
+        self.latency = {}
+        self.recorder = recorder_from_env()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize, keepalive_timeout=KEEPALIVE_TIMEOUT)
+            self.session = aiohttp.ClientSession(headers=self.headers, connector=connector, trust_env=False)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def url(self, path):
+        url = self.urls.get(path)
+        if url is None:
+            url = self.urls[path] = self.base_url + path
+        return url
+
+    # this helper method sends one request and returns the decoded JSON body
+    async def request(self, method, path, params=None):
+        return loads(await self.request_raw(method, path, params))
+
+    # this helper method sends one request and returns the undecoded response body
+    async def request_raw(self, method, path, params=None):
+        start = time.perf_counter()
+        try:
+            async with self.session.request(method, self.url(path), params=query(params)) as resp:
+                if resp.status == 401:
+                    raise ApiException(API_KEY_ERROR)
+                body = await resp.read()
+                if self.recorder is not None:
+                    self.recorder.record(method, path, params, resp.status, body)
+                return body
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.latency.setdefault(endpoint(path), [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+
+    async def get(self, path, params=None):
+        return await self.request('GET', path, params)
+
+    async def post(self, path, params=None):
+        return await self.request('POST', path, params)
+
+    async def delete(self, path, params=None):
+        return await self.request('DELETE', path, params)
+
+    def latency_summary(self):
+        return {path: {'count': count, 'mean_ms': total / count * 1000, 'max_ms': worst * 1000}
+                for path, (count, total, worst) in self.latency.items()}
+
+    # this helper method returns the current 'tick' of the running case
+    async def get_tick(self):
+        return (await self.get(CASE))['tick']
+
+    # this helper method returns the last history candle for the given security, one tick ago
+    async def last_candle(self, ticker):
+        ticker_history = await self.get(HISTORY, {'ticker': ticker, 'limit': 1})
+        if ticker_history:
+            return ticker_history[0]
+        raise ApiException('Response error. Unexpected JSON response.')
+
+    # this helper method returns the last close price for the given security, one tick ago
+    async def ticker_close(self, ticker):
+        return (await self.last_candle(ticker))['close']
+
+    # this helper method returns the bid and ask for a given security
+    async def ticker_bid_ask(self, ticker):
+        book = await self.get(BOOK, {'ticker': ticker, 'limit': 1})
+        return book['bids'][0]['price'], book['asks'][0]['price']
+
+    async def get_book(self, ticker, limit=None):
+        params = {'ticker': ticker} if limit is None else {'ticker': ticker, 'limit': limit}
+        return await self.get(BOOK, params)
+
+    # this helper method fetches and decodes a book once, both sides in one snapshot
+    async def get_book_snapshot(self, ticker, limit=None):
+        params = {'ticker': ticker} if limit is None else {'ticker': ticker, 'limit': limit}
+        return OrderBookSnapshot.from_json(ticker, await self.request_raw('GET', BOOK, params))
+
+    async def get_orders(self, status):
+        return await self.get(ORDERS, {'status': status})
+
+    async def get_security(self, ticker):
+        return (await self.get(SECURITIES, {'ticker': ticker}))[0]
+
+    async def get_securities(self):
+        return await self.get(SECURITIES)
+
+    async def get_position(self, ticker):
+        return (await self.get_security(ticker))['position']
+
+    async def get_tenders(self):
+        return await self.get(TENDERS)
+
+    async def get_news(self, limit=None, since=None):
+        params = {}
+        if limit is not None:
+            params['limit'] = limit
+        if since is not None:
+            params['since'] = since
+        return await self.get(NEWS, params or None)
+
+    async def get_leases(self):
+        return await self.get(LEASES)
+
+    async def get_assets(self):
+        return await self.get(ASSETS)
+
+    async def place_order(self, ticker, order_type, quantity, action, price=None):
+        return await self.post(ORDERS, order_params(ticker, order_type, quantity, action, price))
+
+    async def cancel(self, params):
+        return await self.post(CANCEL, params)
+
+# this function sends every request at once and returns the results in the order given
+# one loop iteration then costs a single round-trip instead of the sum of all of them
+async def fetch_all(*requests):
+    return await asyncio.gather(*requests)
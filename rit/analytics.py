@@ -0,0 +1,134 @@
+from operator import itemgetter
+from .api import get_book_raw
+from .lazy import lazy_import
+from .records import loads
+
+np = lazy_import('numpy')
+
+# this module computes order book statistics for many tickers at once over NumPy arrays
+# every order of every book goes into one flat array per side (price, quantity, remaining, trader mask) with a
+# segment id per ticker, so each statistic is a single bincount over all books instead of a Python loop per level
+# volume is always the remaining quantity (quantity - quantity_filled); counts are orders, not levels
+
+TRADER_ID = 'ANON'
+
+# half the weight is lost every HALF_LIFE of price distance from the best price in weighted_imbalance
+HALF_LIFE = 0.05
+
+_price = itemgetter('price')
+_quantity = itemgetter('quantity')
+_filled = itemgetter('quantity_filled')
+_trader_id = itemgetter('trader_id')
+
+# this class holds one side ('BUY' or 'SELL') of every book; ids maps each order to its ticker's position
+class SideArrays:
+    __slots__ = ('action', 'price', 'quantity', 'remaining', 'mask', 'ids', 'best', 'n')
+
+    def __init__(self, action, books, trader_id):
+        self.action = action
+        self.n = n = len(books)
+        key = 'bids' if action == 'BUY' else 'asks'
+        levels = [book[key] for book in books]
+        sizes = np.fromiter((len(side) for side in levels), dtype=np.intp, count=n)
+        orders = [d for side in levels for d in side]
+        count = len(orders)
+        self.ids = np.repeat(np.arange(n), sizes)
+        # map + itemgetter keeps the one unavoidable pass over the decoded dicts in C
+        self.price = np.fromiter(map(_price, orders), dtype=float, count=count)
+        self.quantity = np.fromiter(map(_quantity, orders), dtype=float, count=count)
+        self.remaining = self.quantity - np.fromiter(map(_filled, orders), dtype=float, count=count)
+        if trader_id is None:
+            self.mask = np.ones(count, dtype=bool)
+        else:
+            self.mask = np.fromiter(map(trader_id.__eq__, map(_trader_id, orders)), dtype=bool, count=count)
+        # the API returns each side best price first
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1])) if n else sizes
+        self.best = np.full(n, np.nan)
+        nonempty = sizes > 0
+        self.best[nonempty] = self.price[starts[nonempty]]
+
+    def sum(self, weights, mask=None):
+        mask = self.mask if mask is None else self.mask & mask
+        return np.bincount(self.ids[mask], weights=weights[mask], minlength=self.n)
+
+    def volume(self):
+        return self.sum(self.remaining)
+
+    def count(self):
+        return np.bincount(self.ids[self.mask], minlength=self.n)
+
+    # distance of every order from its book's best price, always >= 0
+    def distance(self):
+        return np.abs(self.price - self.best[self.ids])
+
+    def depth_at(self, distance):
+        return self.sum(self.remaining, self.distance() <= distance + 1e-9)
+
+    # this function returns the volume weighted by 0.5 ** (distance from the best price / half_life)
+    def weighted_volume(self, half_life=HALF_LIFE):
+        return self.sum(self.remaining * 0.5 ** (self.distance() / half_life))
+
+    # this function returns the average price of taking size (a number or one per ticker) from this side,
+    # walking the orders best first; nan where the side is empty, and the whole side's VWAP when it is too thin
+    def vwap_to_size(self, size):
+        remaining = np.where(self.mask, self.remaining, 0.0)
+        cumulative = np.cumsum(remaining)
+        totals = np.bincount(self.ids, weights=remaining, minlength=self.n)
+        before = np.concatenate(([0.0], np.cumsum(totals)[:-1]))
+        ahead = cumulative - remaining - before[self.ids]
+        size = np.broadcast_to(np.asarray(size, dtype=float), (self.n,))
+        take = np.clip(size[self.ids] - ahead, 0.0, remaining)
+        filled = np.bincount(self.ids, weights=take, minlength=self.n)
+        cost = np.bincount(self.ids, weights=take * self.price, minlength=self.n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(filled > 0, cost / filled, np.nan)
+
+# this class holds both sides of many books; books maps ticker -> decoded book dict or raw response body
+class BookArrays:
+    __slots__ = ('tickers', 'bids', 'asks')
+
+    def __init__(self, books, trader_id=TRADER_ID):
+        self.tickers = list(books)
+        decoded = [loads(book) if isinstance(book, (bytes, bytearray, memoryview, str)) else book for book in books.values()]
+        self.bids = SideArrays('BUY', decoded, trader_id)
+        self.asks = SideArrays('SELL', decoded, trader_id)
+
+    def side(self, action):
+        return self.bids if action == 'BUY' else self.asks
+
+    # this function returns (bid - ask) / (bid + ask) of the distance-weighted volumes per ticker
+    def weighted_imbalance(self, half_life=HALF_LIFE):
+        bid = self.bids.weighted_volume(half_life)
+        ask = self.asks.weighted_volume(half_life)
+        total = bid + ask
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total > 0, (bid - ask) / total, 0.0)
+
+# this function returns one stats dict per ticker; the first four keys are the get_order_book_stats keys the
+# market making scripts (and calc_spread_cushion) read: remaining volume and number of orders per side
+def book_stats(books, trader_id=TRADER_ID, distance=0.05, size=1000, half_life=HALF_LIFE):
+    arrays = BookArrays(books, trader_id)
+    bid_volume, ask_volume = arrays.bids.volume(), arrays.asks.volume()
+    bid_count, ask_count = arrays.bids.count(), arrays.asks.count()
+    bid_depth, ask_depth = arrays.bids.depth_at(distance), arrays.asks.depth_at(distance)
+    # a buy of size walks the asks, a sell walks the bids
+    buy_vwap, sell_vwap = arrays.asks.vwap_to_size(size), arrays.bids.vwap_to_size(size)
+    imbalance = arrays.weighted_imbalance(half_life)
+    stats = {}
+    for i, ticker in enumerate(arrays.tickers):
+        stats[ticker] = {
+            'Cumulative Vol Bid': float(bid_volume[i]),
+            'Bid Num of Orders': int(bid_count[i]),
+            'Cumulative Vol Ask': float(ask_volume[i]),
+            'Ask Num of Orders': int(ask_count[i]),
+            'Weighted Imbalance': float(imbalance[i]),
+            'Bid Depth': float(bid_depth[i]),
+            'Ask Depth': float(ask_depth[i]),
+            'Buy VWAP': float(buy_vwap[i]),
+            'Sell VWAP': float(sell_vwap[i]),
+        }
+    return stats
+
+# this helper method fetches the books of several tickers and returns book_stats for all of them
+def fetch_book_stats(session, tickers, limit=None, **kwargs):
+    return book_stats({ticker: get_book_raw(session, ticker, limit) for ticker in tickers}, **kwargs)
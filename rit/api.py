@@ -0,0 +1,170 @@
+from .client import ApiException
+from .records import loads
+
+# pre-built endpoint paths, resolved to full URLs once by the client
+CASE = '/case'
+SECURITIES = '/securities'
+BOOK = '/securities/book'
+HISTORY = '/securities/history'
+ORDERS = '/orders'
+CANCEL = '/commands/cancel'
+TENDERS = '/tenders'
+NEWS = '/news'
+LEASES = '/leases'
+ASSETS = '/assets'
+
+API_KEY_ERROR = 'The API key provided in this Python code must match that in the RIT client (please refer to the API hyperlink in the client toolbar and/or the RIT – User Guide – REST API Documentation.pdf)'
+
+# pre-built query parameter templates, one dict per ticker, reused on every call
+_ticker_params = {}
+_close_params = {}
+
+def ticker_params(ticker):
+    params = _ticker_params.get(ticker)
+    if params is None:
+        params = _ticker_params[ticker] = {'ticker': ticker}
+    return params
+
+def close_params(ticker):
+    params = _close_params.get(ticker)
+    if params is None:
+        params = _close_params[ticker] = {'ticker': ticker, 'limit': 1}
+    return params
+
+# this helper method builds the query parameters for a new order
+def order_params(ticker, order_type, quantity, action, price=None):
+    params = {'ticker': ticker, 'type': order_type, 'quantity': quantity, 'action': action}
+    if price is not None:
+        params['price'] = price
+    return params
+
+# this helper method returns the current 'tick' of the running case
+def get_tick(session):
+    resp = session.get(CASE)
+    if resp.status_code == 401:
+        raise ApiException('Error getting tick: The API key provided in this Python code must match that in the RIT client')
+    case = loads(resp.content)
+    return case['tick']
+
+# this helper method returns the latest /securities/history candle for the given security, with its 'tick'
+def last_candle(session, ticker):
+    resp = session.get(HISTORY, params=close_params(ticker))
+    if resp.status_code == 401:
+        raise ApiException(API_KEY_ERROR)
+    ticker_history = loads(resp.content)
+    if ticker_history:
+        return ticker_history[0]
+    else:
+        raise ApiException('Response error. Unexpected JSON response.')
+
+# this helper method returns the last close price for the given security, one tick ago
+def ticker_close(session, ticker):
+    return last_candle(session, ticker)['close']
+
+# this helper method returns the bid and ask for a given security
+def ticker_bid_ask(session, ticker):
+    resp = session.get(BOOK, params=ticker_params(ticker))
+    if resp.ok:
+        book = loads(resp.content)
+        return book['bids'][0]['price'], book['asks'][0]['price']
+    raise ApiException('Error getting bid / ask: The API key provided in this Python code must match that in the RIT client')
+
+# this helper method returns the full order book for a given security
+def get_book(session, ticker, limit=None):
+    return loads(get_book_raw(session, ticker, limit))
+
+# this helper method returns the undecoded book response body, for record decoding
+def get_book_raw(session, ticker, limit=None):
+    params = ticker_params(ticker) if limit is None else {'ticker': ticker, 'limit': limit}
+    resp = session.get(BOOK, params=params)
+    if resp.status_code == 401:
+        raise ApiException(API_KEY_ERROR)
+    return resp.content
+
+# this helper method gets all the orders of a given type (OPEN/TRANSACTED/CANCELLED)
+def get_orders(session, status):
+    resp = session.get(ORDERS, params={'status': status})
+    if resp.status_code == 401:
+        raise ApiException(API_KEY_ERROR)
+    orders = loads(resp.content)
+    return orders
+
+# this helper method returns one order by id, whatever its status
+def get_order(session, order_id):
+    resp = session.get(f'{ORDERS}/{order_id}')
+    if resp.status_code == 401:
+        raise ApiException(API_KEY_ERROR)
+    return loads(resp.content)
+
+# this helper method returns the security record for a given ticker
+def get_security(session, ticker):
+    resp = session.get(SECURITIES, params=ticker_params(ticker))
+    if resp.status_code == 401:
+        raise ApiException(API_KEY_ERROR)
+    return loads(resp.content)[0]
+
+# this helper method returns every security record in the case
+def get_securities(session):
+    resp = session.get(SECURITIES)
+    if resp.status_code == 401:
+        raise ApiException(API_KEY_ERROR)
+    return loads(resp.content)
+
+# this helper method returns the latest news items, newest first; since keeps only items after that news_id
+def get_news(session, limit=None, since=None):
+    params = {}
+    if limit is not None:
+        params['limit'] = limit
+    if since is not None:
+        params['since'] = since
+    resp = session.get(NEWS, params=params or None)
+    if resp.status_code == 401:
+        raise ApiException(API_KEY_ERROR)
+    return loads(resp.content)
+
+# this helper method returns the open tender offers
+def get_tenders(session):
+    resp = session.get(TENDERS)
+    if resp.status_code == 401:
+        raise ApiException(API_KEY_ERROR)
+    return loads(resp.content)
+
+# this function fetches the position size for a given ticker
+def get_position(session, ticker):
+    return get_security(session, ticker)['position']
+
+# this function submits an order and returns the response
+def place_order(session, ticker, order_type, quantity, action, price=None):
+    return session.post(ORDERS, params=order_params(ticker, order_type, quantity, action, price))
+
+# these helpers each download the whole book to keep one side of it
+# take a rit.OrderBookSnapshot instead when both sides are needed
+def get_bid_orders(session, ticker):
+    bids = get_book(session, ticker)['bids']
+    return [{'price': bid['price'], 'quantity': bid['quantity']} for bid in bids]
+
+def get_ask_orders(session, ticker):
+    asks = get_book(session, ticker)['asks']
+    return [{'price': ask['price'], 'quantity': ask['quantity']} for ask in asks]
+
+def remove_closed_orders(orders):
+    return [order for order in orders if order['status'] == 'OPEN']
+
+def get_orders_to_cancel(orders, current_tick, max_open_time=4):
+    orders_to_cancel = []
+    for order in orders:
+        if (order['status'] == 'OPEN' and (current_tick - order['tick'] > max_open_time)):
+            orders_to_cancel.append(order)
+    return orders_to_cancel
+
+def place_mkt_buy_order(session, ticker, qty):
+    res = place_order(session, ticker, 'MARKET', qty, 'BUY')
+    print(res.json())
+
+def place_mkt_sell_order(session, ticker, qty):
+    res = place_order(session, ticker, 'MARKET', qty, 'SELL')
+    print(res.json())
+
+def lease_storage(session, ticker):
+    res = session.post(LEASES, params=ticker_params(ticker))
+    print(res.json())
@@ -0,0 +1,276 @@
+import bisect
+from .api import BOOK, get_book_raw
+from .records import BookLevel, decode_book, loads
+
+# this class holds one decoded /securities/book response
+# bids and asks come from a single request and a single JSON decode into BookLevel records;
+# everything else is derived from them
+class OrderBookSnapshot:
+    __slots__ = ('ticker', 'bids', 'asks')
+
+    def __init__(self, ticker, bids, asks):
+        self.ticker = ticker
+        self.bids = bids
+        self.asks = asks
+
+    # this helper method fetches and decodes the book for a ticker once
+    @classmethod
+    def fetch(cls, session, ticker, limit=None):
+        return cls.from_json(ticker, get_book_raw(session, ticker, limit))
+
+    # build a snapshot from a raw response body
+    @classmethod
+    def from_json(cls, ticker, raw):
+        bids, asks = decode_book(raw)
+        return cls(ticker, bids, asks)
+
+    # build a snapshot from an already decoded {'bids': [...], 'asks': [...]} dict
+    @classmethod
+    def from_dict(cls, ticker, book):
+        return cls(ticker, [BookLevel(d) for d in book['bids']], [BookLevel(d) for d in book['asks']])
+
+    @property
+    def best_bid(self):
+        return self.bids[0] if self.bids else None
+
+    @property
+    def best_ask(self):
+        return self.asks[0] if self.asks else None
+
+    @property
+    def bid_price(self):
+        return self.bids[0].price if self.bids else None
+
+    @property
+    def ask_price(self):
+        return self.asks[0].price if self.asks else None
+
+    # remaining (unfilled) quantity at the top of each side
+    @property
+    def bid_quantity(self):
+        return self.bids[0].remaining if self.bids else 0
+
+    @property
+    def ask_quantity(self):
+        return self.asks[0].remaining if self.asks else 0
+
+    @property
+    def spread(self):
+        if self.bids and self.asks:
+            return self.asks[0].price - self.bids[0].price
+        return None
+
+    @property
+    def mid(self):
+        if self.bids and self.asks:
+            return (self.asks[0].price + self.bids[0].price) / 2
+        return None
+
+    def side(self, action):
+        return self.bids if action == 'BUY' else self.asks
+
+    # this function sums the remaining quantity and counts the orders on one side ('BUY' or 'SELL')
+    # levels limits the walk to the top n orders, trader_id restricts it to one participant (e.g. 'ANON')
+    def depth(self, action, levels=None, trader_id=None):
+        orders = self.side(action)
+        if levels is not None:
+            orders = orders[:levels]
+        if trader_id is None:
+            return sum(level.remaining for level in orders), len(orders)
+        volume = 0
+        count = 0
+        for level in orders:
+            if level.trader_id == trader_id:
+                volume += level.remaining
+                count += 1
+        return volume, count
+
+    def bid_depth(self, levels=None, trader_id=None):
+        return self.depth('BUY', levels, trader_id)
+
+    def ask_depth(self, levels=None, trader_id=None):
+        return self.depth('SELL', levels, trader_id)
+
+# this class is one side of an OrderBook: price levels kept sorted ascending in parallel arrays (best bid last,
+# best ask first) plus running totals per side and per trader_id, updated order by order as snapshots are diffed
+class BookSide:
+    __slots__ = ('action', 'prices', 'volumes', 'counts', 'orders', 'volume', 'count', 'traders')
+
+    def __init__(self, action):
+        self.action = action
+        self.prices = []
+        self.volumes = []
+        self.counts = []
+        # order_id -> (price, trader_id, remaining) for every order on the side
+        self.orders = {}
+        self.volume = 0
+        self.count = 0
+        # trader_id -> [volume, count]
+        self.traders = {}
+
+    # this helper method adds (sign=1) or removes (sign=-1) one order from the level and running totals
+    def adjust(self, price, trader_id, remaining, sign):
+        prices = self.prices
+        i = bisect.bisect_left(prices, price)
+        if i == len(prices) or prices[i] != price:
+            prices.insert(i, price)
+            self.volumes.insert(i, 0)
+            self.counts.insert(i, 0)
+        self.volumes[i] += sign * remaining
+        self.counts[i] += sign
+        if not self.counts[i]:
+            del prices[i], self.volumes[i], self.counts[i]
+        self.volume += sign * remaining
+        self.count += sign
+        totals = self.traders.get(trader_id)
+        if totals is None:
+            totals = self.traders[trader_id] = [0, 0]
+        totals[0] += sign * remaining
+        totals[1] += sign
+
+    # this function diffs a new snapshot of the side, given as (order_id, price, trader_id, remaining) tuples,
+    # against the orders held and returns the set of prices whose level changed
+    def update(self, items):
+        orders = self.orders
+        seen = {}
+        changed = set()
+        for order_id, price, trader_id, remaining in items:
+            new = (price, trader_id, remaining)
+            seen[order_id] = new
+            old = orders.get(order_id)
+            if old == new:
+                continue
+            if old is not None:
+                self.adjust(*old, -1)
+                changed.add(old[0])
+            self.adjust(*new, 1)
+            changed.add(price)
+        if len(seen) != len(orders) or changed:
+            for order_id, old in orders.items():
+                if order_id not in seen:
+                    self.adjust(*old, -1)
+                    changed.add(old[0])
+        self.orders = seen
+        return changed
+
+    def level_volume(self, price):
+        i = bisect.bisect_left(self.prices, price)
+        return self.volumes[i] if i < len(self.prices) and self.prices[i] == price else 0
+
+    @property
+    def best_price(self):
+        if not self.prices:
+            return None
+        return self.prices[-1] if self.action == 'BUY' else self.prices[0]
+
+    # this function returns the remaining volume and order count on the side, or for one trader_id
+    def totals(self, trader_id=None):
+        if trader_id is None:
+            return self.volume, self.count
+        totals = self.traders.get(trader_id)
+        return (totals[0], totals[1]) if totals is not None else (0, 0)
+
+    # this function sums the top n price levels, best first
+    def depth(self, levels):
+        if self.action == 'BUY':
+            return sum(self.volumes[-levels:]), sum(self.counts[-levels:])
+        return sum(self.volumes[:levels]), sum(self.counts[:levels])
+
+# this class keeps one ticker's book across polls: each /securities/book response is diffed against the previous
+# one into level updates, so totals, imbalance and per-trader depth are read without rescanning the levels
+# the book covers the orders the last response returned, i.e. the top `limit` orders of each side
+# listeners are called with (book, updates) after every apply that changed a level, whoever polled the book
+class OrderBook:
+    __slots__ = ('ticker', 'bids', 'asks', 'listeners')
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+        self.bids = BookSide('BUY')
+        self.asks = BookSide('SELL')
+        self.listeners = []
+
+    # these functions apply a new book and return its level updates as (action, price, volume) tuples,
+    # volume being the level's new remaining quantity (0 once the level is gone)
+    def apply_json(self, raw):
+        book = loads(raw)
+        return self.apply_levels(
+            [(d['order_id'], d['price'], d['trader_id'], d['quantity'] - d['quantity_filled']) for d in book['bids']],
+            [(d['order_id'], d['price'], d['trader_id'], d['quantity'] - d['quantity_filled']) for d in book['asks']])
+
+    def apply(self, snapshot):
+        return self.apply_levels([(x.order_id, x.price, x.trader_id, x.remaining) for x in snapshot.bids],
+                                 [(x.order_id, x.price, x.trader_id, x.remaining) for x in snapshot.asks])
+
+    def apply_levels(self, bids, asks):
+        updates = []
+        for side, items in ((self.bids, bids), (self.asks, asks)):
+            for price in sorted(side.update(items)):
+                updates.append((side.action, price, side.level_volume(price)))
+        if updates:
+            for listener in self.listeners:
+                listener(self, updates)
+        return updates
+
+    # this helper method polls the book once and applies it
+    def refresh(self, session, limit=None):
+        return self.apply_json(get_book_raw(session, self.ticker, limit))
+
+    async def refresh_async(self, client, limit=None):
+        params = {'ticker': self.ticker} if limit is None else {'ticker': self.ticker, 'limit': limit}
+        return self.apply_json(await client.request_raw('GET', BOOK, params))
+
+    def side(self, action):
+        return self.bids if action == 'BUY' else self.asks
+
+    @property
+    def bid_price(self):
+        return self.bids.best_price
+
+    @property
+    def ask_price(self):
+        return self.asks.best_price
+
+    @property
+    def spread(self):
+        if self.bids.prices and self.asks.prices:
+            return self.asks.prices[0] - self.bids.prices[-1]
+        return None
+
+    @property
+    def mid(self):
+        if self.bids.prices and self.asks.prices:
+            return (self.asks.prices[0] + self.bids.prices[-1]) / 2
+        return None
+
+    # this function returns (remaining volume, order count) on one side ('BUY' or 'SELL'), like
+    # OrderBookSnapshot.depth; without levels it is read from the running totals, optionally for one trader_id
+    # levels limits it to the top n price levels
+    def depth(self, action, levels=None, trader_id=None):
+        side = self.side(action)
+        if levels is None:
+            return side.totals(trader_id)
+        if trader_id is not None:
+            raise ValueError('depth by trader_id covers the whole side; leave levels unset')
+        return side.depth(levels)
+
+    def bid_depth(self, levels=None, trader_id=None):
+        return self.depth('BUY', levels, trader_id)
+
+    def ask_depth(self, levels=None, trader_id=None):
+        return self.depth('SELL', levels, trader_id)
+
+    # this function returns (bid volume - ask volume) / (bid volume + ask volume), optionally for one trader_id
+    def imbalance(self, trader_id=None):
+        bid_volume = self.bids.totals(trader_id)[0]
+        ask_volume = self.asks.totals(trader_id)[0]
+        total = bid_volume + ask_volume
+        return (bid_volume - ask_volume) / total if total else 0.0
+
+# one OrderBook per ticker, shared by every caller in the process
+_books = {}
+
+def order_book(ticker):
+    book = _books.get(ticker)
+    if book is None:
+        book = _books[ticker] = OrderBook(ticker)
+    return book
@@ -0,0 +1,129 @@
+from .api import API_KEY_ERROR, CANCEL, get_orders
+from .client import ApiException
+from .records import loads
+
+# order IDs sent per /commands/cancel call; keeps the query string well inside URL limits
+CANCEL_BATCH_SIZE = 100
+
+# this class is the outcome of one cancel request, confirmed against a single GET /orders?status=OPEN
+class CancelResult:
+    __slots__ = ('requested', 'cancelled', 'still_open')
+
+    def __init__(self, requested, cancelled, still_open=()):
+        self.requested = requested
+        self.cancelled = cancelled
+        self.still_open = list(still_open)
+
+    @property
+    def ok(self):
+        return not self.still_open
+
+    def __repr__(self):
+        return f'CancelResult(requested={len(self.requested)} cancelled={len(self.cancelled)} still_open={self.still_open})'
+
+# this helper method builds the /commands/cancel parameters for a batch of order IDs
+def cancel_params(ids):
+    return {'ids': ','.join(str(order_id) for order_id in ids)}
+
+def batches(ids, size):
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+def cancelled_ids(body):
+    if isinstance(body, dict):
+        return body.get('cancelled_order_ids', [])
+    return []
+
+# these helper methods select open orders; each returns the order IDs to cancel, oldest first
+def select_ticker(orders, ticker):
+    return [order['order_id'] for order in orders if order['ticker'] == ticker]
+
+def select_side(orders, action, ticker=None):
+    return [order['order_id'] for order in orders
+            if order['action'] == action and (ticker is None or order['ticker'] == ticker)]
+
+def select_stale(orders, current_tick, max_open_time=4, ticker=None):
+    return [order['order_id'] for order in orders
+            if current_tick - order['tick'] > max_open_time and (ticker is None or order['ticker'] == ticker)]
+
+def select_band(orders, low, high, action=None, ticker=None):
+    return [order['order_id'] for order in orders
+            if order['price'] is not None and low <= order['price'] <= high
+            and (action is None or order['action'] == action) and (ticker is None or order['ticker'] == ticker)]
+
+def select_excess(orders, keep, ticker=None):
+    if ticker is not None:
+        orders = [order for order in orders if order['ticker'] == ticker]
+    return [order['order_id'] for order in orders[keep:]]
+
+# this class removes resting orders in batched /commands/cancel calls instead of one DELETE per order
+# every cancel_* method takes the open orders the caller already holds, or fetches them once when omitted,
+# and confirms the outcome with one more GET /orders?status=OPEN unless reconcile=False
+class CancelManager:
+
+    def __init__(self, session, batch_size=CANCEL_BATCH_SIZE):
+        self.session = session
+        self.batch_size = batch_size
+
+    def post(self, params):
+        resp = self.session.post(CANCEL, params=params)
+        if resp.status_code == 401:
+            raise ApiException(API_KEY_ERROR)
+        return cancelled_ids(loads(resp.content))
+
+    def open_orders(self, orders=None):
+        return get_orders(self.session, 'OPEN') if orders is None else orders
+
+    # this function checks which of the requested IDs are still resting on the book
+    def reconcile(self, ids):
+        wanted = set(ids)
+        return [order['order_id'] for order in get_orders(self.session, 'OPEN') if order['order_id'] in wanted]
+
+    def cancel_ids(self, ids, reconcile=True):
+        ids = list(ids)
+        cancelled = []
+        for batch in batches(ids, self.batch_size):
+            cancelled.extend(self.post(cancel_params(batch)))
+        still_open = self.reconcile(ids) if reconcile and ids else ()
+        return CancelResult(ids, cancelled, still_open)
+
+    def cancel_all(self, reconcile=True):
+        cancelled = self.post({'all': 1})
+        still_open = [order['order_id'] for order in get_orders(self.session, 'OPEN')] if reconcile else ()
+        return CancelResult(cancelled, cancelled, still_open)
+
+    def cancel_ticker(self, ticker, orders=None, reconcile=True):
+        return self.cancel_ids(select_ticker(self.open_orders(orders), ticker), reconcile)
+
+    def cancel_side(self, action, ticker=None, orders=None, reconcile=True):
+        return self.cancel_ids(select_side(self.open_orders(orders), action, ticker), reconcile)
+
+    # same selection as rit.get_orders_to_cancel: orders resting longer than max_open_time ticks
+    def cancel_stale(self, current_tick, max_open_time=4, ticker=None, orders=None, reconcile=True):
+        return self.cancel_ids(select_stale(self.open_orders(orders), current_tick, max_open_time, ticker), reconcile)
+
+    def cancel_band(self, low, high, action=None, ticker=None, orders=None, reconcile=True):
+        return self.cancel_ids(select_band(self.open_orders(orders), low, high, action, ticker), reconcile)
+
+    # this function trims the order list down to its first `keep` orders, cancelling the rest
+    def cancel_excess(self, keep, ticker=None, orders=None, reconcile=True):
+        return self.cancel_ids(select_excess(self.open_orders(orders), keep, ticker), reconcile)
+
+# this function cancels the given orders in batches and returns True once none of them is left open
+def cancel_orders(session, orders_to_cancel):
+    ids = [order['order_id'] for order in orders_to_cancel]
+    if not ids:
+        return False
+    return CancelManager(session).cancel_ids(ids).ok
+
+# this function is the asyncio counterpart of CancelManager.cancel_ids for rit.aio.AsyncRITClient
+async def cancel_ids_async(client, ids, reconcile=True, batch_size=CANCEL_BATCH_SIZE):
+    ids = list(ids)
+    cancelled = []
+    for batch in batches(ids, batch_size):
+        cancelled.extend(cancelled_ids(await client.cancel(cancel_params(batch))))
+    still_open = ()
+    if reconcile and ids:
+        wanted = set(ids)
+        still_open = [order['order_id'] for order in await client.get_orders('OPEN') if order['order_id'] in wanted]
+    return CancelResult(ids, cancelled, still_open)
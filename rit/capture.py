@@ -0,0 +1,220 @@
+import os
+import mmap
+import time
+import queue
+import struct
+import threading
+from urllib.parse import urlencode
+from .records import loads, orjson
+
+# this module records every RIT response to an append-only binary session log, for replay and analysis
+# the trading loop only puts (time, tick, method, path, params, status, body) on a queue; a background thread
+# packs and writes the records, so capture never waits on disk. Set RIT_CAPTURE=path/to/session.ritlog to
+# record every RITClient / AsyncRITClient in a process, or attach a recorder with capture(session, path)
+
+MAGIC = b'RITLOG1\n'
+
+# record header: body length, wall time, tick, kind, method, HTTP status, request key length;
+# the request key (path and sorted query) and the raw response body follow it
+HEADER = struct.Struct('<IdiBBHH')
+
+KINDS = {'/case': 1, '/securities': 2, '/securities/book': 3, '/securities/history': 4, '/orders': 5,
+         '/commands/cancel': 6, '/tenders': 7, '/news': 8, '/leases': 9, '/assets': 10}
+KIND_NAMES = {code: path for path, code in KINDS.items()}
+METHODS = {'GET': 0, 'POST': 1, 'DELETE': 2}
+METHOD_NAMES = {code: method for method, code in METHODS.items()}
+
+# the writer thread flushes after this many records or this many seconds, whichever comes first
+FLUSH_RECORDS = 256
+FLUSH_INTERVAL = 0.5
+
+# this helper method maps a request path to its record kind, e.g. '/orders/42' -> the /orders kind
+def kind(path):
+    path = path.split('?', 1)[0]
+    code = KINDS.get(path)
+    if code is None:
+        head, _, tail = path.rpartition('/')
+        code = KINDS.get(head, 0) if tail.isdigit() else 0
+    return code
+
+# this helper method builds the request key stored with each record: the path plus its sorted query string
+def request_key(path, params=None):
+    if not params:
+        return path
+    items = sorted((k, ','.join(str(x) for x in v) if isinstance(v, (list, tuple)) else v) for k, v in params.items())
+    return f'{path}?{urlencode(items)}'
+
+# this class appends records to a session log from a background writer thread
+class SessionRecorder:
+
+    def __init__(self, path, clock=None, time_fn=time.time):
+        self.path = path
+        self.clock = clock
+        self.time = time_fn
+        self.tick = -1
+        self.queue = queue.SimpleQueue()
+        self.records = 0
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'ab')
+        if new:
+            self.file.write(MAGIC)
+        self.thread = threading.Thread(target=self.write_loop, name='rit-capture', daemon=True)
+        self.thread.start()
+
+    # this function is called by the clients for every response; it only timestamps and enqueues
+    # the tick is stamped here, on the caller's thread, so a writer thread that falls behind cannot stamp records
+    # with a stale tick: a /case response carries its own tick, which also stamps the records after it, and an
+    # attached TickClock predicts the tick of everything else between /case polls
+    def record(self, method, path, params, status, body):
+        tick = self.tick
+        if status == 200 and kind(path) == 1:
+            try:
+                tick = self.tick = loads(body)['tick']
+            except (ValueError, KeyError, TypeError):
+                pass
+        elif self.clock is not None:
+            predicted = self.clock.predict()
+            if predicted is not None and predicted > tick:
+                tick = predicted
+        self.queue.put((self.time(), tick, method, path, params, status, body))
+
+    def pack(self, item):
+        stamp, tick, method, path, params, status, body = item
+        key = request_key(path, params).encode()
+        return HEADER.pack(len(body), stamp, tick, kind(path), METHODS.get(method.upper(), 255), status, len(key)) + key + body
+
+    def write_loop(self):
+        pending = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self.queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                item = False
+            if item is None:
+                break
+            if item:
+                self.file.write(self.pack(item))
+                self.records += 1
+                pending += 1
+            if pending and (pending >= FLUSH_RECORDS or time.monotonic() - last_flush >= FLUSH_INTERVAL):
+                self.file.flush()
+                pending = 0
+                last_flush = time.monotonic()
+        self.file.flush()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.file.close()
+        _recorders.pop(os.path.abspath(self.path), None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# one recorder per log file, shared by every client in the process so records never interleave mid-write
+_recorders = {}
+
+def open_recorder(path, clock=None):
+    key = os.path.abspath(path)
+    recorder = _recorders.get(key)
+    if recorder is None:
+        recorder = _recorders[key] = SessionRecorder(path, clock)
+    elif clock is not None:
+        recorder.clock = clock
+    return recorder
+
+# this function returns the recorder named by the RIT_CAPTURE environment variable, or None
+# the clients open it before the strategy builds its TickClock; rit.TickClock attaches itself to the recorder of
+# the client it syncs with, so records between /case polls are stamped with the predicted tick
+def recorder_from_env(clock=None):
+    path = os.environ.get('RIT_CAPTURE')
+    return open_recorder(path, clock) if path else None
+
+# this function starts capturing a client's responses to the given log and returns the recorder
+def capture(client, path, clock=None):
+    client.recorder = open_recorder(path, clock)
+    return client.recorder
+
+# this class is one record read back from a session log; body is a zero-copy view into the mapped file
+class Entry:
+    __slots__ = ('time', 'tick', 'kind', 'method', 'status', 'key', 'body')
+
+    def __init__(self, time, tick, kind, method, status, key, body):
+        self.time = time
+        self.tick = tick
+        self.kind = kind
+        self.method = method
+        self.status = status
+        self.key = key
+        self.body = body
+
+    @property
+    def path(self):
+        return self.key.split('?', 1)[0]
+
+    def decode(self):
+        return loads(self.body if orjson is not None else bytes(self.body))
+
+    def __repr__(self):
+        return f'Entry(tick={self.tick} {self.method} {self.key} {self.status} {len(self.body)}B)'
+
+# this class reads a session log through mmap; iterating it yields Entry records in the order they were written
+# a log that is still being written can be read: only complete records are returned
+class SessionLog:
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.view = memoryview(self.map)
+        if size and self.map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f'{path} is not a RIT session log')
+
+    def __iter__(self):
+        view = self.view
+        end = len(view)
+        offset = len(MAGIC)
+        while offset + HEADER.size <= end:
+            length, stamp, tick, code, method, status, key_length = HEADER.unpack_from(view, offset)
+            start = offset + HEADER.size
+            stop = start + key_length + length
+            if stop > end:
+                break
+            key = bytes(view[start:start + key_length]).decode()
+            yield Entry(stamp, tick, KIND_NAMES.get(code, ''), METHOD_NAMES.get(method, '?'), status, key,
+                        view[start + key_length:stop])
+            offset = stop
+
+    # this function filters records by endpoint kind (e.g. '/securities/book') and tick range
+    def entries(self, kind=None, first_tick=None, last_tick=None):
+        for entry in self:
+            if kind is not None and entry.kind != kind:
+                continue
+            if first_tick is not None and entry.tick < first_tick:
+                continue
+            if last_tick is not None and entry.tick > last_tick:
+                continue
+            yield entry
+
+    # entries handed out still point into the mapping; copy bodies with bytes(entry.body) to keep them past close()
+    def close(self):
+        try:
+            self.view.release()
+            if isinstance(self.map, mmap.mmap):
+                self.map.close()
+        except BufferError:
+            pass
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
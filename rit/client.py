@@ -0,0 +1,98 @@
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from .capture import recorder_from_env
+
+# set your API key to authenticate to the RIT client
+API_KEY = 'KZJ94OPT'
+BASE_URL = 'http://localhost:9999/v1'
+
+# connection pool sizing: one pool per host, enough sockets for concurrent order bursts
+POOL_CONNECTIONS = 1
+POOL_MAXSIZE = 32
+
+# order / lease IDs make paths unbounded, so only the first few hundred are kept pre-built
+MAX_CACHED_URLS = 256
+
+# this class definition allows printing error messages and stopping the program
+class ApiException(Exception):
+    pass
+
+# this helper method maps a path to its endpoint name, e.g. '/orders/42?x=1' -> '/orders/{id}'
+def endpoint(path):
+    path = path.split('?', 1)[0]
+    head, _, tail = path.rpartition('/')
+    if tail.isdigit():
+        return head + '/{id}'
+    return path
+
+# this class is a requests session bound to the RIT client
+# paths starting with '/' are resolved against the pre-built endpoint table, so strategies
+# call s.get('/case') or s.post('/orders', params=...) and never format the host per call
+class RITClient(requests.Session):
+
+    def __init__(self, api_key=API_KEY, base_url=BASE_URL, pool_maxsize=POOL_MAXSIZE):
+        super().__init__()
+        self.base_url = base_url.rstrip('/')
+        self.headers.update({'X-API-Key': api_key, 'Connection': 'keep-alive'})
+
+        # the RIT client is always local: skip proxy / netrc lookups on every request
+        self.trust_env = False
+
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize, max_retries=0)
+        self.mount(self.base_url, adapter)
+
+        self.urls = {}
+        self.latency = {}
+
+        # session capture (rit.capture): set RIT_CAPTURE=path or attach one with rit.capture.capture()
+        self.recorder = recorder_from_env()
+
+    # this helper method returns the full URL for an API path, building it once per path
+    def url(self, path):
+        url = self.urls.get(path)
+        if url is None:
+            url = self.base_url + path
+            if len(self.urls) < MAX_CACHED_URLS:
+                self.urls[path] = url
+        return url
+
+    # every call goes through here: resolve the path and record the round-trip time per endpoint
+    def request(self, method, url, *args, **kwargs):
+        path = url
+        if url.startswith('/'):
+            url = self.url(url)
+        start = time.perf_counter()
+        try:
+            resp = super().request(method, url, *args, **kwargs)
+        finally:
+            self.record_latency(path, time.perf_counter() - start)
+        if self.recorder is not None:
+            self.recorder.record(method, path, kwargs.get('params'), resp.status_code, resp.content)
+        return resp
+
+    # this helper method accumulates [count, total seconds, max seconds] for an endpoint
+    def record_latency(self, path, elapsed):
+        path = endpoint(path)
+        stats = self.latency.get(path)
+        if stats is None:
+            self.latency[path] = [1, elapsed, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+
+    # this function summarises the round-trip latency measured for every endpoint, in milliseconds
+    def latency_summary(self):
+        summary = {}
+        for path, (count, total, worst) in self.latency.items():
+            summary[path] = {'count': count, 'mean_ms': total / count * 1000, 'max_ms': worst * 1000}
+        return summary
+
+    def reset_latency(self):
+        self.latency.clear()
+
+# this function opens a session to the RIT client with the API key already set
+def open_session(api_key=API_KEY, base_url=BASE_URL):
+    return RITClient(api_key, base_url)
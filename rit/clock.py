@@ -0,0 +1,119 @@
+import math
+import time
+from .api import get_tick
+
+# RIT cases advance one tick per second unless the case file says otherwise
+TICK_LENGTH = 1.0
+SYNC_INTERVAL = 5.0
+
+# tick edges are located to within this many seconds (bounded below by the request round-trip)
+PRECISION = 0.01
+MAX_REFINE_SYNCS = 8
+
+# this class predicts the case tick locally and only asks GET /case every sync_interval seconds
+# each sync brackets the moment the tick started: the response for tick k sent at t0 and received at t1
+# means tick 0 started in (t0 - (k + 1) * L, t1 - k * L]. Intersecting those windows across syncs
+# pins the tick edges down; predictions use the latest edge consistent with every observation
+class TickClock:
+
+    def __init__(self, session=None, tick_length=TICK_LENGTH, sync_interval=SYNC_INTERVAL, time_fn=time.monotonic, sleep_fn=time.sleep):
+        self.session = session
+        self.tick_length = tick_length
+        self.sync_interval = sync_interval
+        self.time = time_fn
+        self.sleep = sleep_fn
+        self.epoch_lo = None
+        self.epoch_hi = None
+        self.last_sync = None
+        self.last_tick = None
+        self.callbacks = []
+        if session is not None:
+            self.attach(session)
+
+    # this function lends the clock to a client's session recorder (rit.capture) that has none yet, so the
+    # responses recorded between syncs are stamped with the predicted tick instead of the last polled one
+    def attach(self, client):
+        recorder = getattr(client, 'recorder', None)
+        if recorder is not None and recorder.clock is None:
+            recorder.clock = self
+
+    # this function records one observed tick, bracketed by the send and receive times of its request
+    def observe(self, tick, sent, received):
+        lo = sent - (tick + 1) * self.tick_length
+        hi = received - tick * self.tick_length
+        # a paused, restarted or re-timed case makes the windows disagree: start again from this observation
+        if self.epoch_lo is None or lo > self.epoch_hi or hi < self.epoch_lo or (self.last_tick is not None and tick < self.last_tick):
+            self.epoch_lo, self.epoch_hi = lo, hi
+        else:
+            self.epoch_lo = max(self.epoch_lo, lo)
+            self.epoch_hi = min(self.epoch_hi, hi)
+        self.last_sync = received
+        self.last_tick = tick
+        return tick
+
+    def sync(self):
+        sent = self.time()
+        tick = get_tick(self.session)
+        return self.observe(tick, sent, self.time())
+
+    async def sync_async(self, client):
+        self.attach(client)
+        sent = self.time()
+        tick = await client.get_tick()
+        return self.observe(tick, sent, self.time())
+
+    def stale(self):
+        return self.last_sync is None or self.time() - self.last_sync >= self.sync_interval
+
+    # this function returns the predicted current tick, re-syncing first when the estimate is stale
+    def now(self):
+        if self.session is not None and self.stale():
+            self.sync()
+        if self.epoch_hi is None:
+            raise RuntimeError('TickClock has not been synced yet')
+        return self.predict()
+
+    # this function returns the predicted tick without ever sending a request; None before the first sync
+    def predict(self):
+        if self.epoch_hi is None:
+            return None
+        return max(self.last_tick, math.floor((self.time() - self.epoch_hi) / self.tick_length))
+
+    def on_tick(self, callback):
+        self.callbacks.append(callback)
+        return callback
+
+    # this helper method narrows the window around the edge of tick `target` by syncing at its middle
+    # a few requests over the first ticks pin the edges down, after which waits need no requests at all
+    def refine(self, target):
+        for _ in range(MAX_REFINE_SYNCS):
+            width = self.epoch_hi - self.epoch_lo
+            if width <= PRECISION:
+                return
+            middle = (self.epoch_lo + self.epoch_hi) / 2 + target * self.tick_length
+            delay = middle - self.time()
+            if delay > 0:
+                self.sleep(delay)
+            if self.sync() >= target or self.epoch_hi - self.epoch_lo > width * .75:
+                return
+
+    # this function sleeps until the next tick edge, runs the on_tick callbacks and returns the new tick
+    def wait_for_next_tick(self):
+        target = self.now() + 1
+        if self.session is not None:
+            self.refine(target)
+        tick = self.now()
+        if tick < target:
+            delay = self.epoch_hi + target * self.tick_length - self.time()
+            if delay > 0:
+                self.sleep(delay)
+            tick = max(target, self.now())
+        for callback in self.callbacks:
+            callback(tick)
+        return tick
+
+    # this function drives the on_tick callbacks until the last tick of the case
+    def run(self, end=600):
+        tick = self.now()
+        while tick < end:
+            tick = self.wait_for_next_tick()
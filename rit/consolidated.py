@@ -0,0 +1,176 @@
+import bisect
+from .book import order_book
+from .lazy import lazy_import
+from .router import VENUE_FEES, underlying, venues
+
+asyncio = lazy_import('asyncio')
+
+# this module keeps one consolidated book per dual-listed security: the levels of its _A and _M books merged into
+# one sorted view, each level tagged with its venue and priced net of that venue's fee
+# it listens to the shared rit.OrderBook of every venue, so whichever code polls a venue, the level updates of that
+# poll are applied here as they come instead of merging the two books again. The best net bid and ask sit at the
+# ends of their sides, which makes the crossed-market check constant time
+
+# this class is one side of a ConsolidatedBook: levels kept sorted ascending by (net price, venue) in parallel
+# arrays, best bid last and best ask first like rit.book.BookSide
+class ConsolidatedSide:
+    __slots__ = ('action', 'keys', 'prices', 'volumes')
+
+    def __init__(self, action):
+        self.action = action
+        self.keys = []
+        self.prices = []
+        self.volumes = []
+
+    # this function sets the volume of one venue's price level; volume 0 removes the level
+    def update(self, venue, fee, price, volume):
+        net = price + fee if self.action == 'BUY' else price - fee
+        key = (net, venue)
+        keys = self.keys
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            if volume:
+                self.volumes[i] = volume
+            else:
+                del keys[i], self.prices[i], self.volumes[i]
+        elif volume:
+            keys.insert(i, key)
+            self.prices.insert(i, price)
+            self.volumes.insert(i, volume)
+
+    # this function drops every level of one venue
+    def clear(self, venue):
+        keep = [i for i, key in enumerate(self.keys) if key[1] != venue]
+        self.keys = [self.keys[i] for i in keep]
+        self.prices = [self.prices[i] for i in keep]
+        self.volumes = [self.volumes[i] for i in keep]
+
+    # this function yields (net price, volume, venue, price) levels best first, the shape rit.router walks
+    def levels(self):
+        if self.action == 'BUY':
+            for i in range(len(self.keys) - 1, -1, -1):
+                yield self.keys[i][0], self.volumes[i], self.keys[i][1], self.prices[i]
+        else:
+            for i in range(len(self.keys)):
+                yield self.keys[i][0], self.volumes[i], self.keys[i][1], self.prices[i]
+
+    # best level as (net price, venue, price), or None when the side is empty
+    @property
+    def best(self):
+        if not self.keys:
+            return None
+        i = -1 if self.action == 'BUY' else 0
+        return self.keys[i][0], self.keys[i][1], self.prices[i]
+
+    @property
+    def best_net(self):
+        if not self.keys:
+            return None
+        return self.keys[-1][0] if self.action == 'BUY' else self.keys[0][0]
+
+    def depth(self, levels=None):
+        if levels is None:
+            return sum(self.volumes)
+        return sum(self.volumes[-levels:]) if self.action == 'BUY' else sum(self.volumes[:levels])
+
+# this class is the consolidated book of one security over all its venues
+# build it with consolidated_book(ticker) so every caller shares one instance and one listener per venue book
+class ConsolidatedBook:
+    __slots__ = ('ticker', 'fees', 'books', 'bids', 'asks')
+
+    def __init__(self, ticker, fees=VENUE_FEES):
+        self.ticker = underlying(ticker)
+        pairs = venues(ticker, fees)
+        self.fees = dict(pairs)
+        self.books = [order_book(venue) for venue, fee in pairs]
+        self.bids = ConsolidatedSide('BUY')
+        self.asks = ConsolidatedSide('SELL')
+        for book in self.books:
+            self.load(book)
+            book.listeners.append(self.on_update)
+
+    # this helper method copies every level a venue's book already holds
+    def load(self, book):
+        fee = self.fees[book.ticker]
+        for side, levels in ((self.bids, book.bids), (self.asks, book.asks)):
+            side.clear(book.ticker)
+            for price, volume in zip(levels.prices, levels.volumes):
+                side.update(book.ticker, fee, price, volume)
+
+    # this function applies the level updates of one venue's book, as returned by OrderBook.apply_levels
+    def on_update(self, book, updates):
+        fee = self.fees[book.ticker]
+        venue = book.ticker
+        bids = self.bids
+        asks = self.asks
+        for action, price, volume in updates:
+            (bids if action == 'BUY' else asks).update(venue, fee, price, volume)
+
+    # this function stops following the venue books
+    def detach(self):
+        for book in self.books:
+            if self.on_update in book.listeners:
+                book.listeners.remove(self.on_update)
+
+    # these helper methods poll every venue once; the updates reach this book through the listeners
+    def refresh(self, session, limit=None):
+        for book in self.books:
+            book.refresh(session, limit)
+        return self
+
+    async def refresh_async(self, client, limit=None):
+        await asyncio.gather(*(book.refresh_async(client, limit) for book in self.books))
+        return self
+
+    def side(self, action):
+        return self.bids if action == 'BUY' else self.asks
+
+    # this function yields one side's levels best net price first as (net price, volume, venue, price)
+    def levels(self, action):
+        return self.side(action).levels()
+
+    @property
+    def bid_price(self):
+        return self.bids.best_net
+
+    @property
+    def ask_price(self):
+        return self.asks.best_net
+
+    @property
+    def spread(self):
+        if self.bids.keys and self.asks.keys:
+            return self.asks.keys[0][0] - self.bids.keys[-1][0]
+        return None
+
+    # this function returns by how much the best net bid clears the best net ask, or None if the market is not
+    # crossed by more than threshold; a crossed consolidated market is one venue's bid above the other's ask
+    def crossed(self, threshold=0.0):
+        if not self.bids.keys or not self.asks.keys:
+            return None
+        gap = self.bids.keys[-1][0] - self.asks.keys[0][0]
+        return gap if gap > threshold + 1e-9 else None
+
+    # this function returns the best raw price quoted on one side ('BUY' or 'SELL') across the venues
+    def touch(self, action):
+        prices = [book.side(action).best_price for book in self.books]
+        prices = [price for price in prices if price is not None]
+        if not prices:
+            return None
+        return max(prices) if action == 'BUY' else min(prices)
+
+    def __repr__(self):
+        bid = self.bids.best
+        ask = self.asks.best
+        return (f'ConsolidatedBook({self.ticker} bid {bid[2] if bid else None}@{bid[1] if bid else None} '
+                f'ask {ask[2] if ask else None}@{ask[1] if ask else None} net spread {self.spread})')
+
+# one ConsolidatedBook per security and fee table, shared by every caller in the process
+_books = {}
+
+def consolidated_book(ticker, fees=VENUE_FEES):
+    key = (underlying(ticker), tuple(fees.items()))
+    book = _books.get(key)
+    if book is None:
+        book = _books[key] = ConsolidatedBook(ticker, fees)
+    return book
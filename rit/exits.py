@@ -0,0 +1,140 @@
+from .api import get_securities, order_params
+from .gateway import OrderGateway, submit_async
+
+# this module closes open trades on triggers instead of a blocking watch loop per trade
+# each trade registers an ExitTrigger (price target, protective stop, time stop); one GET /securities per step
+# prices every trigger at once, and the exit orders of every trigger that fires in that step are sent together
+# through the order gateway, so several trades can be open while the caller keeps reading news
+
+# RIT quotes used to evaluate triggers; the news strategy watches the last traded price
+PRICE_FIELD = 'last'
+
+# this class is the exit plan of one open trade: closing `lots` market orders of `quantity` on `action`
+# action is the closing side, so a SELL trigger closes a long: its target is above the price and its stop below
+class ExitTrigger:
+    __slots__ = ('trigger_id', 'ticker', 'action', 'quantity', 'lots', 'target', 'stop_price', 'stop_tick',
+                 'opened_tick', 'reason', 'fired_tick', 'fired_price', 'results')
+
+    def __init__(self, trigger_id, ticker, action, quantity, lots=1, target=None, stop_price=None, stop_tick=None, opened_tick=None):
+        self.trigger_id = trigger_id
+        self.ticker = ticker
+        self.action = action
+        self.quantity = quantity
+        self.lots = lots
+        self.target = target
+        self.stop_price = stop_price
+        self.stop_tick = stop_tick
+        self.opened_tick = opened_tick
+        self.reason = None
+        self.fired_tick = None
+        self.fired_price = None
+        self.results = []
+
+    # this function returns why the trigger fires at this price and tick ('TARGET', 'STOP' or 'TIME'), or None
+    def check(self, price, tick=None):
+        if price is not None and price > 0:
+            if self.action == 'SELL':
+                if self.target is not None and price >= self.target:
+                    return 'TARGET'
+                if self.stop_price is not None and price <= self.stop_price:
+                    return 'STOP'
+            else:
+                if self.target is not None and price <= self.target:
+                    return 'TARGET'
+                if self.stop_price is not None and price >= self.stop_price:
+                    return 'STOP'
+        if self.stop_tick is not None and tick is not None and tick >= self.stop_tick:
+            return 'TIME'
+        return None
+
+    def intents(self):
+        return [order_params(self.ticker, 'MARKET', self.quantity, self.action)] * self.lots
+
+    @property
+    def filled(self):
+        return sum(result.order.get('quantity_filled', 0) for result in self.results if result.ok)
+
+    def __repr__(self):
+        state = f'{self.reason} at {self.fired_price} tick {self.fired_tick}' if self.reason else 'open'
+        return (f'ExitTrigger({self.trigger_id} {self.action} {self.lots}x{self.quantity} {self.ticker} '
+                f'target={self.target} stop={self.stop_price} stop_tick={self.stop_tick} {state})')
+
+# this class holds the open triggers and fires them from one shared price read per step
+class ExitEngine:
+
+    def __init__(self, session=None, gateway=None, price_field=PRICE_FIELD):
+        self.session = session
+        self.owns_gateway = gateway is None and session is not None
+        self.gateway = OrderGateway(session) if self.owns_gateway else gateway
+        self.price_field = price_field
+        self.triggers = {}
+        self.closed = []
+        self.next_id = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.owns_gateway:
+            self.gateway.close()
+
+    # this function registers the exit of a trade and returns its trigger
+    def add(self, ticker, action, quantity, lots=1, target=None, stop_price=None, stop_tick=None, tick=None):
+        trigger = ExitTrigger(self.next_id, ticker, action, quantity, lots, target, stop_price, stop_tick, tick)
+        self.triggers[trigger.trigger_id] = trigger
+        self.next_id += 1
+        return trigger
+
+    def remove(self, trigger_id):
+        return self.triggers.pop(trigger_id, None)
+
+    # this function maps ticker -> price from a decoded /securities response
+    def prices(self, securities):
+        field = self.price_field
+        return {security['ticker']: security.get(field) for security in securities}
+
+    # this helper method takes the triggers that fire at these prices off the open set, oldest first
+    def fired(self, prices, tick=None):
+        fired = []
+        for trigger in list(self.triggers.values()):
+            price = prices.get(trigger.ticker)
+            reason = trigger.check(price, tick)
+            if reason is not None:
+                trigger.reason = reason
+                trigger.fired_tick = tick
+                trigger.fired_price = price
+                del self.triggers[trigger.trigger_id]
+                self.closed.append(trigger)
+                fired.append(trigger)
+        return fired
+
+    def assign(self, fired, results):
+        position = 0
+        for trigger in fired:
+            trigger.results = results[position:position + trigger.lots]
+            position += trigger.lots
+        return fired
+
+    # this function evaluates every trigger against the prices and sends all exits that fire in one batch
+    def evaluate(self, prices, tick=None):
+        fired = self.fired(prices, tick)
+        if not fired:
+            return fired
+        return self.assign(fired, self.gateway.submit([intent for trigger in fired for intent in trigger.intents()]))
+
+    # this function reads /securities once and evaluates every open trigger; no request when nothing is open
+    def step(self, tick=None):
+        if not self.triggers:
+            return []
+        return self.evaluate(self.prices(get_securities(self.session)), tick)
+
+    async def step_async(self, client, tick=None):
+        if not self.triggers:
+            return []
+        fired = self.fired(self.prices(await client.get_securities()), tick)
+        if not fired:
+            return fired
+        return self.assign(fired, await submit_async(client, [intent for trigger in fired for intent in trigger.intents()]))
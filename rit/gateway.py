@@ -0,0 +1,96 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from .api import ORDERS
+from .client import POOL_MAXSIZE
+from .lazy import lazy_import
+from .records import loads
+
+# only the submit_async path needs asyncio; synchronous strategies start without importing it
+asyncio = lazy_import('asyncio')
+
+# a ladder is sent over this many connections at once; keep it within the client's connection pool
+MAX_WORKERS = 16
+
+# RIT answers 429 with a 'wait' hint when orders arrive faster than the case allows
+RATE_LIMIT_RETRIES = 2
+
+# this class is the outcome of one order intent: the order ID on success, the RIT message on rejection
+class OrderResult:
+    __slots__ = ('params', 'ok', 'order_id', 'order', 'error')
+
+    def __init__(self, params, order=None, error=None):
+        self.params = params
+        self.order = order
+        self.order_id = order['order_id'] if order else None
+        self.ok = self.order_id is not None
+        self.error = error
+
+    def __repr__(self):
+        if self.ok:
+            return f'OrderResult(ok order_id={self.order_id})'
+        return f'OrderResult(rejected {self.error!r})'
+
+# this helper method turns a decoded /orders response body into a result
+def order_result(params, body):
+    if isinstance(body, dict) and 'order_id' in body:
+        return OrderResult(params, order=body)
+    message = body.get('message') if isinstance(body, dict) else None
+    return OrderResult(params, error=message or str(body))
+
+def rate_limit_wait(body):
+    if isinstance(body, dict) and body.get('code') == 'TOO_MANY_REQUESTS':
+        return body.get('wait', 0.1)
+    return None
+
+# this class submits a batch of order intents concurrently through a bounded worker pool
+# intents are the usual /orders query parameters, e.g. rit.order_params('CRZY', 'LIMIT', 5000, 'SELL', 35.00);
+# submit() returns one OrderResult per intent, in the order given
+class OrderGateway:
+
+    def __init__(self, session, max_workers=MAX_WORKERS):
+        self.session = session
+        self.pool = ThreadPoolExecutor(max_workers=min(max_workers, POOL_MAXSIZE), thread_name_prefix='rit-orders')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+    # this function sends one order, honouring the rate-limit wait RIT asks for
+    def send(self, params):
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                resp = self.session.post(ORDERS, params=params)
+                body = loads(resp.content)
+            except (requests.RequestException, ValueError) as e:
+                return OrderResult(params, error=str(e))
+            wait = rate_limit_wait(body)
+            if wait is None or attempt == RATE_LIMIT_RETRIES:
+                return order_result(params, body)
+            time.sleep(wait)
+
+    def submit(self, intents):
+        return list(self.pool.map(self.send, intents))
+
+# this function is the asyncio counterpart of OrderGateway.submit for rit.aio.AsyncRITClient
+async def submit_async(client, intents, max_workers=MAX_WORKERS):
+    limit = asyncio.Semaphore(max_workers)
+
+    async def send(params):
+        async with limit:
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                try:
+                    body = await client.post(ORDERS, params)
+                except Exception as e:
+                    return OrderResult(params, error=str(e))
+                wait = rate_limit_wait(body)
+                if wait is None or attempt == RATE_LIMIT_RETRIES:
+                    return order_result(params, body)
+                await asyncio.sleep(wait)
+
+    return await asyncio.gather(*(send(params) for params in intents))
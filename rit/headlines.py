@@ -0,0 +1,156 @@
+import re
+
+# this module turns /news headlines into typed events with a registry of precompiled templates
+# parse_headline tries each template's regex in registration order and builds the event from the named groups
+# of the first match; a headline no template matches returns None. Matching ignores case, extra spaces and the
+# punctuation between clauses, so the same report worded slightly differently still parses
+
+# inventory moves: a build adds barrels to storage, a draw removes them
+BUILD = 'BUILD'
+DRAW = 'DRAW'
+STOCKS = {'BUILD': BUILD, 'INCREASE': BUILD, 'RISE': BUILD, 'DRAW': DRAW, 'DRAWDOWN': DRAW, 'DECREASE': DRAW, 'FALL': DRAW}
+
+# building blocks shared by the templates
+_STOCK = r'(?P<{0}_stock>BUILD|INCREASE|RISE|DRAWDOWN|DRAW|DECREASE|FALL)'
+_QTY = r'(?:OF\s+)?(?P<{0}_qty>\d+(?:\.\d+)?)\s*(?:M{{1,2}}|MILLION)?\s*(?:BARRELS|BBLS?)?'
+_WEEK = r'(?:WEEK\s*(?P<week>\d+)\W*)?'
+_REPORT = r'(?:EIA\s+)?(?:(?:CRUDE|OIL|INVENTORY|INVENTORIES|STOCKS?|WEEKLY)\s+)*REPORT\W*'
+_SEP = r'[\s,;.:\-]*(?:VS\.?|VERSUS|AGAINST|AND|WHILE)?[\s,;.:\-]*(?:AN?\s+|THE\s+)?'
+_FORECAST = r'(?:EXPECTED|FORECAST|FORECASTS|CONSENSUS)(?:\s+(?:WAS|OF|IS|FOR))?\W*'
+_ACTUAL = r'(?:ACTUAL(?:\s+(?:WAS|OF|IS))?\W*)?'
+_END = r'[\s.!]*$'
+
+# this class is an EIA inventory report: actual and forecast moves in millions of barrels, each a BUILD or a DRAW
+class InventoryReport:
+    __slots__ = ('news_id', 'tick', 'week', 'actual_stock', 'actual_qty', 'forecast_stock', 'forecast_qty')
+
+    def __init__(self, actual_stock, actual_qty, forecast_stock, forecast_qty, week=None, news_id=None, tick=None):
+        self.news_id = news_id
+        self.tick = tick
+        self.week = week
+        self.actual_stock = actual_stock
+        self.actual_qty = actual_qty
+        self.forecast_stock = forecast_stock
+        self.forecast_qty = forecast_qty
+
+    # signed change in storage: builds positive, draws negative
+    @property
+    def actual(self):
+        return self.actual_qty if self.actual_stock == BUILD else -self.actual_qty
+
+    @property
+    def forecast(self):
+        return self.forecast_qty if self.forecast_stock == BUILD else -self.forecast_qty
+
+    # a positive surprise means more oil in storage than expected
+    @property
+    def surprise(self):
+        return self.actual - self.forecast
+
+    def __repr__(self):
+        return (f'InventoryReport(week={self.week} {self.actual_stock} {self.actual_qty:g}, '
+                f'forecast {self.forecast_stock} {self.forecast_qty:g})')
+
+# this class is a forecast published ahead of a report, with no actual figure yet
+class InventoryForecast:
+    __slots__ = ('news_id', 'tick', 'week', 'forecast_stock', 'forecast_qty')
+
+    def __init__(self, forecast_stock, forecast_qty, week=None, news_id=None, tick=None):
+        self.news_id = news_id
+        self.tick = tick
+        self.week = week
+        self.forecast_stock = forecast_stock
+        self.forecast_qty = forecast_qty
+
+    @property
+    def forecast(self):
+        return self.forecast_qty if self.forecast_stock == BUILD else -self.forecast_qty
+
+    def __repr__(self):
+        return f'InventoryForecast(week={self.week} {self.forecast_stock} {self.forecast_qty:g})'
+
+# this class is the headline that opens a case
+class CaseStart:
+    __slots__ = ('news_id', 'tick', 'case')
+
+    def __init__(self, case, news_id=None, tick=None):
+        self.news_id = news_id
+        self.tick = tick
+        self.case = case
+
+    def __repr__(self):
+        return f'CaseStart({self.case!r})'
+
+class Template:
+    __slots__ = ('name', 'regex', 'build')
+
+    def __init__(self, name, pattern, build):
+        self.name = name
+        self.regex = re.compile(pattern, re.IGNORECASE)
+        self.build = build
+
+    def __repr__(self):
+        return f'Template({self.name!r})'
+
+TEMPLATES = []
+
+# this function adds a template; build receives the re.Match and returns the event
+def register(name, pattern, build):
+    template = Template(name, pattern, build)
+    TEMPLATES.append(template)
+    return template
+
+def _report(match):
+    actual_stock, actual_qty, forecast_stock, forecast_qty, week = match.group(
+        'actual_stock', 'actual_qty', 'forecast_stock', 'forecast_qty', 'week')
+    return InventoryReport(STOCKS[actual_stock.upper()], float(actual_qty), STOCKS[forecast_stock.upper()],
+                           float(forecast_qty), int(week) if week else None)
+
+def _forecast(match):
+    forecast_stock, forecast_qty, week = match.group('forecast_stock', 'forecast_qty', 'week')
+    return InventoryForecast(STOCKS[forecast_stock.upper()], float(forecast_qty), int(week) if week else None)
+
+# WEEK 1 EIA REPORT: BUILD 5 MILLION BARRELS, FORECAST WAS BUILD 3 MILLION BARRELS
+register('inventory_report',
+         r'\s*' + _WEEK + _REPORT + _ACTUAL + _STOCK.format('actual') + r'\s+' + _QTY.format('actual') + _SEP
+         + _FORECAST + _STOCK.format('forecast') + r'\s+' + _QTY.format('forecast') + _END,
+         _report)
+
+# WEEK 1 EIA REPORT: FORECAST WAS BUILD 3 MILLION BARRELS, ACTUAL DRAW 2 MILLION BARRELS
+register('inventory_report_forecast_first',
+         r'\s*' + _WEEK + _REPORT + _FORECAST + _STOCK.format('forecast') + r'\s+' + _QTY.format('forecast') + _SEP
+         + r'ACTUAL(?:\s+(?:WAS|OF|IS))?\W*' + _STOCK.format('actual') + r'\s+' + _QTY.format('actual') + _END,
+         _report)
+
+# WEEK 2 EIA FORECAST: DRAW 4 MILLION BARRELS
+register('inventory_forecast',
+         r'\s*' + _WEEK + r'(?:EIA\s+)?(?:(?:CRUDE|OIL|INVENTORY|INVENTORIES|STOCKS?|WEEKLY)\s+)*' + _FORECAST
+         + _STOCK.format('forecast') + r'\s+' + _QTY.format('forecast') + _END,
+         _forecast)
+
+# Welcome to the Commodities Trading 5 Case
+register('case_start', r'\s*WELCOME\s+TO\s+(?:THE\s+)?(?P<case>.+?)(?:\s+CASE)?' + _END,
+         lambda match: CaseStart(match.group('case')))
+
+# this function returns the event for a headline, or None when no template matches it
+def parse_headline(headline):
+    for template in TEMPLATES:
+        match = template.regex.match(headline)
+        if match is not None:
+            return template.build(match)
+    return None
+
+# this function parses a /news item (a dict or rit.records.News) and stamps the event with its news_id and tick;
+# it can be passed to rit.NewsFeed as parse
+def parse_news_item(item):
+    if isinstance(item, dict):
+        event = parse_headline(item['headline'])
+        if event is not None:
+            event.news_id = item.get('news_id')
+            event.tick = item.get('tick')
+        return event
+    event = parse_headline(item.headline)
+    if event is not None:
+        event.news_id = item.news_id
+        event.tick = item.tick
+    return event
@@ -0,0 +1,210 @@
+from collections import deque
+from .api import HISTORY
+from .lazy import lazy_import
+from .records import loads
+
+np = lazy_import('numpy')
+
+# this module keeps streaming indicators per ticker over fixed-size NumPy ring buffers
+# every update is O(1): the SMA and rolling variance come from a Welford mean / M2 that adds the new price and
+# removes the one leaving the window, VWAP from rolling sums, and the high/low from monotonic deques
+# prices pushed with the same tick as the last update revise that tick instead of adding a new one
+
+WINDOW = 12
+
+# this class is a fixed-size ring buffer over a NumPy array; push returns the value it overwrote (or None)
+class RingBuffer:
+    __slots__ = ('values', 'size', 'start', 'count')
+
+    def __init__(self, size):
+        self.values = np.zeros(size)
+        self.size = size
+        self.start = 0
+        self.count = 0
+
+    def push(self, value):
+        if self.count < self.size:
+            self.values[(self.start + self.count) % self.size] = value
+            self.count += 1
+            return None
+        evicted = self.values[self.start]
+        self.values[self.start] = value
+        self.start = (self.start + 1) % self.size
+        return float(evicted)
+
+    def last(self):
+        return float(self.values[(self.start + self.count - 1) % self.size])
+
+    def set_last(self, value):
+        self.values[(self.start + self.count - 1) % self.size] = value
+
+    # this function returns the buffered values oldest first
+    def array(self):
+        return np.roll(self.values, -self.start)[:self.count]
+
+    def __len__(self):
+        return self.count
+
+class RollingIndicators:
+    __slots__ = ('ticker', 'window', 'alpha', 'prices', 'volumes', 'pv', 'seq', 'tick',
+                 'mean', 'm2', 'ema', 'pv_sum', 'volume_sum', 'highs', 'lows')
+
+    def __init__(self, ticker=None, window=WINDOW, span=None):
+        self.ticker = ticker
+        self.window = window
+        self.alpha = 2 / ((span or window) + 1)
+        self.prices = RingBuffer(window)
+        self.volumes = RingBuffer(window)
+        self.pv = RingBuffer(window)
+        self.seq = 0
+        self.tick = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.ema = None
+        self.pv_sum = 0.0
+        self.volume_sum = 0.0
+        # (seq, price) pairs: highs decreasing, lows increasing, so the window's extreme is always at the front
+        self.highs = deque()
+        self.lows = deque()
+
+    # this function adds a price (and the volume traded at it) and returns self for chaining
+    # e.g. indicators('ALGO', s).update(close, tick).sma
+    def update(self, price, volume=0.0, tick=None):
+        if tick is not None and tick == self.tick and len(self.prices):
+            return self.revise(price, volume)
+        self.tick = tick
+        evicted = self.prices.push(price)
+        evicted_pv = self.pv.push(price * volume)
+        evicted_volume = self.volumes.push(volume)
+        n = len(self.prices)
+        if evicted is not None:
+            self.remove(evicted, n - 1)
+            self.pv_sum -= evicted_pv
+            self.volume_sum -= evicted_volume
+        self.add(price, n)
+        self.pv_sum += price * volume
+        self.volume_sum += volume
+        self.ema = price if self.ema is None else self.ema + self.alpha * (price - self.ema)
+        self.seq += 1
+        self.push_extremes(self.seq, price)
+        return self
+
+    # this helper method replaces the latest price of the current tick
+    def revise(self, price, volume):
+        old = self.prices.last()
+        n = len(self.prices)
+        self.remove(old, n - 1)
+        self.add(price, n)
+        old_volume = self.volumes.last()
+        self.pv_sum += price * volume - old * old_volume
+        self.volume_sum += volume - old_volume
+        self.prices.set_last(price)
+        self.volumes.set_last(volume)
+        self.pv.set_last(price * volume)
+        # undo the last EMA step from the value it started at, then apply the revised price
+        if self.seq > 1:
+            previous = (self.ema - self.alpha * old) / (1 - self.alpha)
+            self.ema = previous + self.alpha * (price - previous)
+        else:
+            self.ema = price
+        # a revision can bring back prices the old one pushed out of the deques; rebuild them from the buffer
+        self.highs.clear()
+        self.lows.clear()
+        first = self.seq - n + 1
+        for i, value in enumerate(self.prices.array()):
+            self.push_extremes(first + i, float(value))
+        return self
+
+    # Welford updates of the mean and M2 for adding x to (n - 1) values, and removing x from (n + 1) values
+    def add(self, x, n):
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+
+    def remove(self, x, n):
+        if n == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / n
+        self.m2 = max(0.0, self.m2 - delta * (x - self.mean))
+
+    def push_extremes(self, seq, price):
+        oldest = seq - self.window
+        highs, lows = self.highs, self.lows
+        while highs and highs[-1][1] <= price:
+            highs.pop()
+        highs.append((seq, price))
+        while highs[0][0] <= oldest:
+            highs.popleft()
+        while lows and lows[-1][1] >= price:
+            lows.pop()
+        lows.append((seq, price))
+        while lows[0][0] <= oldest:
+            lows.popleft()
+
+    @property
+    def ready(self):
+        return len(self.prices) >= self.window
+
+    @property
+    def sma(self):
+        return self.mean if len(self.prices) else None
+
+    @property
+    def variance(self):
+        n = len(self.prices)
+        return self.m2 / (n - 1) if n > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    @property
+    def vwap(self):
+        return self.pv_sum / self.volume_sum if self.volume_sum > 0 else None
+
+    @property
+    def high(self):
+        return self.highs[0][1] if self.highs else None
+
+    @property
+    def low(self):
+        return self.lows[0][1] if self.lows else None
+
+    # this function fills the window from /securities/history closes, oldest first; the history has no traded
+    # volume, so VWAP starts with the first live update
+    def warm_up(self, session):
+        resp = session.get(HISTORY, params={'ticker': self.ticker, 'limit': self.window})
+        if resp.status_code == 200:
+            self.load_history(loads(resp.content))
+        return self
+
+    async def warm_up_async(self, client):
+        self.load_history(await client.get(HISTORY, {'ticker': self.ticker, 'limit': self.window}))
+        return self
+
+    def load_history(self, candles):
+        for candle in reversed(candles):
+            self.update(candle['close'], tick=candle['tick'])
+
+# one RollingIndicators per ticker, shared by every caller in the process; passing a session the first time
+# warms it up from the price history
+_indicators = {}
+
+def indicators(ticker, session=None, window=WINDOW):
+    rolling = _indicators.get(ticker)
+    if rolling is None:
+        rolling = _indicators[ticker] = RollingIndicators(ticker, window)
+        if session is not None:
+            rolling.warm_up(session)
+    return rolling
+
+# this function drops the shared indicators (all of them, or one ticker's) so the next indicators() call starts
+# a fresh window; a replay calls it before each run
+def reset_indicators(ticker=None):
+    if ticker is None:
+        _indicators.clear()
+    else:
+        _indicators.pop(ticker, None)
@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import signal
+import argparse
+import importlib.util
+from inspect import iscoroutinefunction
+
+# this module starts a strategy by name: python -m rit.launch mm_case_1
+# the strategies import only what their loops use; numpy (rit.indicators, rit.analytics) and asyncio (rit.gateway)
+# are loaded on first use through rit.lazy, so a restarted bot reaches its first request as early as possible
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STRATEGIES = {
+    'exchange_arbitrage': 'Arbitraging Algos/Exchange_Arbitrage.py',
+    'futures_stat_arb': 'Arbitraging Algos/Futures_Statistical_Arbitrage.py',
+    'futures_time_decay': 'Arbitraging Algos/Futures_Time_Decay_Arbitrage/futures.py',
+    'liquidity_trading': 'Liquidity Trading Algos/Liquidity_Trading.py',
+    'order_book_liquidity_1': 'Liquidity Trading Algos/Order_Book_Liquidity_Case_1.py',
+    'order_book_liquidity_2': 'Liquidity Trading Algos/Order_Book_Liquidity_Case_2.py',
+    'basic_mm': 'Market Making Algos/Basic_Market_Making.py',
+    'mm_case_1': 'Market Making Algos/Liquidity_Based_Market_Making_Case_1.py',
+    'mm_case_2': 'Market Making Algos/Liquidity_Based_Market_Making_Case_2.py',
+    'rebates': 'Market Making Algos/Rebates_Trading.py',
+    'news': 'News Trading Algo/news.py',
+    'oil_refining': 'Oil Processing Algos/Continuous_Oil_Refining.py',
+    'oil_pipeline': 'Oil Processing Algos/Oil_Pipeline_Arbitrage.py',
+}
+
+# this function imports a strategy script by name without running its main guard
+def load(name):
+    path = os.path.join(ROOT, STRATEGIES[name])
+    spec = importlib.util.spec_from_file_location(f'strategy_{name}', path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# this function runs a loaded strategy the way its own __main__ block does
+def run(module):
+    handler = getattr(module, 'signal_handler', None)
+    if handler is not None:
+        signal.signal(signal.SIGINT, handler)
+    if iscoroutinefunction(module.main):
+        import asyncio
+        return asyncio.run(module.main())
+    return module.main()
+
+def main():
+    parser = argparse.ArgumentParser(description='Start a strategy by name')
+    parser.add_argument('strategy', nargs='?', choices=list(STRATEGIES))
+    parser.add_argument('--check', action='store_true', help='import the strategy, print the time taken and exit')
+    parser.add_argument('--list', action='store_true', help='list the strategy names')
+    args = parser.parse_args()
+
+    if args.list or args.strategy is None:
+        for name, path in STRATEGIES.items():
+            print(f'{name:24} {path}')
+        return 0
+    start = time.perf_counter()
+    module = load(args.strategy)
+    if args.check:
+        print(f'{args.strategy} loaded in {(time.perf_counter() - start) * 1000:.1f} ms')
+        return 0
+    run(module)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
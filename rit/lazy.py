@@ -0,0 +1,21 @@
+import importlib
+
+# this class stands in for a module until one of its attributes is first used, and only then imports it
+# after that first use the module's names are copied onto the stand-in, so later lookups cost a plain attribute
+# read; rit.indicators and rit.analytics load numpy this way, so a strategy that never asks for an indicator
+# never pays for the import
+class LazyModule:
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name)
+        self.__dict__.update(vars(module))
+        return getattr(module, attr)
+
+    def __repr__(self):
+        return f'LazyModule({self._name!r})'
+
+def lazy_import(name):
+    return LazyModule(name)
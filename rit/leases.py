@@ -0,0 +1,89 @@
+import time
+from .api import API_KEY_ERROR, LEASES
+from .client import ApiException
+from .gateway import RATE_LIMIT_RETRIES, rate_limit_wait
+from .records import loads
+
+# this class tracks our lease IDs by ticker from the bodies RIT returns for lease calls
+# GET /leases is only sent when the registry has not been loaded yet or a response did not carry the lease,
+# so finding a refinery or storage ID costs no round-trip in the common case
+class LeaseRegistry:
+
+    def __init__(self, session):
+        self.session = session
+        self.ids = {}
+        self.dirty = True
+        self.syncs = 0
+
+    # this helper method sends one lease call, honouring the rate-limit wait RIT asks for
+    def call(self, method, path, params=None):
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            resp = self.session.request(method, path, params=params)
+            if resp.status_code == 401:
+                raise ApiException(API_KEY_ERROR)
+            body = loads(resp.content) if resp.content else None
+            wait = rate_limit_wait(body)
+            if wait is None or attempt == RATE_LIMIT_RETRIES:
+                return resp, body
+            time.sleep(wait)
+
+    def add(self, lease):
+        ids = self.ids.setdefault(lease['ticker'], [])
+        if lease['id'] not in ids:
+            ids.append(lease['id'])
+
+    # leases RIT opens on its own (e.g. the storage a pipeline delivers into) are picked up by the next sync
+    def invalidate(self):
+        self.dirty = True
+
+    def sync(self):
+        self.ids = {}
+        for lease in loads(self.session.get(LEASES).content):
+            self.add(lease)
+        self.dirty = False
+        self.syncs += 1
+        return self.ids
+
+    def leases(self, ticker):
+        if self.dirty:
+            self.sync()
+        return list(self.ids.get(ticker, ()))
+
+    def get(self, ticker):
+        ids = self.leases(ticker)
+        return ids[0] if ids else None
+
+    # this function leases a ticker (e.g. lease('CL-STORAGE', **{'from': 'CONTAINER'})) and records the new ID
+    def lease(self, ticker, **params):
+        params['ticker'] = ticker
+        resp, body = self.call('POST', LEASES, params)
+        if isinstance(body, dict) and 'id' in body:
+            self.add(body)
+            return body['id']
+        self.dirty = True
+        return None
+
+    # this function returns the ID of an existing lease for the ticker, leasing one when there is none
+    def ensure(self, ticker, **params):
+        lease_id = self.get(ticker)
+        return lease_id if lease_id is not None else self.lease(ticker, **params)
+
+    # this function runs a leased asset, e.g. use(refinery_id, from1='CL', quantity1=30)
+    def use(self, lease_id, **params):
+        resp, body = self.call('POST', f'{LEASES}/{lease_id}', params)
+        if resp.status_code != 200:
+            self.dirty = True
+        return body
+
+    def release_id(self, lease_id):
+        resp, body = self.call('DELETE', f'{LEASES}/{lease_id}')
+        for ids in self.ids.values():
+            if lease_id in ids:
+                ids.remove(lease_id)
+        if resp.status_code != 200:
+            self.dirty = True
+        return resp.status_code == 200
+
+    # this function ends every lease held on the ticker and returns the released IDs
+    def release(self, ticker):
+        return [lease_id for lease_id in self.leases(ticker) if self.release_id(lease_id)]
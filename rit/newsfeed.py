@@ -0,0 +1,129 @@
+import queue
+import threading
+from .api import get_news
+from .lazy import lazy_import
+from .records import News
+
+asyncio = lazy_import('asyncio')
+
+# this module reads /news forward from the last news_id it has seen, so no headline is lost between polls
+# a NewsFeed runs on its own thread (start) or asyncio task (run_async) and puts one event per new item on a
+# queue, oldest first; the trading loop takes events off the queue and never waits on the news request itself
+
+# RIT returns at most this many items per /news call, newest first
+PAGE = 20
+POLL_INTERVAL = 0.1
+
+# this class follows /news with a since-ID cursor; parse turns each item (a dict) into the event put on the
+# queue, and items it returns None for are skipped. The default event is a rit.records.News
+class NewsFeed:
+
+    def __init__(self, session=None, parse=News, since=0, page=PAGE, interval=POLL_INTERVAL, events=None):
+        self.session = session
+        self.parse = parse
+        self.last_id = since
+        self.page = page
+        self.interval = interval
+        self.events = queue.SimpleQueue() if events is None else events
+        self.items = 0
+        self.errors = 0
+        # the exception of the last failed poll, for callers checking why the feed went quiet
+        self.last_error = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    # news ids are consecutive, so a full page whose oldest item is still ahead of the cursor means more
+    # items arrived than fit in it: ask again with a bigger page until the page reaches back to the cursor
+    # an error body (a 429 while the case throttles us, say) is a dict rather than a list of items
+    def complete(self, items, limit):
+        if not isinstance(items, list):
+            raise ValueError(f'unexpected /news response: {items!r}')
+        return len(items) < limit or min(item['news_id'] for item in items) <= self.last_id + 1
+
+    def fetch(self):
+        limit = self.page
+        while True:
+            items = get_news(self.session, limit, self.last_id)
+            if self.complete(items, limit):
+                return items
+            limit *= 2
+
+    async def fetch_async(self, client):
+        limit = self.page
+        while True:
+            items = await client.get_news(limit, self.last_id)
+            if self.complete(items, limit):
+                return items
+            limit *= 2
+
+    # this function moves the cursor past the given items and queues their events oldest first
+    def accept(self, items):
+        events = []
+        for item in sorted(items, key=lambda item: item['news_id']):
+            if item['news_id'] <= self.last_id:
+                continue
+            self.last_id = item['news_id']
+            self.items += 1
+            event = self.parse(item) if self.parse is not None else item
+            if event is not None:
+                self.events.put_nowait(event)
+                events.append(event)
+        return events
+
+    # this function polls once and returns the new events (they are also on the queue)
+    def poll(self):
+        return self.accept(self.fetch())
+
+    async def poll_async(self, client):
+        return self.accept(await self.fetch_async(client))
+
+    # this helper method counts a failed poll; any error (a dropped connection, a 401 or 429 ApiException, a
+    # payload of an unexpected shape) is retried at the next interval instead of ending the feed
+    def failed(self, error):
+        self.errors += 1
+        self.last_error = error
+
+    # this helper method is the thread's loop
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                self.failed(e)
+            self.stopped.wait(self.interval)
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, name='rit-news', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    # this function follows the feed from an asyncio task until stop(); pass events=asyncio.Queue() to await them
+    async def run_async(self, client):
+        self.stopped.clear()
+        while not self.stopped.is_set():
+            try:
+                await self.poll_async(client)
+            except Exception as e:
+                self.failed(e)
+            await asyncio.sleep(self.interval)
+
+    # this function blocks until the next event, or returns None after timeout seconds
+    def next(self, timeout=None):
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,71 @@
+import time
+from .api import get_securities
+
+# positions older than this many seconds are re-read on the next get(); RIT updates them once per fill
+MAX_AGE = 0.5
+
+# this class keeps every ticker's position in memory from one GET /securities call
+# get() serves reads from memory and refreshes all tickers at once when the cache is older than max_age;
+# apply_fill() moves a position as soon as our own fill is known, and the next refresh overwrites it
+class PositionCache:
+
+    def __init__(self, session=None, max_age=MAX_AGE, time_fn=time.monotonic):
+        self.session = session
+        self.max_age = max_age
+        self.time = time_fn
+        self.positions = {}
+        self.securities = {}
+        self.updated = None
+        self.refreshes = 0
+
+    # this function loads a decoded /securities response into the cache
+    def update(self, securities):
+        for security in securities:
+            ticker = security['ticker']
+            self.securities[ticker] = security
+            self.positions[ticker] = security['position']
+        self.updated = self.time()
+        self.refreshes += 1
+        return self.positions
+
+    def refresh(self):
+        return self.update(get_securities(self.session))
+
+    async def refresh_async(self, client):
+        return self.update(await client.get_securities())
+
+    def stale(self):
+        return self.updated is None or self.time() - self.updated >= self.max_age
+
+    def get(self, ticker):
+        if self.session is not None and self.stale():
+            self.refresh()
+        return self.positions.get(ticker, 0)
+
+    def __getitem__(self, ticker):
+        return self.get(ticker)
+
+    def security(self, ticker):
+        if self.session is not None and self.stale():
+            self.refresh()
+        return self.securities.get(ticker)
+
+    # these helper methods sum positions across the cached tickers
+    def net(self):
+        return sum(self.positions.values())
+
+    def gross(self):
+        return sum(abs(position) for position in self.positions.values())
+
+    # this function applies one of our own fills without waiting for the next refresh
+    def apply_fill(self, ticker, action, quantity):
+        position = self.positions.get(ticker, 0)
+        self.positions[ticker] = position + quantity if action == 'BUY' else position - quantity
+        return self.positions[ticker]
+
+    # this function applies the filled part of an order record, e.g. the body returned for a MARKET order
+    def apply_order(self, order):
+        filled = order.get('quantity_filled') or 0
+        if filled:
+            self.apply_fill(order['ticker'], order['action'], filled)
+        return self.positions.get(order['ticker'], 0)
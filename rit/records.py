@@ -0,0 +1,146 @@
+import json
+
+# orjson decodes straight from the response bytes and is several times faster than the standard library
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    orjson = None
+    loads = json.loads
+
+# these classes are compact, slotted records for the RIT payloads the strategies read
+# each one copies only the fields the strategies use, once, at decode time; attribute access replaces
+# per-level dict hashing in the hot loops
+
+class BookLevel:
+    __slots__ = ('order_id', 'tick', 'trader_id', 'action', 'price', 'quantity', 'quantity_filled', 'remaining')
+
+    def __init__(self, d):
+        self.order_id = d['order_id']
+        self.tick = d['tick']
+        self.trader_id = d['trader_id']
+        self.action = d['action']
+        self.price = d['price']
+        self.quantity = quantity = d['quantity']
+        self.quantity_filled = filled = d['quantity_filled']
+        self.remaining = quantity - filled
+
+    def __repr__(self):
+        return f'BookLevel({self.action} {self.remaining}@{self.price} {self.trader_id})'
+
+class Order:
+    __slots__ = ('order_id', 'period', 'tick', 'trader_id', 'ticker', 'type', 'quantity', 'action',
+                 'price', 'quantity_filled', 'vwap', 'status')
+
+    def __init__(self, d):
+        self.order_id = d['order_id']
+        self.period = d.get('period')
+        self.tick = d['tick']
+        self.trader_id = d.get('trader_id')
+        self.ticker = d['ticker']
+        self.type = d['type']
+        self.quantity = d['quantity']
+        self.action = d['action']
+        self.price = d.get('price')
+        self.quantity_filled = d['quantity_filled']
+        self.vwap = d.get('vwap')
+        self.status = d['status']
+
+    @property
+    def remaining(self):
+        return self.quantity - self.quantity_filled
+
+    def __repr__(self):
+        return f'Order({self.order_id} {self.ticker} {self.action} {self.quantity}@{self.price} {self.status})'
+
+class Security:
+    __slots__ = ('ticker', 'type', 'position', 'last', 'bid', 'bid_size', 'ask', 'ask_size', 'volume',
+                 'vwap', 'realized', 'unrealized')
+
+    def __init__(self, d):
+        self.ticker = d['ticker']
+        self.type = d.get('type')
+        self.position = d['position']
+        self.last = d.get('last')
+        self.bid = d.get('bid')
+        self.bid_size = d.get('bid_size')
+        self.ask = d.get('ask')
+        self.ask_size = d.get('ask_size')
+        self.volume = d.get('volume')
+        self.vwap = d.get('vwap')
+        self.realized = d.get('realized')
+        self.unrealized = d.get('unrealized')
+
+    def __repr__(self):
+        return f'Security({self.ticker} position={self.position} last={self.last})'
+
+class Tender:
+    __slots__ = ('tender_id', 'period', 'tick', 'expires', 'caption', 'quantity', 'action', 'is_fixed_bid',
+                 'price', 'ticker')
+
+    def __init__(self, d):
+        self.tender_id = d['tender_id']
+        self.period = d.get('period')
+        self.tick = d['tick']
+        self.expires = d.get('expires')
+        self.caption = d.get('caption', '')
+        self.quantity = d['quantity']
+        self.action = d['action']
+        self.is_fixed_bid = d.get('is_fixed_bid', True)
+        self.price = d.get('price')
+        self.ticker = d.get('ticker')
+
+    def __repr__(self):
+        return f'Tender({self.tender_id} {self.action} {self.quantity} {self.ticker}@{self.price})'
+
+class News:
+    __slots__ = ('news_id', 'period', 'tick', 'ticker', 'headline', 'body')
+
+    def __init__(self, d):
+        self.news_id = d['news_id']
+        self.period = d.get('period')
+        self.tick = d['tick']
+        self.ticker = d.get('ticker', '')
+        self.headline = d['headline']
+        self.body = d.get('body', '')
+
+    def __repr__(self):
+        return f'News({self.news_id} tick={self.tick} {self.headline!r})'
+
+class Lease:
+    __slots__ = ('id', 'ticker', 'type', 'start_lease_period', 'start_lease_tick', 'next_lease_period',
+                 'next_lease_tick', 'containment_usage')
+
+    def __init__(self, d):
+        self.id = d['id']
+        self.ticker = d['ticker']
+        self.type = d.get('type')
+        self.start_lease_period = d.get('start_lease_period')
+        self.start_lease_tick = d.get('start_lease_tick')
+        self.next_lease_period = d.get('next_lease_period')
+        self.next_lease_tick = d.get('next_lease_tick')
+        self.containment_usage = d.get('containment_usage')
+
+    def __repr__(self):
+        return f'Lease({self.id} {self.ticker})'
+
+# these functions decode a raw response body (bytes or str) straight into records
+
+def decode_book(raw):
+    book = loads(raw)
+    return [BookLevel(d) for d in book['bids']], [BookLevel(d) for d in book['asks']]
+
+def decode_orders(raw):
+    return [Order(d) for d in loads(raw)]
+
+def decode_securities(raw):
+    return [Security(d) for d in loads(raw)]
+
+def decode_tenders(raw):
+    return [Tender(d) for d in loads(raw)]
+
+def decode_news(raw):
+    return [News(d) for d in loads(raw)]
+
+def decode_leases(raw):
+    return [Lease(d) for d in loads(raw)]
@@ -0,0 +1,264 @@
+import bisect
+import json
+import threading
+from urllib.parse import parse_qsl
+from .aio import AsyncRITClient
+from .capture import SessionLog, request_key
+from .client import RITClient
+from .records import loads
+
+# this module replays a recorded session log (rit.capture) through the strategy code, offline and faster than
+# real time. A simulated clock stands in for the wall clock: each request advances it by request_latency and each
+# sleep by its duration. GET requests are answered with the latest response recorded for the same request at or
+# before the simulated tick. Orders and cancels never reach a server; they are kept as the replay's decisions and
+# against the replay's own order list. The same log and the same strategy therefore give the same decisions
+
+TICK_LENGTH = 1.0
+REQUEST_LATENCY = 0.001
+
+# this exception ends a replay once the simulated clock passes the last recorded tick
+class ReplayFinished(Exception):
+    pass
+
+# this class is the simulated clock; pass clock.time / clock.sleep to TickClock and PositionCache
+class SimClock:
+
+    def __init__(self, start_tick=0, tick_length=TICK_LENGTH):
+        self.tick_length = tick_length
+        self.now = start_tick * tick_length
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.now += seconds
+
+    def tick(self):
+        return int(self.now // self.tick_length + 1e-9)
+
+    def set_tick(self, tick):
+        self.now = max(self.now, tick * self.tick_length)
+
+# this class indexes a session log by request key so each lookup is a bisect over that request's recorded ticks
+class ReplayStore:
+
+    def __init__(self, entries):
+        self.responses = {}
+        self.by_ticker = {}
+        self.first_tick = None
+        self.last_tick = None
+        for entry in entries:
+            if entry.method != 'GET' or entry.status != 200:
+                continue
+            body = bytes(entry.body)
+            self.add(self.responses, entry.key, entry.tick, body)
+            ticker = dict(parse_qsl(entry.key.partition('?')[2])).get('ticker')
+            self.add(self.by_ticker, (entry.path, ticker), entry.tick, body)
+            if self.first_tick is None or entry.tick < self.first_tick:
+                self.first_tick = entry.tick
+            if self.last_tick is None or entry.tick > self.last_tick:
+                self.last_tick = entry.tick
+
+    @staticmethod
+    def add(index, key, tick, body):
+        ticks, bodies = index.setdefault(key, ([], []))
+        position = bisect.bisect_right(ticks, tick)
+        ticks.insert(position, tick)
+        bodies.insert(position, body)
+
+    @classmethod
+    def load(cls, path):
+        with SessionLog(path) as log:
+            return cls(log)
+
+    # this function returns the body recorded for the request at or before tick, trying the same path and
+    # ticker with any other query when the exact request was not recorded by then; None when neither was
+    def lookup(self, path, params, tick):
+        found = self.find(self.responses, request_key(path, params), tick)
+        if found is None:
+            found = self.find(self.by_ticker, (path, (params or {}).get('ticker')), tick)
+        return found
+
+    @staticmethod
+    def find(index, key, tick):
+        recorded = index.get(key)
+        if recorded is None:
+            return None
+        ticks, bodies = recorded
+        position = bisect.bisect_right(ticks, tick)
+        # nothing recorded yet at this tick: a later response would leak the future into the replay
+        return bodies[position - 1] if position else None
+
+# this class is the response object the replay clients return, with the parts of requests.Response the code reads
+class ReplayResponse:
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def json(self):
+        return loads(self.content)
+
+# this class holds the replay state shared by the sync and async clients: clock, store, own orders and decisions
+class Replay:
+
+    def __init__(self, store, clock=None, request_latency=REQUEST_LATENCY):
+        self.store = store
+        self.clock = clock or SimClock(store.first_tick or 0)
+        self.request_latency = request_latency
+        self.orders = {}
+        self.next_order_id = 1
+        self.decisions = []
+        self.fills = []
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    # requests from gateway threads are answered one at a time; run gateways with max_workers=1 during a replay
+    # so order ids, and therefore the decisions, come out in the same order every run
+    def answer(self, method, path, params):
+        with self.lock:
+            return self.respond(method, path, params)
+
+    def respond(self, method, path, params):
+        self.requests += 1
+        self.clock.sleep(self.request_latency)
+        tick = self.clock.tick()
+        if tick > self.store.last_tick:
+            raise ReplayFinished(tick)
+        params = dict(params or {})
+        if method == 'GET':
+            return self.read(path, params, tick)
+        self.decisions.append((tick, method, request_key(path, params)))
+        return 200, json.dumps(self.act(method, path, params, tick)).encode()
+
+    def read(self, path, params, tick):
+        if path == '/orders':
+            status = params.get('status', 'OPEN')
+            return 200, json.dumps([o for o in self.orders.values() if o['status'] == status]).encode()
+        body = self.store.lookup(path, params, tick)
+        if path == '/case':
+            case = loads(body) if body is not None else {'period': 1, 'status': 'ACTIVE'}
+            case['tick'] = tick
+            return 200, json.dumps(case).encode()
+        if body is None:
+            return 404, json.dumps({'code': 'NOT_RECORDED', 'message': f'{request_key(path, params)} was not recorded'}).encode()
+        return 200, body
+
+    def act(self, method, path, params, tick):
+        if path == '/orders' and method == 'POST':
+            order_id = self.next_order_id
+            self.next_order_id += 1
+            market = params.get('type') == 'MARKET'
+            quantity = float(params.get('quantity', 0))
+            vwap = self.fill(params.get('ticker'), params.get('action'), quantity, tick) if market else None
+            order = self.orders[order_id] = {
+                'order_id': order_id, 'period': 1, 'tick': tick, 'trader_id': 'replay', 'ticker': params.get('ticker'),
+                'type': params.get('type'), 'quantity': quantity, 'action': params.get('action'),
+                'price': float(params['price']) if 'price' in params else None,
+                'quantity_filled': quantity if market else 0, 'vwap': vwap,
+                'status': 'TRANSACTED' if market else 'OPEN'}
+            return order
+        if path.startswith('/orders/') and method == 'DELETE':
+            order = self.orders.get(int(path.rsplit('/', 1)[1]))
+            if order is not None and order['status'] == 'OPEN':
+                order['status'] = 'CANCELLED'
+            return {'success': order is not None}
+        if path == '/commands/cancel':
+            open_orders = [o for o in self.orders.values() if o['status'] == 'OPEN']
+            if str(params.get('all')) == '1':
+                selected = open_orders
+            elif params.get('ticker'):
+                selected = [o for o in open_orders if o['ticker'] == params['ticker']]
+            else:
+                ids = params.get('ids', '')
+                wanted = {int(i) for i in (ids if isinstance(ids, (list, tuple)) else str(ids).split(',')) if str(i)}
+                selected = [o for o in open_orders if o['order_id'] in wanted]
+            for order in selected:
+                order['status'] = 'CANCELLED'
+            return {'cancelled_order_ids': [o['order_id'] for o in selected]}
+        return {'success': True}
+
+    # this function returns the recorded (bid, ask) of a ticker at or before tick, or None
+    def quote(self, ticker, tick):
+        body = self.store.find(self.store.responses, request_key('/securities', {'ticker': ticker}), tick)
+        if body is not None:
+            security = loads(body)[0]
+        else:
+            body = self.store.find(self.store.responses, '/securities', tick)
+            security = next((x for x in loads(body) if x['ticker'] == ticker), None) if body is not None else None
+        return None if security is None else (security['bid'], security['ask'])
+
+    # market orders fill in full at the recorded top of book: buys at the ask, sells at the bid
+    # limit orders never fill; they stay open until cancelled
+    def fill(self, ticker, action, quantity, tick):
+        quote = self.quote(ticker, tick)
+        if quote is None:
+            return None
+        price = quote[1] if action == 'BUY' else quote[0]
+        self.fills.append((tick, ticker, quantity if action == 'BUY' else -quantity, price))
+        return price
+
+# this class is a RITClient that answers from a Replay instead of the network, so every rit.api helper works
+class ReplayClient(RITClient):
+
+    def __init__(self, replay):
+        super().__init__()
+        self.replay = replay
+        self.recorder = None
+
+    def request(self, method, url, *args, **kwargs):
+        status, body = self.replay.answer(method.upper(), url.split('?', 1)[0], kwargs.get('params'))
+        return ReplayResponse(status, body)
+
+# this class is the AsyncRITClient counterpart of ReplayClient
+class AsyncReplayClient(AsyncRITClient):
+
+    def __init__(self, replay):
+        super().__init__()
+        self.replay = replay
+        self.recorder = None
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def request_raw(self, method, path, params=None):
+        return self.replay.answer(method.upper(), path, params)[1]
+
+# this function runs step(client, tick) once per recorded tick and returns the replay and the step results
+# the replay's decisions list holds every order and cancel the strategy sent, stamped with its tick
+# pass a Replay to patch its clock into a strategy first, e.g. module.sleep = session.clock.sleep
+def replay(store, step, session=None, request_latency=REQUEST_LATENCY):
+    session = session or Replay(store, request_latency=request_latency)
+    client = ReplayClient(session)
+    results = []
+    for tick in range(store.first_tick, store.last_tick + 1):
+        session.clock.set_tick(tick)
+        try:
+            results.append((tick, step(client, tick)))
+        except ReplayFinished:
+            break
+    return session, results
+
+async def replay_async(store, step, session=None, request_latency=REQUEST_LATENCY):
+    session = session or Replay(store, request_latency=request_latency)
+    client = AsyncReplayClient(session)
+    results = []
+    for tick in range(store.first_tick, store.last_tick + 1):
+        session.clock.set_tick(tick)
+        try:
+            results.append((tick, await step(client, tick)))
+        except ReplayFinished:
+            break
+    return session, results
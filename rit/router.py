@@ -0,0 +1,175 @@
+import heapq
+from .api import order_params
+from .book import order_book
+
+# this module routes orders across the venues a security trades on, CRZY_A and CRZY_M for CRZY
+# a parent order is split level by level over the merged cached books of every venue, best all-in price first:
+# each level is priced net of its venue's fee, so a cheaper quote on the venue that charges more can lose to a
+# slightly worse one on the venue that credits. One pass over the shared rit.OrderBooks gives the child orders,
+# ready for rit.OrderGateway; nothing is requested from the server
+
+# cash per share added to each trade on a venue: the primary market (_M) charges 2 cents a share, the
+# alternate (_A) credits half a cent
+PRIMARY_MKT_FEE = -0.02
+ALT_MKT_FEE = 0.005
+VENUE_FEES = {'_M': PRIMARY_MKT_FEE, '_A': ALT_MKT_FEE}
+
+# largest child order sent to one venue
+ORDER_SIZE = 2000
+
+# this function returns the security a venue ticker trades, e.g. CRZY for CRZY_A
+def underlying(ticker):
+    for suffix in VENUE_FEES:
+        if ticker.endswith(suffix):
+            return ticker[:-len(suffix)]
+    return ticker
+
+# this function returns (venue ticker, fee) for every venue of a security
+def venues(ticker, fees=VENUE_FEES):
+    base = underlying(ticker)
+    return [(base + suffix, fee) for suffix, fee in fees.items()]
+
+# this helper method yields the (net price, volume, venue, price) levels of one side of a venue's book, best first
+# net is what a share really earns (selling into bids) or costs (buying from asks) after the venue's fee
+def net_levels(book, action, fee):
+    side = book.side(action)
+    if action == 'BUY':
+        return ((price + fee, volume, book.ticker, price) for price, volume in zip(reversed(side.prices), reversed(side.volumes)))
+    return ((price - fee, volume, book.ticker, price) for price, volume in zip(side.prices, side.volumes))
+
+# this helper method merges one side of several venues' books into a single stream of levels, best net price first
+def merged_levels(books, action, fees):
+    sides = [net_levels(book, action, fee) for book, fee in zip(books, fees)]
+    if action == 'BUY':
+        return heapq.merge(*sides, key=lambda level: -level[0])
+    return heapq.merge(*sides, key=lambda level: level[0])
+
+# this helper method returns one side's levels best net price first: books is either a list of venue OrderBooks,
+# merged here with fees in the same order, or a rit.consolidated.ConsolidatedBook, whose levels are merged already
+def side_levels(books, action, fees):
+    if hasattr(books, 'levels'):
+        return books.levels(action)
+    return merged_levels(books, action, fees)
+
+# this function walks the merged levels of several venues, best net price first, for quantity shares
+# it returns (shares filled, net cash of the fills, net price of the last level, {venue: (shares, worst price)});
+# action is the book side walked: 'BUY' sells into the bids, 'SELL' buys from the asks. With max_slippage the walk
+# stops at the first level priced further than that from the first level walked, and with limit at the first
+# level whose net price is worse than it
+def walk(books, action, quantity, fees, max_slippage=None, limit=None):
+    filled = 0
+    cash = 0.0
+    last = None
+    touch = None
+    legs = {}
+    for net, volume, venue, price in side_levels(books, action, fees):
+        if filled >= quantity:
+            break
+        if limit is not None and (net < limit - 1e-9 if action == 'BUY' else net > limit + 1e-9):
+            break
+        if touch is None:
+            touch = price
+        elif max_slippage is not None and abs(price - touch) > max_slippage + 1e-9:
+            break
+        take = min(volume, quantity - filled)
+        filled += take
+        cash += take * net
+        last = net
+        legs[venue] = (legs.get(venue, (0, price))[0] + take, price)
+    return filled, cash, last, legs
+
+# this function turns walked legs into order intents for rit.OrderGateway: each venue's share of the walk in child
+# orders of at most order_size; LIMIT children are priced at the worst level walked on their venue
+def leg_orders(legs, action, order_size=ORDER_SIZE, order_type='LIMIT'):
+    intents = []
+    for venue, (shares, price) in legs.items():
+        while shares > 0:
+            size = min(shares, order_size)
+            intents.append(order_params(venue, order_type, size, action, price if order_type == 'LIMIT' else None))
+            shares -= size
+    return intents
+
+# this class is the router's answer for one parent order
+# price is the average all-in price per share of what the books can fill, fees included; orders are the child
+# order intents, legs maps each venue to (shares, worst price) as walked and last is the all-in price of the last
+# level walked
+class Route:
+    __slots__ = ('ticker', 'action', 'quantity', 'filled', 'cash', 'last', 'legs', 'orders')
+
+    def __init__(self, ticker, action, quantity, filled, cash, last, legs, orders):
+        self.ticker = ticker
+        self.action = action
+        self.quantity = quantity
+        self.filled = filled
+        self.cash = cash
+        self.last = last
+        self.legs = legs
+        self.orders = orders
+
+    @property
+    def price(self):
+        return self.cash / self.filled if self.filled else None
+
+    @property
+    def unfilled(self):
+        return self.quantity - self.filled
+
+    def __repr__(self):
+        price = f'{self.price:.4f}' if self.filled else None
+        legs = ' '.join(f'{venue}:{shares}@{worst}' for venue, (shares, worst) in self.legs.items())
+        return f'Route({self.action} {self.filled}/{self.quantity} {self.ticker} all-in {price} [{legs}])'
+
+# this function routes a parent order (action 'BUY' or 'SELL' on the security) over the cached books of its venues
+# books, in venues() order, default to the shared rit.order_book of each venue, refreshed by the caller; a
+# ConsolidatedBook can be passed instead and is walked with its own fees.
+# limit_price caps the all-in price per share and max_slippage the distance from the touch; what the books cannot
+# fill within them is left unrouted. MARKET children carry no price
+def route(ticker, action, quantity, books=None, fees=VENUE_FEES, limit_price=None, max_slippage=None,
+          order_type='LIMIT', order_size=ORDER_SIZE):
+    pairs = venues(ticker, fees)
+    if books is None:
+        books = [order_book(venue) for venue, fee in pairs]
+    # a buy is filled from the asks, a sell from the bids
+    side = 'SELL' if action == 'BUY' else 'BUY'
+    filled, cash, last, legs = walk(books, side, quantity, [fee for venue, fee in pairs], max_slippage, limit_price)
+    return Route(underlying(ticker), action, quantity, filled, cash, last, legs, leg_orders(legs, action, order_size, order_type))
+
+# this function matches a crossed market across venues in one pass: the merged net bids and net asks are walked
+# together while the best net bid still clears the best net ask by more than threshold
+# books and fees are as in walk, a ConsolidatedBook needing no fees. It returns (shares, expected profit, buy legs,
+# sell legs), legs as in walk; fraction takes that share of each matched level and quantity caps the shares matched
+def cross(books, fees=None, threshold=0.0, fraction=1.0, quantity=None):
+    bids = side_levels(books, 'BUY', fees)
+    asks = side_levels(books, 'SELL', fees)
+    bid = next(bids, None)
+    ask = next(asks, None)
+    bid_left = bid[1] if bid else 0
+    ask_left = ask[1] if ask else 0
+    shares = 0
+    profit = 0.0
+    buys = {}
+    sells = {}
+    while bid is not None and ask is not None and bid[0] - ask[0] > threshold + 1e-9:
+        if quantity is not None and shares >= quantity:
+            break
+        # both best levels on one venue only happens with a negative threshold; there is nothing to arbitrage
+        if bid[2] == ask[2]:
+            break
+        matched = min(bid_left, ask_left)
+        take = int(matched * fraction)
+        if quantity is not None:
+            take = min(take, quantity - shares)
+        if take > 0:
+            shares += take
+            profit += take * (bid[0] - ask[0])
+            buys[ask[2]] = (buys.get(ask[2], (0, ask[3]))[0] + take, ask[3])
+            sells[bid[2]] = (sells.get(bid[2], (0, bid[3]))[0] + take, bid[3])
+        bid_left -= matched
+        ask_left -= matched
+        if not bid_left:
+            bid = next(bids, None)
+            bid_left = bid[1] if bid else 0
+        if not ask_left:
+            ask = next(asks, None)
+            ask_left = ask[1] if ask else 0
+    return shares, profit, buys, sells
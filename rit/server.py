@@ -0,0 +1,636 @@
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from .client import API_KEY
+
+# a local stand-in for the RIT client's REST API, for running and benchmarking the strategies offline
+# run it with `python -m rit.server --seed 7 --latency 0.002`; the strategies connect to it unchanged
+# on localhost:9999. Market dynamics are a seeded random walk per security, so the same seed and the same
+# requests replay the same case; news, shocks and tenders can be scripted in a JSON scenario file
+
+HOST = '127.0.0.1'
+PORT = 9999
+TRADER_ID = 'trader'
+
+# one tick per second like the RIT client; tick_length=0 freezes the clock so callers step it with advance()
+TICK_LENGTH = 1.0
+TICKS_PER_PERIOD = 600
+START_TICK = 1
+
+# ANON order IDs start here so they never collide with our own orders
+ANON_ORDER_ID = 1_000_000
+
+# orders per second before the stand-in answers 429, like the case's order rate limit; 0 disables it
+ORDER_RATE_LIMIT = 0
+
+DEFAULT_SCENARIO = {
+    'name': 'RIT stand-in case',
+    'securities': [
+        {'ticker': 'ALGO', 'price': 10.00, 'volatility': 0.02, 'spread': 0.02, 'depth': 40, 'size': 1000},
+        {'ticker': 'CNR', 'price': 25.00, 'volatility': 0.03, 'spread': 0.02, 'depth': 40, 'size': 1000},
+        {'ticker': 'RY', 'price': 50.00, 'volatility': 0.05, 'spread': 0.02, 'depth': 40, 'size': 1000},
+        {'ticker': 'AC', 'price': 15.00, 'volatility': 0.02, 'spread': 0.02, 'depth': 40, 'size': 1000},
+        {'ticker': 'BBSN', 'price': 40.00, 'volatility': 0.08, 'spread': 0.05, 'depth': 40, 'size': 5000},
+        {'ticker': 'CRZY', 'price': 25.00, 'volatility': 0.06, 'spread': 0.04, 'depth': 40, 'size': 5000},
+        {'ticker': 'TAME', 'price': 25.00, 'volatility': 0.02, 'spread': 0.02, 'depth': 40, 'size': 5000},
+        {'ticker': 'CRZY_M', 'price': 10.00, 'volatility': 0.03, 'spread': 0.02, 'depth': 40, 'size': 2000},
+        {'ticker': 'CRZY_A', 'price': 10.00, 'volatility': 0.03, 'spread': 0.02, 'depth': 40, 'size': 2000, 'follows': 'CRZY_M'},
+        {'ticker': 'TAME_M', 'price': 25.00, 'volatility': 0.02, 'spread': 0.02, 'depth': 40, 'size': 2000},
+        {'ticker': 'TAME_A', 'price': 25.00, 'volatility': 0.02, 'spread': 0.02, 'depth': 40, 'size': 2000, 'follows': 'TAME_M'},
+        {'ticker': 'CL', 'price': 50.00, 'volatility': 0.05, 'spread': 0.02, 'depth': 20, 'size': 50},
+        {'ticker': 'CL-1F', 'price': 51.00, 'volatility': 0.05, 'spread': 0.02, 'depth': 20, 'size': 50, 'follows': 'CL'},
+        {'ticker': 'CL-2F', 'price': 52.00, 'volatility': 0.05, 'spread': 0.02, 'depth': 20, 'size': 50, 'follows': 'CL'},
+        {'ticker': 'CL-AK', 'price': 47.00, 'volatility': 0.05, 'spread': 0.02, 'depth': 20, 'size': 50},
+        {'ticker': 'CL-NYC', 'price': 53.00, 'volatility': 0.05, 'spread': 0.02, 'depth': 20, 'size': 50},
+        {'ticker': 'HO', 'price': 2.00, 'volatility': 0.01, 'spread': 0.01, 'depth': 20, 'size': 50},
+        {'ticker': 'RB', 'price': 1.80, 'volatility': 0.01, 'spread': 0.01, 'depth': 20, 'size': 50},
+    ],
+    # lease_price per lease; 'convert' maps one unit of each input to its outputs when the asset is used
+    'assets': [
+        {'ticker': 'CL-STORAGE', 'type': 'CONTAINER', 'lease_price': 100.0},
+        {'ticker': 'NYC-STORAGE', 'type': 'CONTAINER', 'lease_price': 100.0},
+        {'ticker': 'AK-STORAGE', 'type': 'CONTAINER', 'lease_price': 100.0},
+        {'ticker': 'CL-REFINERY', 'type': 'REFINERY', 'lease_price': 5000.0,
+         'convert': {'CL': {'HO': 2 / 3, 'RB': 1 / 3}}},
+        {'ticker': 'CS-NYC-PIPE', 'type': 'PIPELINE', 'lease_price': 4000.0,
+         'convert': {'CL': {'CL-NYC': 1}}, 'storage': 'NYC-STORAGE'},
+        {'ticker': 'AK-CS-PIPE', 'type': 'PIPELINE', 'lease_price': 4000.0,
+         'convert': {'CL-AK': {'CL': 1}}, 'storage': 'CL-STORAGE'},
+    ],
+    # scripted news: 'shock' moves the named securities by that amount when the item is released
+    'news': [
+        {'tick': 0, 'headline': 'Welcome to the Commodities Trading 5 Case', 'body': ''},
+        {'tick': 30, 'headline': 'WEEK 1 EIA REPORT: BUILD 5 MILLION BARRELS, FORECAST WAS BUILD 3 MILLION BARRELS',
+         'body': '', 'shock': {'CL': -0.20, 'CL-1F': -0.20, 'CL-2F': -0.20}},
+        {'tick': 90, 'headline': 'WEEK 2 EIA REPORT: DRAW 4 MILLION BARRELS, FORECAST WAS BUILD 2 MILLION BARRELS',
+         'body': '', 'shock': {'CL': 0.60, 'CL-1F': 0.60, 'CL-2F': 0.60}},
+    ],
+    # scripted tenders, open from 'tick' for 'duration' ticks; they are issued on the primary venue of a
+    # dual-listed security, so an accepted tender leaves a position the _M/_A books can unwind
+    'tenders': [
+        {'tick': 20, 'duration': 30, 'ticker': 'CRZY_M', 'action': 'BUY', 'quantity': 50000, 'price': 9.60,
+         'caption': 'An institutional client is offering to SELL you 50000 shares of CRZY'},
+        {'tick': 60, 'duration': 30, 'ticker': 'TAME_M', 'action': 'SELL', 'quantity': 40000, 'price': 25.40,
+         'caption': 'An institutional client is offering to BUY 40000 shares of TAME from you'},
+    ],
+}
+
+# this function rounds a price to the cent, the tick size of every RIT security
+def cents(price):
+    return round(max(price, 0.01), 2)
+
+# this class is one security: its price path, our position and its average cost
+class Instrument:
+
+    def __init__(self, spec):
+        self.ticker = spec['ticker']
+        self.type = spec.get('type', 'STOCK')
+        self.start = spec['price']
+        self.volatility = spec.get('volatility', 0.02)
+        self.spread = spec.get('spread', 0.02)
+        self.depth = spec.get('depth', 40)
+        self.size = spec.get('size', 1000)
+        self.follows = spec.get('follows')
+        self.trading_fee = spec.get('trading_fee', 0.02)
+        self.limit_order_rebate = spec.get('limit_order_rebate', 0.01)
+        self.price = self.start
+        self.history = []
+        self.position = 0
+        self.cost = 0.0
+        self.realized = 0.0
+        self.volume = 0
+
+    def fill(self, action, quantity, price, fee):
+        signed = quantity if action == 'BUY' else -quantity
+        position = self.position
+        if position == 0 or (position > 0) == (signed > 0):
+            self.cost += signed * price
+        else:
+            closed = min(abs(signed), abs(position))
+            average = self.cost / position
+            self.realized += closed * (price - average) * (1 if position > 0 else -1)
+            self.cost -= math.copysign(closed, position) * average
+            if abs(signed) > abs(position):
+                self.cost = (signed + position) * price
+        self.position = position + signed
+        if self.position == 0:
+            self.cost = 0.0
+        self.realized -= fee * quantity
+        self.volume += quantity
+
+    def vwap(self):
+        return self.cost / self.position if self.position else 0.0
+
+# this class is the case state behind the stand-in server: clock, prices, books, orders, tenders, news and leases
+# it has no HTTP in it, so benchmarks and replays can drive it directly
+class Market:
+
+    def __init__(self, scenario=None, seed=0, tick_length=TICK_LENGTH, ticks_per_period=TICKS_PER_PERIOD,
+                 start_tick=START_TICK, order_rate_limit=ORDER_RATE_LIMIT, time_fn=time.monotonic):
+        scenario = scenario or DEFAULT_SCENARIO
+        self.name = scenario.get('name', DEFAULT_SCENARIO['name'])
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tick_length = tick_length
+        self.ticks_per_period = ticks_per_period
+        self.time = time_fn
+        self.started = self.time()
+        self.start_tick = start_tick
+        self.tick = start_tick
+        self.lock = threading.RLock()
+
+        self.instruments = {spec['ticker']: Instrument(spec) for spec in scenario.get('securities', [])}
+        self.assets = {spec['ticker']: dict(spec) for spec in scenario.get('assets', [])}
+        self.scripted_news = sorted(scenario.get('news', []), key=lambda n: n['tick'])
+        self.scripted_tenders = sorted(scenario.get('tenders', []), key=lambda t: t['tick'])
+
+        self.orders = {}
+        self.next_order_id = 1
+        self.news = []
+        self.tenders = {}
+        self.next_tender_id = 1
+        self.leases = {}
+        self.next_lease_id = 1
+        self.books = {}
+        self.order_rate_limit = order_rate_limit
+        self.order_times = []
+
+        for instrument in self.instruments.values():
+            instrument.history.append(self.candle(instrument.start, instrument.start, 0))
+        self.release_scripted(0, start_tick)
+
+    def wall_tick(self):
+        if not self.tick_length:
+            return self.tick
+        return min(self.start_tick + int((self.time() - self.started) / self.tick_length), self.ticks_per_period)
+
+    # this function brings the case up to the current tick, simulating every tick in between in order
+    def sync(self):
+        target = self.wall_tick()
+        while self.tick < target:
+            self.step()
+
+    def advance(self, ticks=1):
+        with self.lock:
+            for _ in range(ticks):
+                if self.tick >= self.ticks_per_period:
+                    break
+                self.step()
+            return self.tick
+
+    def status(self):
+        return 'ACTIVE' if self.tick < self.ticks_per_period else 'STOPPED'
+
+    def step(self):
+        tick = self.tick + 1
+        moves = {}
+        for ticker, instrument in self.instruments.items():
+            previous = instrument.price
+            if instrument.follows in moves:
+                move = moves[instrument.follows] + self.rng.gauss(0, instrument.volatility / 4)
+            else:
+                move = self.rng.gauss(0, instrument.volatility)
+            moves[ticker] = move
+            instrument.price = cents(previous + move)
+            instrument.history.append(self.candle(previous, instrument.price, tick))
+        self.tick = tick
+        self.books.clear()
+        self.release_scripted(tick, tick)
+        self.fill_resting()
+
+    def candle(self, open_price, close_price, tick):
+        wick = abs(close_price - open_price) / 2
+        return {'tick': tick, 'open': cents(open_price), 'high': cents(max(open_price, close_price) + wick),
+                'low': cents(min(open_price, close_price) - wick), 'close': cents(close_price)}
+
+    def release_scripted(self, first, last):
+        for item in self.scripted_news:
+            if first <= item['tick'] <= last:
+                self.news.append({'news_id': len(self.news) + 1, 'period': 1, 'tick': item['tick'],
+                                  'ticker': item.get('ticker', ''), 'headline': item['headline'],
+                                  'body': item.get('body', '')})
+                for ticker, shock in item.get('shock', {}).items():
+                    if ticker in self.instruments:
+                        self.instruments[ticker].price = cents(self.instruments[ticker].price + shock)
+        for item in self.scripted_tenders:
+            if first <= item['tick'] <= last:
+                tender_id = self.next_tender_id
+                self.next_tender_id += 1
+                self.tenders[tender_id] = {
+                    'tender_id': tender_id, 'period': 1, 'tick': item['tick'],
+                    'expires': item['tick'] + item.get('duration', 30), 'caption': item.get('caption', ''),
+                    'quantity': item['quantity'], 'action': item['action'], 'is_fixed_bid': True,
+                    'price': item['price'], 'ticker': item['ticker']}
+        for tender_id, tender in list(self.tenders.items()):
+            if tender['expires'] < last:
+                del self.tenders[tender_id]
+
+    def best(self, instrument):
+        half = instrument.spread / 2
+        return cents(instrument.price - half), cents(instrument.price + half)
+
+    # this function builds the ANON side of a book for the current tick; the same seed gives the same book
+    def anon_book(self, instrument):
+        book = self.books.get(instrument.ticker)
+        if book is not None:
+            return book
+        rng = random.Random(f'{self.seed}:{self.tick}:{instrument.ticker}')
+        bid, ask = self.best(instrument)
+        bids, asks = [], []
+        order_id = ANON_ORDER_ID + self.tick * 10_000
+        for level in range(instrument.depth):
+            for side, price in ((bids, cents(bid - level * 0.01)), (asks, cents(ask + level * 0.01))):
+                quantity = rng.randint(1, 10) * instrument.size // 10 or 1
+                side.append({'order_id': order_id, 'period': 1, 'tick': self.tick, 'trader_id': 'ANON',
+                             'ticker': instrument.ticker, 'type': 'LIMIT', 'quantity': quantity,
+                             'action': 'BUY' if side is bids else 'SELL', 'price': price,
+                             'quantity_filled': 0, 'vwap': None, 'status': 'OPEN'})
+                order_id += 1
+        book = self.books[instrument.ticker] = (bids, asks)
+        return book
+
+    def book(self, ticker, limit=None):
+        instrument = self.instruments[ticker]
+        bids, asks = self.anon_book(instrument)
+        own = [order for order in self.orders.values() if order['ticker'] == ticker and order['status'] == 'OPEN']
+        bids = sorted(bids + [o for o in own if o['action'] == 'BUY'], key=lambda o: (-o['price'], o['tick']))
+        asks = sorted(asks + [o for o in own if o['action'] == 'SELL'], key=lambda o: (o['price'], o['tick']))
+        if limit:
+            bids, asks = bids[:limit], asks[:limit]
+        return {'bids': bids, 'asks': asks}
+
+    def execute(self, order, price, liquidity):
+        instrument = self.instruments[order['ticker']]
+        quantity = order['quantity'] - order['quantity_filled']
+        fee = instrument.trading_fee if liquidity == 'TAKE' else -instrument.limit_order_rebate
+        instrument.fill(order['action'], quantity, price, fee)
+        order['quantity_filled'] = order['quantity']
+        order['vwap'] = price
+        order['status'] = 'TRANSACTED'
+
+    # resting limit orders fill once the market trades through them
+    def fill_resting(self):
+        for order in self.orders.values():
+            if order['status'] != 'OPEN':
+                continue
+            bid, ask = self.best(self.instruments[order['ticker']])
+            if order['action'] == 'BUY' and ask <= order['price']:
+                self.execute(order, order['price'], 'MAKE')
+            elif order['action'] == 'SELL' and bid >= order['price']:
+                self.execute(order, order['price'], 'MAKE')
+
+    def rate_limited(self):
+        if not self.order_rate_limit:
+            return 0
+        now = self.time()
+        self.order_times = [t for t in self.order_times if now - t < 1.0]
+        if len(self.order_times) >= self.order_rate_limit:
+            return round(1.0 - (now - self.order_times[0]), 3)
+        self.order_times.append(now)
+        return 0
+
+    def place(self, ticker, order_type, quantity, action, price=None):
+        if ticker not in self.instruments:
+            raise ValueError(f'Ticker {ticker} is not tradeable')
+        if action not in ('BUY', 'SELL') or order_type not in ('MARKET', 'LIMIT'):
+            raise ValueError('Order type and action must be MARKET/LIMIT and BUY/SELL')
+        if quantity <= 0:
+            raise ValueError('Order quantity must be positive')
+        if order_type == 'LIMIT' and price is None:
+            raise ValueError('LIMIT orders require a price')
+        instrument = self.instruments[ticker]
+        order = {'order_id': self.next_order_id, 'period': 1, 'tick': self.tick, 'trader_id': TRADER_ID,
+                 'ticker': ticker, 'type': order_type, 'quantity': quantity, 'action': action,
+                 'price': cents(price) if price is not None else None, 'quantity_filled': 0, 'vwap': None,
+                 'status': 'OPEN'}
+        self.next_order_id += 1
+        self.orders[order['order_id']] = order
+        bid, ask = self.best(instrument)
+        if order_type == 'MARKET':
+            self.execute(order, ask if action == 'BUY' else bid, 'TAKE')
+            instrument.price = cents(instrument.price + (0.01 if action == 'BUY' else -0.01))
+        elif action == 'BUY' and order['price'] >= ask:
+            self.execute(order, ask, 'TAKE')
+        elif action == 'SELL' and order['price'] <= bid:
+            self.execute(order, bid, 'TAKE')
+        return order
+
+    def cancel(self, order_id):
+        order = self.orders.get(order_id)
+        if order is None or order['status'] != 'OPEN':
+            return False
+        order['status'] = 'CANCELLED'
+        return True
+
+    # this function applies POST /commands/cancel: all, ticker, ids or a query such as 'Price>20.10 AND Volume<0'
+    def cancel_command(self, params):
+        open_orders = [order for order in self.orders.values() if order['status'] == 'OPEN']
+        if params.get('all') in ('1', 'true', 'True'):
+            selected = open_orders
+        elif params.get('ticker'):
+            selected = [order for order in open_orders if order['ticker'] == params['ticker']]
+        elif params.get('ids'):
+            wanted = {int(i) for i in params['ids'].split(',') if i}
+            selected = [order for order in open_orders if order['order_id'] in wanted]
+        elif params.get('query'):
+            selected = [order for order in open_orders if matches_query(order, params['query'])]
+        else:
+            selected = []
+        return [order['order_id'] for order in selected if self.cancel(order['order_id'])]
+
+    def security(self, instrument):
+        bid, ask = self.best(instrument)
+        bids, asks = self.anon_book(instrument)
+        last = instrument.history[-1]['close']
+        unrealized = instrument.position * last - instrument.cost
+        return {'ticker': instrument.ticker, 'type': instrument.type, 'size': 1, 'position': instrument.position,
+                'vwap': round(instrument.vwap(), 4), 'nlv': round(instrument.position * last, 2), 'last': last,
+                'bid': bid, 'bid_size': bids[0]['quantity'], 'ask': ask, 'ask_size': asks[0]['quantity'],
+                'volume': instrument.volume, 'unrealized': round(unrealized, 2),
+                'realized': round(instrument.realized, 2), 'currency': 'CAD', 'total_volume': instrument.volume,
+                'is_tradeable': True, 'trading_fee': instrument.trading_fee,
+                'limit_order_rebate': instrument.limit_order_rebate}
+
+    def accept_tender(self, tender_id, price=None):
+        tender = self.tenders.pop(tender_id, None)
+        if tender is None:
+            return False
+        instrument = self.instruments[tender['ticker']]
+        instrument.fill(tender['action'], tender['quantity'], price if price is not None else tender['price'], 0)
+        return True
+
+    def decline_tender(self, tender_id):
+        return self.tenders.pop(tender_id, None) is not None
+
+    def open_lease(self, ticker):
+        if ticker not in self.assets:
+            raise ValueError(f'Asset {ticker} cannot be leased')
+        lease = {'id': self.next_lease_id, 'ticker': ticker, 'type': self.assets[ticker].get('type'),
+                 'start_lease_period': 1, 'start_lease_tick': self.tick, 'next_lease_period': 1,
+                 'next_lease_tick': self.tick + 30, 'containment_usage': 0}
+        self.next_lease_id += 1
+        self.leases[lease['id']] = lease
+        return lease
+
+    # this function runs a leased asset: from1/quantity1, from2/quantity2, ... are converted by its recipe
+    def use_lease(self, lease, params):
+        asset = self.assets[lease['ticker']]
+        recipe = asset.get('convert', {})
+        index = 1
+        while f'from{index}' in params:
+            source = params[f'from{index}']
+            quantity = int(float(params.get(f'quantity{index}', 0)))
+            if source in recipe and source in self.instruments:
+                self.instruments[source].position -= quantity
+                for target, ratio in recipe[source].items():
+                    if target in self.instruments:
+                        self.instruments[target].position += int(round(quantity * ratio))
+            index += 1
+        if asset.get('storage') and not any(l['ticker'] == asset['storage'] for l in self.leases.values()):
+            self.open_lease(asset['storage'])
+        return lease
+
+    def case(self):
+        return {'name': self.name, 'period': 1, 'tick': self.tick, 'ticks_per_period': self.ticks_per_period,
+                'total_periods': 1, 'status': self.status(), 'is_enforce_trading_limits': False}
+
+# this function evaluates a /commands/cancel query; Volume is signed like RIT's (positive buys, negative sells)
+def matches_query(order, query):
+    fields = {'Price': order['price'] or 0.0,
+              'Volume': order['quantity'] - order['quantity_filled'] if order['action'] == 'BUY'
+              else order['quantity_filled'] - order['quantity']}
+    for clause in query.split(' AND '):
+        clause = clause.strip()
+        for op in ('>=', '<=', '>', '<', '='):
+            if op in clause:
+                name, value = (part.strip() for part in clause.split(op, 1))
+                left, right = fields.get(name), float(value)
+                if left is None:
+                    return False
+                if not {'>=': left >= right, '<=': left <= right, '>': left > right,
+                        '<': left < right, '=': left == right}[op]:
+                    return False
+                break
+    return True
+
+class ApiError(Exception):
+
+    def __init__(self, status, code, message, **extra):
+        super().__init__(message)
+        self.status = status
+        self.body = {'code': code, 'message': message, **extra}
+
+# this class answers the RIT endpoints from a Market, after the configured response latency
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    # headers and body go out in separate writes; without TCP_NODELAY each response waits on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def do_DELETE(self):
+        self.dispatch('DELETE')
+
+    def dispatch(self, method):
+        server = self.server
+        split = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(split.query).items()}
+        path = split.path[3:] if split.path.startswith('/v1') else split.path
+        server.delay()
+        try:
+            if server.api_key and self.headers.get('X-API-Key') != server.api_key:
+                raise ApiError(401, 'API_KEY_INVALID', 'API key is missing or invalid')
+            with server.market.lock:
+                server.market.sync()
+                body = route(server.market, method, path, params)
+            status = 200
+        except ApiError as e:
+            status, body = e.status, e.body
+        except (KeyError, ValueError) as e:
+            status, body = 400, {'code': 'ARGUMENT_INVALID', 'message': str(e)}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+# this function maps one request onto the Market, returning the JSON body
+def route(market, method, path, params):
+    parts = path.strip('/').split('/')
+    head = parts[0]
+    item = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+
+    if head == 'case' and method == 'GET':
+        return market.case()
+
+    if head == 'securities' and method == 'GET':
+        if len(parts) > 1 and parts[1] == 'book':
+            return market.book(params['ticker'], int(params['limit']) if 'limit' in params else None)
+        if len(parts) > 1 and parts[1] == 'history':
+            history = market.instruments[params['ticker']].history[::-1]
+            return history[:int(params['limit'])] if 'limit' in params else history
+        instruments = market.instruments.values()
+        if 'ticker' in params:
+            instruments = [market.instruments[params['ticker']]]
+        return [market.security(instrument) for instrument in instruments]
+
+    if head == 'orders':
+        if method == 'GET' and item is not None:
+            if item not in market.orders:
+                raise ApiError(404, 'NOT_FOUND', f'Order {item} was not found')
+            return market.orders[item]
+        if method == 'GET':
+            status = params.get('status', 'OPEN')
+            return [order for order in market.orders.values() if order['status'] == status]
+        if method == 'POST':
+            wait = market.rate_limited()
+            if wait:
+                raise ApiError(429, 'TOO_MANY_REQUESTS', 'Orders are being submitted too quickly', wait=wait)
+            price = float(params['price']) if 'price' in params else None
+            return market.place(params['ticker'], params['type'], int(float(params['quantity'])), params['action'], price)
+        if method == 'DELETE' and item is not None:
+            if not market.cancel(item):
+                raise ApiError(404, 'NOT_FOUND', f'Order {item} is not open')
+            return {'success': True}
+
+    if head == 'commands' and len(parts) > 1 and parts[1] == 'cancel' and method == 'POST':
+        return {'cancelled_order_ids': market.cancel_command(params)}
+
+    if head == 'tenders':
+        if method == 'GET':
+            return list(market.tenders.values())
+        tender_id = item if item is not None else int(params.get('id', 0) or 0)
+        if method == 'POST':
+            price = float(params['price']) if 'price' in params else None
+            return {'success': market.accept_tender(tender_id, price)}
+        if method == 'DELETE':
+            return {'success': market.decline_tender(tender_id)}
+
+    if head == 'news' and method == 'GET':
+        news = [n for n in market.news[::-1] if n['news_id'] > int(params.get('since', 0))]
+        return news[:int(params['limit'])] if 'limit' in params else news
+
+    if head == 'leases':
+        if method == 'GET' and item is not None:
+            return market.leases[item]
+        if method == 'GET':
+            return list(market.leases.values())
+        if method == 'POST' and item is not None:
+            if item not in market.leases:
+                raise ApiError(404, 'NOT_FOUND', f'Lease {item} was not found')
+            return market.use_lease(market.leases[item], params)
+        if method == 'POST':
+            lease = market.open_lease(params['ticker'])
+            if 'from1' in params:
+                market.use_lease(lease, params)
+            return lease
+        if method == 'DELETE' and item is not None:
+            if market.leases.pop(item, None) is None:
+                raise ApiError(404, 'NOT_FOUND', f'Lease {item} was not found')
+            return {'success': True}
+
+    if head == 'assets' and method == 'GET':
+        if len(parts) > 1 and parts[1] == 'history':
+            return []
+        assets = [{'ticker': ticker, 'type': asset.get('type'), 'description': '', 'total_quantity': 10,
+                   'available_quantity': 10, 'lease_price': asset.get('lease_price', 0.0),
+                   'convert_from': list(asset.get('convert', {})), 'convert_to': [],
+                   'containment': None, 'ticks_per_conversion': 1, 'ticks_per_lease': 30, 'is_available': True}
+                  for ticker, asset in market.assets.items()]
+        if 'ticker' in params:
+            assets = [asset for asset in assets if asset['ticker'] == params['ticker']]
+        return assets
+
+    raise ApiError(404, 'NOT_FOUND', f'{method} {path} is not supported by the stand-in server')
+
+# this class is the HTTP server; latency (seconds) plus uniform jitter is added before every response
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, market, host=HOST, port=PORT, latency=0.0, jitter=0.0, api_key=API_KEY):
+        super().__init__((host, port), Handler)
+        self.market = market
+        self.latency = latency
+        self.jitter = jitter
+        self.api_key = api_key
+        self.jitter_rng = random.Random(market.seed)
+        self.thread = None
+
+    def delay(self):
+        wait = self.latency + (self.jitter_rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if wait > 0:
+            time.sleep(wait)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    # this function serves from a daemon thread so a benchmark or script can run in the same process
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, name='rit-stand-in', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+# this function loads a scenario JSON file; it uses the same layout as DEFAULT_SCENARIO
+def load_scenario(path):
+    with open(path) as f:
+        return json.load(f)
+
+def serve(scenario=None, seed=0, host=HOST, port=PORT, latency=0.0, jitter=0.0, tick_length=TICK_LENGTH,
+          ticks_per_period=TICKS_PER_PERIOD, start_tick=START_TICK, order_rate_limit=ORDER_RATE_LIMIT):
+    market = Market(scenario, seed=seed, tick_length=tick_length, ticks_per_period=ticks_per_period,
+                    start_tick=start_tick, order_rate_limit=order_rate_limit)
+    return StandInServer(market, host, port, latency, jitter)
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the RIT REST API')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scenario', help='JSON file laid out like rit.server.DEFAULT_SCENARIO')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra uniform random latency, in seconds')
+    parser.add_argument('--tick-length', type=float, default=TICK_LENGTH)
+    parser.add_argument('--ticks', type=int, default=TICKS_PER_PERIOD, help='ticks per period')
+    parser.add_argument('--start-tick', type=int, default=START_TICK)
+    parser.add_argument('--order-rate-limit', type=int, default=ORDER_RATE_LIMIT)
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario) if args.scenario else None
+    server = serve(scenario, args.seed, args.host, args.port, args.latency, args.jitter, args.tick_length,
+                   args.ticks, args.start_tick, args.order_rate_limit)
+    print(f'RIT stand-in serving {server.base_url} (seed {args.seed}, latency {args.latency}s)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
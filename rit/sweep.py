@@ -0,0 +1,114 @@
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from .replay import ReplayStore
+from .router import VENUE_FEES
+
+# this module evaluates grids of strategy parameters against recorded sessions (rit.replay) on a process pool
+# evaluate(store, params) replays one session with one parameter set and returns the Replay; its market order
+# fills are charged their venue's fee and marked to the recorded mid price every tick for P&L and drawdown.
+# Each worker maps every session log once, then takes whole parameter sets, so a set's sessions never cross processes
+
+# this helper method expands {'threshold': [.01, .02], 'quantity_percent': [.5, 1]} into every combination
+def grid(axes):
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+# this helper method returns the cash per share a trade on ticker earns (a rebate) or pays (a fee, negative)
+# on its venue: the _M/_A suffixes of rit.router.VENUE_FEES; securities without a venue suffix trade free
+def venue_fee(ticker, fees=VENUE_FEES):
+    for suffix, fee in fees.items():
+        if ticker.endswith(suffix):
+            return fee
+    return 0.0
+
+# this function marks a replay's fills to the recorded mid price at every tick and returns the equity curve;
+# every fill is charged its venue's fee per share, so trading more is not free
+def equity_curve(session, fees=VENUE_FEES):
+    store = session.store
+    fills = sorted(session.fills, key=lambda fill: fill[0])
+    positions = {}
+    cash = 0.0
+    marks = {}
+    curve = []
+    i = 0
+    for tick in range(store.first_tick, store.last_tick + 1):
+        while i < len(fills) and fills[i][0] <= tick:
+            _, ticker, quantity, price = fills[i]
+            positions[ticker] = positions.get(ticker, 0) + quantity
+            cash -= quantity * price
+            cash += abs(quantity) * venue_fee(ticker, fees)
+            i += 1
+        equity = cash
+        for ticker, position in positions.items():
+            if position:
+                quote = session.quote(ticker, tick)
+                if quote is not None and quote[0] and quote[1]:
+                    marks[ticker] = (quote[0] + quote[1]) / 2
+                equity += position * marks.get(ticker, 0)
+        curve.append(equity)
+    return curve
+
+def max_drawdown(curve):
+    peak = 0.0
+    drawdown = 0.0
+    for equity in curve:
+        peak = max(peak, equity)
+        drawdown = max(drawdown, peak - equity)
+    return drawdown
+
+# this function sums up one parameter set across its sessions
+def summarize(params, sessions):
+    pnls = []
+    drawdowns = []
+    trades = 0
+    for session in sessions:
+        curve = equity_curve(session)
+        pnls.append(curve[-1] if curve else 0.0)
+        drawdowns.append(max_drawdown(curve))
+        trades += len(session.fills)
+    return {'params': params, 'pnl': sum(pnls) / len(pnls), 'worst_pnl': min(pnls),
+            'max_drawdown': max(drawdowns), 'trades': trades, 'sessions': len(pnls)}
+
+# each worker process keeps the stores it loaded in its initializer
+_stores = []
+
+def _load_stores(paths):
+    _stores[:] = [ReplayStore.load(path) for path in paths]
+
+def _evaluate(evaluate, params):
+    return summarize(params, [evaluate(store, params) for store in _stores])
+
+# this function evaluates every parameter set against every session log and returns the rows ranked by mean
+# P&L, best first, with the smaller worst drawdown breaking ties; evaluate must be a module-level function
+def sweep(evaluate, param_sets, logs, workers=None, chunksize=4):
+    logs = [os.path.abspath(path) for path in logs]
+    if workers == 1:
+        _load_stores(logs)
+        rows = [_evaluate(evaluate, params) for params in param_sets]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_load_stores, initargs=(logs,)) as pool:
+            rows = list(pool.map(_evaluate, itertools.repeat(evaluate), param_sets, chunksize=chunksize))
+    return rank(rows)
+
+def rank(rows):
+    return sorted(rows, key=lambda row: (-row['pnl'], row['max_drawdown']))
+
+# this helper method formats ranked rows as a plain-text table, one column per swept parameter
+def format_table(rows, limit=None):
+    rows = rows[:limit] if limit else rows
+    if not rows:
+        return ''
+    names = list(rows[0]['params'])
+    widths = [max(len(name), 8) for name in names]
+    lines = ['  '.join(f'{name:>{width}}' for name, width in zip(names, widths)) +
+             f"  {'pnl':>12} {'worst pnl':>12} {'drawdown':>12} {'trades':>7}"]
+    for row in rows:
+        values = '  '.join(f"{format_value(row['params'][name]):>{width}}" for name, width in zip(names, widths))
+        lines.append(f"{values}  {row['pnl']:12.2f} {row['worst_pnl']:12.2f} {row['max_drawdown']:12.2f} {row['trades']:7}")
+    return '\n'.join(lines)
+
+def format_value(value):
+    if isinstance(value, (tuple, list)):
+        return '/'.join(format_value(x) for x in value)
+    return f'{value:g}' if isinstance(value, float) else str(value)
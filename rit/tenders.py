@@ -0,0 +1,104 @@
+import math
+from .api import TENDERS, get_tenders
+from .book import order_book
+from .records import Tender, loads
+from .router import ORDER_SIZE, VENUE_FEES, leg_orders, route, venues
+
+# this module prices tender offers against the cached books of both venues a security trades on
+# accepting a tender leaves a position that has to be unwound in the market: the evaluator walks the merged depth of
+# the _A and _M books, each level net of its venue's fee, for the full tender size through rit.router, and accepts
+# when the expected profit of the unwind clears the margin. It reads the shared rit.OrderBook of each venue and sends no request
+
+# minimum expected profit, as a fraction of the tender's value, to accept it
+MARGIN = 0.01
+
+# minimum fraction of the tender the visible depth has to absorb; the rest is only assumed to clear at the worst
+# level walked, which a thin book does not support
+MIN_COVERAGE = 0.8
+
+# this class is the evaluator's answer for one tender
+# unwind_price is the average net price per share of the unwind; shares the books cannot absorb are valued at
+# the worst level walked, and coverage is the fraction of the tender the visible depth covers
+class TenderDecision:
+    __slots__ = ('tender', 'accept', 'price', 'unwind_action', 'unwind_price', 'expected_profit', 'coverage', 'legs')
+
+    def __init__(self, tender, accept, price, unwind_action, unwind_price, expected_profit, coverage, legs):
+        self.tender = tender
+        self.accept = accept
+        self.price = price
+        self.unwind_action = unwind_action
+        self.unwind_price = unwind_price
+        self.expected_profit = expected_profit
+        self.coverage = coverage
+        self.legs = legs
+
+    def __repr__(self):
+        verdict = 'ACCEPT' if self.accept else 'DECLINE'
+        return (f'TenderDecision({verdict} {self.tender.tender_id} {self.tender.action} {self.tender.quantity} '
+                f'{self.tender.ticker}@{self.price} unwind {self.unwind_action}@{self.unwind_price} '
+                f'profit={self.expected_profit} coverage={self.coverage:.0%})')
+
+# this function evaluates a tender (a rit.records.Tender or a decoded /tenders item) against the venues' books
+# books defaults to the shared rit.order_book of each venue, refreshed by the caller; a tender without a fixed
+# price is answered with the best price that still earns the margin. A tender the books cover less than
+# min_coverage of is declined whatever its expected profit
+def evaluate_tender(tender, books=None, fees=VENUE_FEES, margin=MARGIN, min_coverage=MIN_COVERAGE):
+    if isinstance(tender, dict):
+        tender = Tender(tender)
+    quantity = tender.quantity
+    # the client sells to us on a BUY tender, so we unwind by selling into the bids, and the other way round
+    unwind_action = 'SELL' if tender.action == 'BUY' else 'BUY'
+    routed = route(tender.ticker, unwind_action, quantity, books, fees)
+    filled = routed.filled
+    legs = routed.legs
+    if not filled:
+        return TenderDecision(tender, False, tender.price, unwind_action, None, None, 0.0, legs)
+    # value what the books cannot absorb at the worst net price walked
+    cash = routed.cash + routed.unfilled * routed.last
+    unwind_price = cash / quantity
+    price = tender.price
+    if price is None or not tender.is_fixed_bid:
+        # round to the cent on the side that keeps the margin
+        if unwind_action == 'SELL':
+            price = math.floor(unwind_price / (1 + margin) * 100) / 100
+        else:
+            price = math.ceil(unwind_price * (1 + margin) * 100) / 100
+    expected_profit = (unwind_price - price) * quantity if unwind_action == 'SELL' else (price - unwind_price) * quantity
+    coverage = filled / quantity
+    accept = expected_profit > 0 and expected_profit >= margin * price * quantity - 1e-6 and coverage >= min_coverage
+    return TenderDecision(tender, accept, price, unwind_action, round(unwind_price, 4), round(expected_profit, 2),
+                          coverage, legs)
+
+def unwind_orders(decision, order_size=ORDER_SIZE):
+    return leg_orders(decision.legs, decision.unwind_action, order_size)
+
+# this function refreshes the cached books of every venue a tender trades on
+def refresh_books(session, ticker, limit=None):
+    books = []
+    for venue, fee in venues(ticker):
+        book = order_book(venue)
+        book.refresh(session, limit)
+        books.append(book)
+    return books
+
+# these helper methods answer a tender; a variable-price tender is accepted at the price given
+def accept_tender(session, tender_id, price=None):
+    resp = session.post(f'{TENDERS}/{tender_id}', params=None if price is None else {'price': price})
+    return loads(resp.content)
+
+def decline_tender(session, tender_id):
+    resp = session.delete(f'{TENDERS}/{tender_id}')
+    return loads(resp.content)
+
+# this function tells whether a decoded /tenders/{id} answer confirms it: {'success': true}, and an ACCEPTED status
+# when the response reports one. An error body ({'code': ..., 'message': ...} for an expired tender or a 429)
+# or {'success': false} is not
+def tender_succeeded(response):
+    if not isinstance(response, dict) or response.get('success') is not True:
+        return False
+    return response.get('status', 'ACCEPTED') == 'ACCEPTED'
+
+# this function returns a decision for every open tender, decoded once from one GET /tenders
+def evaluate_tenders(session, fees=VENUE_FEES, margin=MARGIN, min_coverage=MIN_COVERAGE):
+    return [evaluate_tender(Tender(d), fees=fees, margin=margin, min_coverage=min_coverage)
+            for d in get_tenders(session)]
@@ -0,0 +1,144 @@
+import math
+from .api import get_order, get_securities
+from .cancel import CancelManager
+from .consolidated import consolidated_book
+from .gateway import OrderGateway
+from .router import ORDER_SIZE, VENUE_FEES, route, venues
+
+# this module works a large position out of the market in slices over a tick horizon instead of reposting one
+# block at a stale price. Every tick the scheduler cancels the previous slice's leftovers and reads its child
+# orders' fills, which are its progress, re-reads traded volume and the venue position (a cap only) from one
+# GET /securities, and sends the next slice from the live books of both venues:
+# the larger of what the TWAP schedule says is due and PARTICIPATION of the volume others traded since the last
+# tick. Child orders never reach more than MAX_SLIPPAGE past the touch, so a slice cannot sweep the book
+
+HORIZON = 30
+PARTICIPATION = 0.2
+MAX_SLIPPAGE = 0.05
+
+class UnwindScheduler:
+
+    def __init__(self, session, ticker, action, quantity, horizon=HORIZON, participation=PARTICIPATION,
+                 max_slippage=MAX_SLIPPAGE, fees=VENUE_FEES, order_size=ORDER_SIZE, gateway=None, cancels=None):
+        self.session = session
+        self.ticker = ticker
+        self.fees = fees
+        self.tickers = [venue for venue, fee in venues(ticker, fees)]
+        self.action = action
+        self.quantity = quantity
+        self.horizon = horizon
+        self.participation = participation
+        self.max_slippage = max_slippage
+        self.order_size = order_size
+        self.gateway = gateway if gateway is not None else OrderGateway(session)
+        self.cancels = cancels if cancels is not None else CancelManager(session)
+        self.start_tick = None
+        self.arrival = None
+        self.last_volume = None
+        # shares this scheduler's own child orders have filled, and what the venue position still allows
+        self.done = 0
+        self.available = None
+        # order_id -> (quantity filled, vwap) of every child order, as last reported
+        self.fills = {}
+        self.open_ids = []
+        self.slices = []
+
+    @property
+    def remaining(self):
+        return max(self.quantity - self.done, 0)
+
+    # done once the own fills reach the quantity, or once the venue position leaves nothing to unwind
+    @property
+    def finished(self):
+        return self.remaining <= 0 or self.available == 0
+
+    # this helper method reads our position summed over the venues and the volume traded on them
+    # the position is shared with anything else trading the security, so it only caps the unwind; progress is
+    # counted from this scheduler's own child fills
+    def read(self, securities):
+        position = 0
+        volume = 0
+        for security in securities:
+            if security['ticker'] in self.tickers:
+                position += security['position']
+                volume += security.get('volume', 0)
+        return position, volume
+
+    # this function returns the size of the next slice: what the TWAP schedule says is due by this tick, or
+    # the participation share of the volume others traded since the last tick, whichever is larger
+    def target(self, tick, observed):
+        elapsed = min(tick - self.start_tick + 1, self.horizon)
+        due = self.quantity * elapsed / self.horizon - self.done
+        return min(self.remaining, math.ceil(max(due, self.participation * observed, 0)))
+
+    # this function routes a slice into LIMIT child orders over the consolidated live book of both venues, best
+    # net price first; each venue's limit is the last level walked there and no level past the slippage cap is used
+    def child_orders(self, size):
+        return route(self.ticker, self.action, size, consolidated_book(self.ticker, self.fees),
+                     max_slippage=self.max_slippage, order_size=self.order_size).orders
+
+    def record(self, orders):
+        for order in orders:
+            if 'order_id' in order and order.get('quantity_filled'):
+                self.fills[order['order_id']] = (order['quantity_filled'], order.get('vwap'))
+
+    # this helper method cancels the last slice's leftovers and then reads every one of its child orders by id,
+    # so fills that happened since the slice was sent are recorded even when the order has left the OPEN list
+    def settle(self):
+        if not self.open_ids:
+            return
+        self.cancels.cancel_ids(self.open_ids, reconcile=False)
+        self.record(get_order(self.session, order_id) for order_id in self.open_ids)
+        self.open_ids = []
+
+    # this function returns the shares filled by the child orders recorded so far
+    def filled(self):
+        return sum(quantity for quantity, vwap in self.fills.values())
+
+    # this function runs one tick of the unwind and returns the child orders it sent; books are refreshed first
+    # unless the caller has just done so
+    def step(self, tick, refresh=True):
+        if refresh:
+            consolidated_book(self.ticker, self.fees).refresh(self.session)
+        # re-price: the previous slice's leftovers are cancelled, their fills recorded, and the rest sent again
+        # from the live book
+        self.settle()
+        position, volume = self.read(get_securities(self.session))
+        if self.start_tick is None:
+            self.start_tick = tick
+            self.last_volume = volume
+            self.arrival = consolidated_book(self.ticker, self.fees).touch('BUY' if self.action == 'SELL' else 'SELL')
+        done = self.filled()
+        # volume traded by others since the last tick: our own fills are part of the venue volume
+        observed = max(volume - self.last_volume - (done - self.done), 0)
+        self.done = done
+        self.last_volume = volume
+        # never sell more than the venues hold, or buy back more than they are short
+        self.available = max(position, 0) if self.action == 'SELL' else max(-position, 0)
+        if self.finished:
+            return []
+        intents = self.child_orders(min(self.target(tick, observed), self.available))
+        if not intents:
+            return []
+        results = self.gateway.submit(intents)
+        self.record(result.order for result in results if result.ok)
+        self.open_ids = [result.order_id for result in results if result.ok and result.order.get('status') == 'OPEN']
+        self.slices.append((tick, sum(intent['quantity'] for intent in intents)))
+        return results
+
+    # this function cancels whatever the last slice left on the book and records its final fills
+    def cancel(self):
+        self.settle()
+
+    # this function returns the fills reported so far and their slippage against the touch at the first slice,
+    # in price per share (positive is a cost)
+    def report(self):
+        filled = sum(quantity for quantity, vwap in self.fills.values() if vwap is not None)
+        cash = sum(quantity * vwap for quantity, vwap in self.fills.values() if vwap is not None)
+        average = cash / filled if filled else None
+        slippage = None
+        if average is not None and self.arrival is not None:
+            slippage = self.arrival - average if self.action == 'SELL' else average - self.arrival
+        return {'quantity': self.quantity, 'done': self.done, 'remaining': self.remaining, 'slices': len(self.slices),
+                'filled': filled, 'average_price': average, 'arrival_price': self.arrival, 'slippage': slippage,
+                'slippage_cost': slippage * filled if slippage is not None else None}